@@ -4,8 +4,21 @@ Configuration module for adverse media screening system.
 This module contains:
 - settings.py: Environment configuration and application settings
 - prompts.py: All LLM prompts used in the system
+
+Settings are imported on first attribute access (PEP 562), so importing a
+sibling module such as config.prompt_versions does not read the environment.
 """
 
-from config.settings import Settings, LLMProvider
+from typing import Any
+
+__all__ = ["Settings", "LLMProvider"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        from config import settings
 
-__all__ = ["Settings", "LLMProvider"]
\ No newline at end of file
+        value = getattr(settings, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,9 @@
+"""
+Prompt version registry.
+
+Cached LLM responses are keyed on the prompt version as well as the formatted
+prompt text. Bump PROMPT_VERSION whenever any prompt text
+in config/prompts.py changes so stale responses are never served.
+"""
+
+PROMPT_VERSION = "v7"
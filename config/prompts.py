@@ -3,31 +3,68 @@ LLM prompts for adverse media screening system.
 
 All prompts use XML tags for structured input/output to improve LLM comprehension
 and reliability, especially with Claude models.
+
+Each user prompt is split into a *_STATIC instruction block and a *_DYNAMIC block
+holding the per-call {placeholders}. Providers cache by prompt prefix, so the
+static block always comes first and must stay byte-identical between runs.
+
+Prompt attributes are built lazily on first access (see __getattr__), so a caller
+importing one prompt does not pay for compacting and compiling all of them.
 """
 
+__all__ = [
+    "PROMPTS",
+    "REQUIRED",
+    "render",
+    "format_entity_for_prompt",
+    "format_entities_for_prompt",
+    "ENTITY_EXTRACTION_SYSTEM_PROMPT",
+    "ENTITY_EXTRACTION_STATIC",
+    "ENTITY_EXTRACTION_DYNAMIC",
+    "NAME_MATCHING_SYSTEM_PROMPT",
+    "NAME_MATCHING_STATIC",
+    "NAME_MATCHING_DYNAMIC",
+    "NAME_MATCHING_BATCH_SYSTEM_PROMPT",
+    "NAME_MATCHING_BATCH_STATIC",
+    "NAME_MATCHING_BATCH_DYNAMIC",
+    "SENTIMENT_ANALYSIS_SYSTEM_PROMPT",
+    "SENTIMENT_ANALYSIS_STATIC",
+    "SENTIMENT_ANALYSIS_DYNAMIC",
+    "REPORT_GENERATION_SYSTEM_PROMPT",
+    "REPORT_GENERATION_STATIC",
+    "REPORT_GENERATION_DYNAMIC",
+    "REPORT_SUMMARY_SYSTEM_PROMPT",
+    "REPORT_SUMMARY_STATIC",
+    "REPORT_SUMMARY_DYNAMIC",
+    "COMBINED_SCREENING_SYSTEM_PROMPT",
+    "COMBINED_SCREENING_STATIC",
+    "COMBINED_SCREENING_DYNAMIC",
+]
+
+import re
+import string
+from typing import Any, Callable, Dict, FrozenSet, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from config.settings import get_settings
+
+# Raw prompt text by public name. The public module attributes (compacted when
+# COMPACT_PROMPTS is on) are built from these on first access, see __getattr__.
+_RAW: Dict[str, str] = {}
+
 # =============================================================================
 # Entity Extraction
 # =============================================================================
 
-ENTITY_EXTRACTION_SYSTEM_PROMPT = """You are an expert at extracting information about people from news articles for financial compliance screening.
+_RAW["ENTITY_EXTRACTION_SYSTEM_PROMPT"] = """You are an expert at extracting information about people from news articles for financial compliance screening.
 
 Your task is to identify ALL people mentioned in articles and extract their identifying details with high precision."""
 
-ENTITY_EXTRACTION_USER_PROMPT = f"""<task>
+_RAW["ENTITY_EXTRACTION_STATIC"] = """<task>
 Extract all people mentioned in the following news article. For each person, identify any available details that could help verify their identity.
 </task>
 
-<article>
-<url>{{article_url}}</url>
-<title>{{article_title}}</title>
-<source>{{article_source}}</source>
-<publish_date>{{publish_date}}</publish_date>
-<language>{{language}}</language>
-<content>
-{{article_content}}
-</content>
-</article>
-
 <instructions>
 1. Extract EVERY person mentioned, even if only briefly
 2. Capture the exact name as written in the article (including titles like "Dr." or "Sir")
@@ -70,43 +107,34 @@ The object must contain a key 'extracted_entities', which holds the list of pers
 
 <critical>
 When generating the final JSON output, ensure all string values (especially names and snippets) do not contain unnecessary escape characters (like backslashes before apostrophes: \\'). Output the cleanest possible JSON.
-</critical>
-"""
+</critical>"""
+
+_RAW["ENTITY_EXTRACTION_DYNAMIC"] = """<article>
+<url>{article_url}</url>
+<title>{article_title}</title>
+<source>{article_source}</source>
+<publish_date>{publish_date}</publish_date>
+<language>{language}</language>
+<content>
+{article_content}
+</content>
+</article>"""
+
 
 
 # =============================================================================
 # Name Matching
 # =============================================================================
 
-NAME_MATCHING_SYSTEM_PROMPT = """You are an expert at determining if two people are the same individual for financial compliance screening.
+_RAW["NAME_MATCHING_SYSTEM_PROMPT"] = """You are an expert at determining if two people are the same individual for financial compliance screening.
 
 You understand:
 - Name variations (nicknames, initials, middle names, cultural conventions)
 - Age calculation and verification
 - The critical importance of not missing true matches in compliance contexts"""
 
-NAME_MATCHING_USER_PROMPT = """<task>
-Determine if the query person and the article entity refer to the same individual.
-</task>
-
-<query_person>
-<name>{query_name}</name>
-<date_of_birth>{query_dob}</date_of_birth>
-</query_person>
-
-<article_entity>
-{entity_xml}
-</article_entity>
-
-<article_context>
-<publish_date>{article_date}</publish_date>
-<source>{article_source}</source>
-<relevant_snippet>
-{context_snippet}
-</relevant_snippet>
-</article_context>
-
-<matching_considerations>
+# Shared by the per-entity and the batched name matching prompts
+_NAME_MATCHING_CONSIDERATIONS = """<matching_considerations>
 1. NAME VARIATIONS:
    - Nicknames (James→Jim, Robert→Bob, Richard→Dick, William→Bill, etc.)
    - Initials (J. Smith vs John Smith vs John Q. Smith)
@@ -134,7 +162,24 @@ Determine if the query person and the article entity refer to the same individua
    - False negatives (missing a true match) are WORSE than false positives
    - When uncertain, classify as potential match for manual review
    - Only classify as "no match" when clearly different people
-</matching_considerations>
+</matching_considerations>"""
+
+_NAME_MATCHING_GUIDELINES = """<decision_guidelines>
+- match_probability > 0.80 AND clear evidence → is_match=true, confidence=HIGH
+- match_probability 0.60-0.80 → is_match=true, confidence=MEDIUM
+- match_probability 0.40-0.59 → is_match=true, confidence=LOW (flag for manual review)
+- match_probability < 0.40 AND clear contradictions → is_match=false
+</decision_guidelines>"""
+
+_NAME_MATCHING_CRITICAL = """<critical>
+Think step-by-step. Show your reasoning clearly. In compliance contexts, we CANNOT miss true matches.
+</critical>"""
+
+_RAW["NAME_MATCHING_STATIC"] = """<task>
+Determine if the query person and the article entity refer to the same individual.
+</task>
+
+""" + _NAME_MATCHING_CONSIDERATIONS + """
 
 <output_format>
 
@@ -164,41 +209,83 @@ The object must a single top-level key: "final_assessment", which holds the rest
 
 </output_format>
 
-<decision_guidelines>
-- match_probability > 0.80 AND clear evidence → is_match=true, confidence=HIGH
-- match_probability 0.60-0.80 → is_match=true, confidence=MEDIUM
-- match_probability 0.40-0.59 → is_match=true, confidence=LOW (flag for manual review)
-- match_probability < 0.40 AND clear contradictions → is_match=false
-</decision_guidelines>
+""" + _NAME_MATCHING_GUIDELINES + "\n\n" + _NAME_MATCHING_CRITICAL
+
+_RAW["NAME_MATCHING_DYNAMIC"] = """<query_person>
+<name>{query_name}</name>
+<date_of_birth>{query_dob}</date_of_birth>
+</query_person>
+
+<article_entity format="json">
+{entity_json}
+</article_entity>
+
+<article_context>
+<publish_date>{article_date}</publish_date>
+<source>{article_source}</source>
+<relevant_snippet>
+{context_snippet}
+</relevant_snippet>
+</article_context>"""
+
+
+
+# =============================================================================
+# Batched Name Matching (all candidate entities of an article in one call)
+# =============================================================================
+
+_RAW["NAME_MATCHING_BATCH_SYSTEM_PROMPT"] = _RAW["NAME_MATCHING_SYSTEM_PROMPT"]
+
+_RAW["NAME_MATCHING_BATCH_STATIC"] = """<task>
+For EACH article entity below, determine if the query person and that entity refer to the same individual. Assess every entity independently, as if it were the only one.
+</task>
+
+""" + _NAME_MATCHING_CONSIDERATIONS + """
+
+<output_format>
+Return a JSON object that strictly adheres to the BatchedNameMatchingOutput schema.
+Its single top-level key "assessments" holds one entry per article entity, in the given order,
+with only these fields: id (the entity's id attribute), is_match, confidence and match_probability.
+Do not explain your decisions; the most likely match is assessed in detail separately.
+</output_format>
+
+""" + _NAME_MATCHING_GUIDELINES + """
 
 <critical>
-Think step-by-step. Show your reasoning clearly. In compliance contexts, we CANNOT miss true matches.
+Weigh all the evidence before scoring each entity. In compliance contexts, we CANNOT miss true matches.
 </critical>"""
 
+_RAW["NAME_MATCHING_BATCH_DYNAMIC"] = """<query_person>
+<name>{query_name}</name>
+<date_of_birth>{query_dob}</date_of_birth>
+</query_person>
+
+<article_entities>
+{entities_xml}
+</article_entities>
+
+<article_context>
+<publish_date>{article_date}</publish_date>
+<source>{article_source}</source>
+</article_context>"""
+
+
 
 # =============================================================================
 # Sentiment Analysis
 # =============================================================================
 
-SENTIMENT_ANALYSIS_SYSTEM_PROMPT = """You are an expert at analyzing whether news articles contain adverse media (negative coverage) about individuals for financial compliance screening.
+_RAW["SENTIMENT_ANALYSIS_SYSTEM_PROMPT"] = """You are an expert at analyzing whether news articles contain adverse media (negative coverage) about individuals for financial compliance screening.
 
 You understand:
 - Adverse media indicators in compliance contexts
 - The difference between neutral reporting and negative portrayal
 - How to extract specific evidence of adverse information"""
 
-SENTIMENT_ANALYSIS_USER_PROMPT = """<task>
+_RAW["SENTIMENT_ANALYSIS_STATIC"] = """<task>
 Analyze whether this news article portrays the specified individual in a negative light (adverse media).
 </task>
 
-<person_of_interest>
-<name>{person_name}</name>
-</person_of_interest>
-
-<article>
-{article_text}
-</article>
-
 <adverse_media_indicators>
 Assess whether the article contains negative information in these categories:
 
@@ -296,15 +383,23 @@ DO NOT INCLUDE ANY OTHER text or greeting apart from the JSON
 
 <critical>
 Focus on facts presented in the article. Consider both the nature of the allegations/actions AND their current status (active, resolved, alleged, proven).
-</critical>
-"""
+</critical>"""
+
+_RAW["SENTIMENT_ANALYSIS_DYNAMIC"] = """<person_of_interest>
+<name>{person_name}</name>
+</person_of_interest>
+
+<article>
+{article_text}
+</article>"""
+
 
 
 # =============================================================================
 # Report Generation
 # =============================================================================
 
-REPORT_GENERATION_SYSTEM_PROMPT = """You are an expert at creating clear, professional adverse media screening reports for compliance analysts.
+_RAW["REPORT_GENERATION_SYSTEM_PROMPT"] = """You are an expert at creating clear, professional adverse media screening reports for compliance analysts.
 
 Your reports are:
 - Concise yet comprehensive
@@ -312,14 +407,10 @@ Your reports are:
 - Objective and evidence-based
 - Actionable with clear recommendations"""
 
-REPORT_GENERATION_USER_PROMPT = """<task>
+_RAW["REPORT_GENERATION_STATIC"] = """<task>
 Generate a professional adverse media screening report based on the analysis results.
 </task>
 
-<analysis_results>
-{results_json}
-</analysis_results>
-
 <report_requirements>
 1. Use clear, professional language suitable for compliance officers
 2. Lead with the most important information (decision and confidence)
@@ -403,42 +494,289 @@ Generate a professional adverse media screening report based on the analysis res
 This report will be used for compliance decisions. Ensure all claims are supported by evidence from the analysis. Be clear about limitations and uncertainties.
 </critical>"""
 
+_RAW["REPORT_GENERATION_DYNAMIC"] = """<analysis_results>
+{results_json}
+</analysis_results>"""
+
+
+
+# =============================================================================
+# Report Summary (template report mode)
+# =============================================================================
+
+_RAW["REPORT_SUMMARY_SYSTEM_PROMPT"] = """You are an expert at writing concise summaries of adverse media screening decisions for compliance analysts."""
+
+_RAW["REPORT_SUMMARY_STATIC"] = """<task>
+Write the one-paragraph summary that opens the SCREENING DECISION section of a screening report.
+</task>
+
+<guidelines>
+- 2-4 sentences, plain prose, no headings or bullet points
+- State the decision and confidence, then the key reasoning
+- Only use the facts given below; do not speculate
+- Professional, objective and direct
+</guidelines>"""
+
+_RAW["REPORT_SUMMARY_DYNAMIC"] = """<screening>
+<query_name>{query_name}</query_name>
+<decision>{decision}</decision>
+<confidence>{confidence}</confidence>
+<top_evidence>
+{top_evidence}
+</top_evidence>
+</screening>"""
+
+
+
+# =============================================================================
+# Combined Screening (short articles: extraction + matching + sentiment in one call)
+# =============================================================================
+
+_RAW["COMBINED_SCREENING_SYSTEM_PROMPT"] = """You are an expert at adverse media screening for financial compliance.
+
+In a single pass over a news article you extract the people it mentions, decide whether one of them is the person being screened, and assess whether the article portrays that person negatively."""
+
+_RAW["COMBINED_SCREENING_STATIC"] = """<task>
+Screen the query person against the news article below in three steps, and return all three results together.
+</task>
+
+<step name="extract_entities">
+Extract EVERY person mentioned in the article, even briefly: the exact name as written, age or approximate age ("in his 40s"), occupation, location, other identifying facts, a 1-2 sentence context snippet, and your confidence (high/medium/low). Combine the details of a person mentioned several times.
+</step>
+
+<step name="match_assessment">
+Decide whether any extracted person is the query person:
+- Allow name variations: nicknames, initials, middle names used as first names, surname-first and double-surname conventions; ignore titles
+- Calculate the query person's age on the article date from their date of birth; allow ±2 years against an exact age and check approximate ranges
+- Matching occupation or location increases confidence; contradicting details reduce it
+- False negatives are WORSE than false positives: when uncertain, report a potential match for manual review
+Assess the most likely candidate and copy it into matched_entity (null when nobody is a plausible match).
+- match_probability > 0.80 AND clear evidence → is_match=true, confidence=HIGH
+- match_probability 0.60-0.80 → is_match=true, confidence=MEDIUM
+- match_probability 0.40-0.59 → is_match=true, confidence=LOW
+- match_probability < 0.40 AND clear contradictions → is_match=false
+</step>
+
+<step name="sentiment_assessment">
+Only when is_match is true: classify how the article portrays the matched person (POSITIVE/NEGATIVE/NEUTRAL) and whether it is adverse media - legal issues, financial misconduct, ethical violations, sanctions or serious reputational damage. Allegations and ongoing investigations are adverse; acquittals and being a witness are not. Give the severity (HIGH: convictions, major fraud, sanctions; MEDIUM: investigations, lawsuits, allegations; LOW: minor or resolved issues), the indicators found, verbatim evidence snippets and your reasoning.
+Set sentiment_assessment to null when is_match is false.
+</step>
+
+<critical>
+Base every field on facts in the article. Return only the structured output.
+</critical>"""
+
+_RAW["COMBINED_SCREENING_DYNAMIC"] = """<query_person>
+<name>{query_name}</name>
+<date_of_birth>{query_dob}</date_of_birth>
+</query_person>
+
+<article>
+<url>{article_url}</url>
+<title>{article_title}</title>
+<source>{article_source}</source>
+<publish_date>{publish_date}</publish_date>
+<language>{language}</language>
+<content>
+{article_content}
+</content>
+</article>"""
+
+
+
+# =============================================================================
+# Compaction
+# =============================================================================
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+_INTERNAL_SPACES = re.compile(r"(?<=\S) {3,}")
+_TAG_INDENT = re.compile(r"^[ \t]+(?=<)", re.MULTILINE)
+_MUST_NOT_ASIDE = re.compile(r" ?\(MUST NOT[^)]*\)")
+
+
+def _compact(prompt: str) -> str:
+    """
+    Strip whitespace and asides that cost input tokens on every call.
+
+    Collapses runs of blank lines, trailing spaces and runs of 3+ spaces inside a
+    line, drops "(MUST NOT ...)" reminders and un-indents lines that start with a
+    tag (the tags already carry the nesting). Indentation of nested lists is kept.
+    """
+    prompt = _MUST_NOT_ASIDE.sub("", prompt)
+    prompt = _TAG_INDENT.sub("", prompt)
+    prompt = "\n".join(_INTERNAL_SPACES.sub(" ", line.rstrip()) for line in prompt.split("\n"))
+    return _BLANK_LINES.sub("\n\n", prompt)
+
+
+# =============================================================================
+# Precompiled Renderers
+# =============================================================================
+
+_FORMATTER = string.Formatter()
+
+
+def _compile_template(template: str) -> Callable[..., str]:
+    """
+    Split a str.format-style template into (literal, field) parts once, when
+    its task is first rendered.
+
+    The returned renderer only joins the precomputed parts, instead of rescanning
+    the multi-KB template on every call like str.format does.
+
+    Args:
+        template: Template string using {name} placeholders ({{ }} for literals).
+
+    Returns:
+        A function taking the placeholder values as keyword arguments.
+    """
+    parts = tuple(
+        (literal, field_name)
+        for literal, field_name, _, _ in _FORMATTER.parse(template)
+    )
+
+    def render(**kwargs: Any) -> str:
+        chunks = []
+        for literal, field_name in parts:
+            chunks.append(literal)
+            if field_name is not None:
+                chunks.append(str(kwargs[field_name]))
+        return "".join(chunks)
+
+    return render
+
+
+def _user_prompt(static: str, dynamic: str) -> str:
+    return f"{static}\n\n{dynamic}"
+
+
+# =============================================================================
+# Prompt Registry
+# =============================================================================
+
+# task -> prompt name prefix in _RAW
+_TASKS: Dict[str, str] = {
+    "entity_extraction": "ENTITY_EXTRACTION",
+    "name_matching": "NAME_MATCHING",
+    "name_matching_batch": "NAME_MATCHING_BATCH",
+    "sentiment_analysis": "SENTIMENT_ANALYSIS",
+    "report_generation": "REPORT_GENERATION",
+    "report_summary": "REPORT_SUMMARY",
+    "combined_screening": "COMBINED_SCREENING",
+}
+
+_RENDERERS: Dict[str, Callable[..., str]] = {}
+
+
+def _get(name: str) -> Any:
+    """Module attribute lookup that goes through __getattr__ only on first access."""
+    value = globals().get(name)
+    return __getattr__(name) if value is None else value
+
+
+def _build_prompts() -> Dict[str, Tuple[str, str]]:
+    """Build PROMPTS: task -> (system prompt, user prompt template)."""
+    prompts = {}
+    for task, prefix in _TASKS.items():
+        prompts[task] = (
+            _get(f"{prefix}_SYSTEM_PROMPT"),
+            _user_prompt(_get(f"{prefix}_STATIC"), _get(f"{prefix}_DYNAMIC")),
+        )
+    return prompts
+
+
+def _build_required() -> Dict[str, FrozenSet[str]]:
+    """Build REQUIRED: task -> names of its user prompt placeholders."""
+    return {
+        task: frozenset(
+            field_name
+            for _, field_name, _, _ in _FORMATTER.parse(user_template)
+            if field_name
+        )
+        for task, (_, user_template) in _get("PROMPTS").items()
+    }
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Build prompt attributes on first access (PEP 562).
+
+    Compaction, registry construction and the settings read only happen for the
+    prompts a caller actually uses; results are memoized in the module globals.
+    """
+    value: Any
+    if name in _RAW:
+        value = _RAW[name]
+        if get_settings().compact_prompts:
+            value = _compact(value)
+    elif name == "PROMPTS":
+        value = _build_prompts()
+    elif name == "REQUIRED":
+        value = _build_required()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_RAW) | {"PROMPTS", "REQUIRED"})
+
+
+def render(task: str, **kwargs: Any) -> Tuple[str, str]:
+    """
+    Render the prompts for a task.
+
+    Args:
+        task: A key of PROMPTS (e.g., "entity_extraction").
+        **kwargs: Values for the task's user prompt placeholders.
+
+    Returns:
+        A (system, user) tuple of the formatted prompts.
+
+    Raises:
+        ValueError: If a placeholder value is missing, before any formatting work.
+    """
+    missing = _get("REQUIRED")[task] - kwargs.keys()
+    if missing:
+        raise ValueError(f"Missing prompt variables for '{task}': {sorted(missing)}")
+
+    system_prompt, user_template = _get("PROMPTS")[task]
+    renderer = _RENDERERS.get(task)
+    if renderer is None:
+        renderer = _RENDERERS[task] = _compile_template(user_template)
+    return system_prompt, renderer(**kwargs)
 
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
-def format_entity_for_prompt(entity: dict) -> str:
+def format_entity_for_prompt(entity: BaseModel) -> str:
+    """
+    Format an extracted entity as compact JSON for inclusion in prompts.
+
+    Args:
+        entity: PersonEntity from extraction
+
+    Returns:
+        JSON-formatted entity string (unset fields omitted)
+    """
+    return entity.model_dump_json(exclude_none=True)
+
+
+def format_entities_for_prompt(entities: Sequence[BaseModel], age_checks: Sequence[str]) -> str:
     """
-    Format entity dictionary as XML for inclusion in prompts.
+    Format candidate entities for the batched name matching prompt.
 
     Args:
-        entity: Entity dictionary from extraction
+        entities: PersonEntity objects from extraction
+        age_checks: The deterministic age check result of each entity
 
     Returns:
-        XML-formatted entity string
+        One <entity id="N"> block per entity, N being its position in entities
     """
-    xml = "<entity>\n"
-    xml += f"  <full_name>{entity.full_name}</full_name>\n"
-
-    if entity.age is not None:
-        xml += f"  <age>{entity.age}</age>\n"
-    if entity.approximate_age_range:
-        xml += f"  <approximate_age_range>{entity.approximate_age_range}</approximate_age_range>\n"
-    if entity.occupation:
-        xml += f"  <occupation>{entity.occupation}</occupation>\n"
-    if entity.location:
-        xml += f"  <location>{entity.location}</location>\n"
-
-    if entity.other_details:
-        xml += "  <other_details>\n"
-        for detail in entity.other_details:
-            xml += f"    <detail>{detail}</detail>\n"
-        xml += "  </other_details>\n"
-
-    if entity.context_snippet:
-        xml += f"  <context_snippet>{entity.context_snippet}</context_snippet>\n"
-
-    xml += "</entity>"
-
-    return xml
\ No newline at end of file
+    return "\n".join(
+        f'<entity id="{index}">\n<age_check>{age_check}</age_check>\n'
+        f"{format_entity_for_prompt(entity)}\n</entity>"
+        for index, (entity, age_check) in enumerate(zip(entities, age_checks))
+    )
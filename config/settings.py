@@ -1,14 +1,26 @@
 """
 Configuration settings for the adverse media screening system.
 
-Loads configuration from environment variables using Pydantic Settings.
+Loads configuration from environment variables (and the .env file) into a
+frozen dataclass. Values are converted to the annotated field types and
+range-checked once, in get_settings().
 """
 
+import dataclasses
+import os
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import (
+    Any, Dict, FrozenSet, Mapping, Optional, Tuple, Union, get_args, get_origin, get_type_hints,
+)
 
-from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from dotenv import dotenv_values
+
+ENV_FILE = ".env"
+
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on", "y", "t"})
+_FALSE_VALUES = frozenset({"0", "false", "no", "off", "n", "f"})
 
 
 class LLMProvider(str, Enum):
@@ -19,103 +31,212 @@ class LLMProvider(str, Enum):
     ANTHROPIC = "anthropic"
 
 
-class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
+def _setting(
+    default: Any,
+    description: str,
+    ge: Optional[float] = None,
+    le: Optional[float] = None,
+) -> Any:
+    """Declare a settings field with optional inclusive bounds."""
+    return field(default=default, metadata={"description": description, "ge": ge, "le": le})
 
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        case_sensitive=False,
-        extra="ignore",
-    )
+
+def _validate_log_level(v: str) -> str:
+    """Validate log level."""
+    valid_levels = ["DEBUG", "INFO", "WARN", "WARNING", "ERROR", "CRITICAL"]
+    v_upper = v.upper()
+    if v_upper not in valid_levels:
+        raise ValueError(f"Invalid log level: {v}. Must be one of {valid_levels}")
+    return v_upper
+
+
+def _validate_log_format(v: str) -> str:
+    """Validate log format."""
+    valid_formats = ["json", "text"]
+    v_lower = v.lower()
+    if v_lower not in valid_formats:
+        raise ValueError(f"Invalid log format: {v}. Must be one of {valid_formats}")
+    return v_lower
+
+
+def _validate_report_mode(v: str) -> str:
+    """Validate report mode."""
+    valid_modes = ["template", "llm_full"]
+    v_lower = v.lower()
+    if v_lower not in valid_modes:
+        raise ValueError(f"Invalid report mode: {v}. Must be one of {valid_modes}")
+    return v_lower
+
+
+@lru_cache(maxsize=4)
+def _read_env_file(path: str, mtime: float) -> Dict[str, str]:
+    """Parse a .env file; cached per modification time, so unchanged files are parsed once."""
+    return {
+        key: value
+        for key, value in dotenv_values(path, encoding="utf-8").items()
+        if value is not None
+    }
+
+
+def load_env_file(path: str = ENV_FILE) -> Dict[str, str]:
+    """
+    Merge a .env file into os.environ without overriding variables already set.
+
+    Args:
+        path: Path to the .env file. A missing file is ignored.
+
+    Returns:
+        The parsed .env values.
+    """
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return {}
+
+    values = _read_env_file(path, mtime)
+    for key, value in values.items():
+        os.environ.setdefault(key, value)
+    return values
+
+
+def _convert(name: str, raw: str, annotation: Any) -> Any:
+    """Convert a raw environment string to a field's annotated type."""
+    if get_origin(annotation) is Union:
+        # Optional[X]: only X is ever read from the environment
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+
+    if annotation is bool:
+        value = raw.strip().lower()
+        if value in _TRUE_VALUES:
+            return True
+        if value in _FALSE_VALUES:
+            return False
+        raise ValueError(f"Invalid boolean for {name}: {raw!r}")
+    try:
+        return annotation(raw.strip()) if annotation is not str else raw
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {raw!r}") from None
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Application settings loaded from environment variables."""
 
     # -------------------------------------------------------------------------
     # LLM Provider Configuration
     # -------------------------------------------------------------------------
-    default_llm_provider: LLMProvider = Field(
+    default_llm_provider: LLMProvider = _setting(
         default=LLMProvider.GROQ,
         description="Default LLM provider to use",
     )
 
     # API Keys
-    groq_api_key: Optional[str] = Field(default=None, description="Groq API key")
-    openai_api_key: Optional[str] = Field(default=None, description="OpenAI API key")
-    anthropic_api_key: Optional[str] = Field(default=None, description="Anthropic API key")
+    groq_api_key: Optional[str] = _setting(default=None, description="Groq API key")
+    openai_api_key: Optional[str] = _setting(default=None, description="OpenAI API key")
+    anthropic_api_key: Optional[str] = _setting(default=None, description="Anthropic API key")
 
     # Model names per provider
-    groq_model: str = Field(
+    groq_model: str = _setting(
         default="llama-3.3-70b-versatile",
         description="Groq model to use",
     )
-    openai_model: str = Field(
+    openai_model: str = _setting(
         default="gpt-4o-2024-11-20",
         description="OpenAI model to use",
     )
-    anthropic_model: str = Field(
+    anthropic_model: str = _setting(
         default="claude-sonnet-4-20250514",
         description="Anthropic model to use",
     )
 
+    # Per-task model overrides for the default provider (None = the provider's model)
+    entity_extraction_model: Optional[str] = _setting(
+        default=None, description="Model for entity extraction"
+    )
+    name_matching_model: Optional[str] = _setting(
+        default=None, description="Model for name matching"
+    )
+    sentiment_analysis_model: Optional[str] = _setting(
+        default=None, description="Model for sentiment analysis"
+    )
+    report_generation_model: Optional[str] = _setting(
+        default=None, description="Model for report generation"
+    )
+
     # -------------------------------------------------------------------------
     # LLM Behavior
     # -------------------------------------------------------------------------
-    llm_temperature: float = Field(
+    llm_temperature: float = _setting(
         default=0.0,
         ge=0.0,
         le=2.0,
         description="LLM temperature (0 = deterministic)",
     )
-    max_retries: int = Field(
+    max_retries: int = _setting(
         default=3,
         ge=0,
         le=10,
         description="Maximum retries for failed LLM calls",
     )
-    request_timeout: int = Field(
+    request_timeout: int = _setting(
         default=60,
         ge=10,
         le=300,
-        description="Request timeout in seconds",
+        description="Per-request timeout for LLM calls in seconds (retried up to max_retries)",
     )
-    enable_prompt_caching: bool = Field(
+    enable_prompt_caching: bool = _setting(
         default=True,
         description="Enable prompt caching (Anthropic only)",
     )
-    enable_fallback: bool = Field(
+    compact_prompts: bool = _setting(
+        default=True,
+        description="Strip non-semantic whitespace and asides from prompts at load time",
+    )
+    enable_fallback: bool = _setting(
         default=False,
         description="Enable provider fallback on failure",
     )
+    enable_hedging: bool = _setting(
+        default=False,
+        description="Race slow calls against the fallback providers (needs enable_fallback and temperature 0)",
+    )
+    hedge_delay_ms: int = _setting(
+        default=2000,
+        ge=100,
+        le=60000,
+        description="How long a call may run before a hedged call is started on the next provider",
+    )
 
     # -------------------------------------------------------------------------
     # Observability & Logging
     # -------------------------------------------------------------------------
-    log_level: str = Field(
+    log_level: str = _setting(
         default="INFO",
         description="Logging level (DEBUG, INFO, WARN, ERROR)",
     )
-    log_format: str = Field(
+    log_format: str = _setting(
         default="json",
         description="Log format (json or text)",
     )
-    save_logs: bool = Field(
+    save_logs: bool = _setting(
         default=True,
         description="Save logs to file",
     )
-    log_file: str = Field(
+    log_file: str = _setting(
         default="outputs/screening.log",
         description="Log file path",
     )
 
     # LangSmith
-    langsmith_api_key: Optional[str] = Field(
+    langsmith_api_key: Optional[str] = _setting(
         default=None,
         description="LangSmith API key for observability",
     )
-    langsmith_project: str = Field(
+    langsmith_project: str = _setting(
         default="adverse-media-screening",
         description="LangSmith project name",
     )
-    langsmith_tracing: bool = Field(
+    langsmith_tracing: bool = _setting(
         default=False,
         description="Enable LangSmith tracing",
     )
@@ -123,17 +244,17 @@ class Settings(BaseSettings):
     # -------------------------------------------------------------------------
     # Article Fetching
     # -------------------------------------------------------------------------
-    user_agent: str = Field(
+    user_agent: str = _setting(
         default="Mozilla/5.0 (compatible; AdverseMediaScreener/1.0)",
         description="User agent for web requests",
     )
-    article_fetch_timeout: int = Field(
+    article_fetch_timeout: int = _setting(
         default=30,
         ge=5,
         le=120,
         description="Timeout for article fetching in seconds",
     )
-    max_article_length: int = Field(
+    max_article_length: int = _setting(
         default=50000,
         ge=1000,
         le=200000,
@@ -143,69 +264,245 @@ class Settings(BaseSettings):
     # -------------------------------------------------------------------------
     # Matching Configuration
     # -------------------------------------------------------------------------
-    age_tolerance: int = Field(
+    age_tolerance: int = _setting(
         default=2,
         ge=0,
         le=10,
         description="Age tolerance for matching (years)",
     )
-    min_match_probability: float = Field(
+    enable_match_prefilter: bool = _setting(
+        default=True,
+        description="Skip LLM matching for entities with an unrelated name or incompatible age",
+    )
+    enable_batched_matching: bool = _setting(
+        default=True,
+        description="Assess all candidate entities of an article in one LLM call "
+        "(entities it does not cover get one call each)",
+    )
+    enable_match_early_exit: bool = _setting(
+        default=True,
+        description="Stop assessing entities one by one once one is a decisive match "
+        "(see match_early_exit_probability)",
+    )
+    match_early_exit_probability: float = _setting(
+        default=0.95,
+        ge=0.0,
+        le=1.0,
+        description="Minimum probability of a HIGH-confidence match to stop matching early",
+    )
+    prefilter_min_name_score: float = _setting(
+        default=50.0,
+        ge=0.0,
+        le=100.0,
+        description="Minimum token-set name similarity (0-100) for an entity to reach LLM matching",
+    )
+    min_match_probability: float = _setting(
         default=0.4,
         ge=0.0,
         le=1.0,
         description="Minimum probability to consider as potential match",
     )
-    high_confidence_threshold: float = Field(
+    high_confidence_threshold: float = _setting(
         default=0.8,
         ge=0.0,
         le=1.0,
         description="Threshold for high confidence match",
     )
-    medium_confidence_threshold: float = Field(
+    medium_confidence_threshold: float = _setting(
         default=0.6,
         ge=0.0,
         le=1.0,
         description="Threshold for medium confidence match",
     )
 
+    # -------------------------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------------------------
+    report_mode: str = _setting(
+        default="template",
+        description="Report generation mode (template or llm_full)",
+    )
+    template_no_match_reports: bool = _setting(
+        default=True,
+        description="Render NO_MATCH reports from the template without an LLM call (in either report mode)",
+    )
+
     # -------------------------------------------------------------------------
     # Performance & Cost
     # -------------------------------------------------------------------------
-    enable_caching: bool = Field(
+    enable_caching: bool = _setting(
+        default=False,
+        description="Enable on-disk caching of LLM responses",
+    )
+    cache_dir: str = _setting(
+        default="data/llm_cache",
+        description="Directory for cached LLM responses",
+    )
+    cache_ttl_days: int = _setting(
+        default=7,
+        ge=0,
+        le=365,
+        description="Time-to-live for cached LLM responses (days)",
+    )
+    enable_semantic_cache: bool = _setting(
         default=False,
-        description="Enable result caching (not implemented in MVP)",
+        description="Reuse responses for near-duplicate articles (requires sentence-transformers)",
     )
-    max_concurrent_requests: int = Field(
+    semantic_cache_model: str = _setting(
+        default="sentence-transformers/all-MiniLM-L6-v2",
+        description="Local embedding model for the semantic cache",
+    )
+    semantic_cache_threshold: float = _setting(
+        default=0.92,
+        ge=0.0,
+        le=1.0,
+        description="Minimum cosine similarity for a semantic cache hit",
+    )
+    semantic_cache_min_overlap: float = _setting(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="Minimum named-entity Jaccard overlap for a semantic cache hit",
+    )
+    semantic_cache_max_entries: int = _setting(
+        default=100_000,
+        ge=1,
+        description="Maximum entries per semantic cache index (LRU eviction)",
+    )
+    use_batch_api: bool = _setting(
+        default=False,
+        description="Submit large multi-article jobs to the provider batch API (50% cheaper). "
+        "Only used by src.llm.BatchProcessor, not by the screening workflow",
+    )
+    batch_min_size: int = _setting(
+        default=100,
+        ge=1,
+        description="Minimum number of articles before BatchProcessor uses the batch API",
+    )
+    batch_poll_interval: int = _setting(
+        default=30,
+        ge=1,
+        le=3600,
+        description="Seconds between batch job status checks",
+    )
+    enable_speculative_sentiment: bool = _setting(
+        default=False,
+        description="Analyze sentiment for the query name in parallel with extraction "
+        "(lower latency for matches; wastes one LLM call on every NO_MATCH screening)",
+    )
+    enable_sentiment_excerpts: bool = _setting(
+        default=True,
+        description="Send sentiment analysis of long articles only the sentences around the person's mentions",
+    )
+    sentiment_excerpt_min_tokens: int = _setting(
+        default=1500,
+        ge=0,
+        description="Article length (tokens) from which sentiment analysis gets an excerpt",
+    )
+    sentiment_context_sentences: int = _setting(
+        default=2,
+        ge=0,
+        le=20,
+        description="Sentences kept on each side of a mention in sentiment excerpts",
+    )
+    enable_combined_screening: bool = _setting(
+        default=False,
+        description="Screen short articles with one combined extraction/matching/sentiment call",
+    )
+    combined_screening_max_tokens: int = _setting(
+        default=2000,
+        ge=100,
+        le=100000,
+        description="Largest article (in tokens) screened with the combined call",
+    )
+    checkpoint_path: Optional[str] = _setting(
+        default=None,
+        description="SQLite file for workflow checkpoints, so interrupted runs resume "
+        "(requires langgraph-checkpoint-sqlite)",
+    )
+    max_concurrent_requests: int = _setting(
         default=3,
         ge=1,
         le=10,
         description="Maximum concurrent LLM requests",
     )
-    cost_alert_threshold: float = Field(
+    cost_alert_threshold: float = _setting(
         default=1.0,
         ge=0.0,
         description="Cost alert threshold in USD",
     )
 
-    @field_validator("log_level")
-    @classmethod
-    def validate_log_level(cls, v: str) -> str:
-        """Validate log level."""
-        valid_levels = ["DEBUG", "INFO", "WARN", "WARNING", "ERROR", "CRITICAL"]
-        v_upper = v.upper()
-        if v_upper not in valid_levels:
-            raise ValueError(f"Invalid log level: {v}. Must be one of {valid_levels}")
-        return v_upper
-
-    @field_validator("log_format")
+    # Provider lookup tables, built once in __post_init__
+    _api_keys: Dict[LLMProvider, Optional[str]] = field(init=False, repr=False, compare=False)
+    _models: Dict[LLMProvider, str] = field(init=False, repr=False, compare=False)
+    _task_models: Dict[str, Optional[str]] = field(init=False, repr=False, compare=False)
+    # Providers with an API key, in declaration order (also the fallback order)
+    _available: Tuple[LLMProvider, ...] = field(init=False, repr=False, compare=False)
+    _available_set: FrozenSet[LLMProvider] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Validate the values and build the per-provider lookup tables."""
+        for f in dataclasses.fields(self):
+            if not f.init:
+                continue
+            value = getattr(self, f.name)
+            ge, le = f.metadata.get("ge"), f.metadata.get("le")
+            if ge is not None and value < ge:
+                raise ValueError(f"{f.name} must be >= {ge}, got {value}")
+            if le is not None and value > le:
+                raise ValueError(f"{f.name} must be <= {le}, got {value}")
+
+        # Frozen dataclass: normalized values and derived tables are set via object.__setattr__
+        set_ = object.__setattr__
+        set_(self, "default_llm_provider", LLMProvider(self.default_llm_provider))
+        set_(self, "log_level", _validate_log_level(self.log_level))
+        set_(self, "log_format", _validate_log_format(self.log_format))
+        set_(self, "report_mode", _validate_report_mode(self.report_mode))
+
+        set_(self, "_api_keys", {
+            LLMProvider.GROQ: self.groq_api_key,
+            LLMProvider.OPENAI: self.openai_api_key,
+            LLMProvider.ANTHROPIC: self.anthropic_api_key,
+        })
+        set_(self, "_models", {
+            LLMProvider.GROQ: self.groq_model,
+            LLMProvider.OPENAI: self.openai_model,
+            LLMProvider.ANTHROPIC: self.anthropic_model,
+        })
+        set_(self, "_task_models", {
+            "entity_extraction": self.entity_extraction_model,
+            "name_matching": self.name_matching_model,
+            "sentiment_analysis": self.sentiment_analysis_model,
+            "report_generation": self.report_generation_model,
+        })
+        available = tuple(p for p in LLMProvider if self._api_keys[p])
+        set_(self, "_available", available)
+        set_(self, "_available_set", frozenset(available))
+
     @classmethod
-    def validate_log_format(cls, v: str) -> str:
-        """Validate log format."""
-        valid_formats = ["json", "text"]
-        v_lower = v.lower()
-        if v_lower not in valid_formats:
-            raise ValueError(f"Invalid log format: {v}. Must be one of {valid_formats}")
-        return v_lower
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+        """
+        Build settings from environment variables.
+
+        Variable names are matched case-insensitively against the field names.
+
+        Args:
+            environ: Variables to read instead of os.environ.
+
+        Returns:
+            Settings instance
+        """
+        if environ is None:
+            environ = os.environ
+
+        lowered = {key.lower(): value for key, value in environ.items()}
+        hints = get_type_hints(cls)
+        kwargs = {
+            f.name: _convert(f.name, lowered[f.name], hints[f.name])
+            for f in dataclasses.fields(cls)
+            if f.init and f.name in lowered
+        }
+        return cls(**kwargs)
 
     def get_available_providers(self) -> list[LLMProvider]:
         """
@@ -214,14 +511,7 @@ class Settings(BaseSettings):
         Returns:
             List of available LLM providers
         """
-        available = []
-        if self.groq_api_key:
-            available.append(LLMProvider.GROQ)
-        if self.openai_api_key:
-            available.append(LLMProvider.OPENAI)
-        if self.anthropic_api_key:
-            available.append(LLMProvider.ANTHROPIC)
-        return available
+        return list(self._available)
 
     def get_api_key(self, provider: LLMProvider) -> Optional[str]:
         """
@@ -233,13 +523,7 @@ class Settings(BaseSettings):
         Returns:
             API key if available, None otherwise
         """
-        if provider == LLMProvider.GROQ:
-            return self.groq_api_key
-        elif provider == LLMProvider.OPENAI:
-            return self.openai_api_key
-        elif provider == LLMProvider.ANTHROPIC:
-            return self.anthropic_api_key
-        return None
+        return self._api_keys.get(provider)
 
     def get_model_name(self, provider: LLMProvider) -> str:
         """
@@ -251,13 +535,20 @@ class Settings(BaseSettings):
         Returns:
             Model name
         """
-        if provider == LLMProvider.GROQ:
-            return self.groq_model
-        elif provider == LLMProvider.OPENAI:
-            return self.openai_model
-        elif provider == LLMProvider.ANTHROPIC:
-            return self.anthropic_model
-        return ""
+        return self._models.get(provider, "")
+
+    def get_task_model_name(self, provider: LLMProvider, task: str) -> str:
+        """
+        Get the model name for one workflow task.
+
+        Args:
+            provider: LLM provider
+            task: Task name (a config.prompts.PROMPTS key, e.g. "name_matching")
+
+        Returns:
+            The task's override model, or the provider's model if none is set
+        """
+        return self._task_models.get(task) or self.get_model_name(provider)
 
     def validate_provider(self, provider: LLMProvider) -> bool:
         """
@@ -269,7 +560,7 @@ class Settings(BaseSettings):
         Returns:
             True if provider is available, False otherwise
         """
-        return provider in self.get_available_providers()
+        return provider in self._available_set
 
     def get_fallback_providers(self, primary: LLMProvider) -> list[LLMProvider]:
         """
@@ -283,23 +574,19 @@ class Settings(BaseSettings):
         """
         if not self.enable_fallback:
             return []
-
-        available = self.get_available_providers()
-        return [p for p in available if p != primary]
-
-
-# Singleton instance
-_settings: Optional[Settings] = None
+        return [p for p in self._available if p != primary]
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get singleton settings instance.
 
+    The .env file is merged into os.environ (real environment variables take
+    precedence) and the settings are read and validated once per process.
+
     Returns:
         Settings instance
     """
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
\ No newline at end of file
+    load_env_file()
+    return Settings.from_env()
@@ -1,33 +1,36 @@
 # run_e2e.py
 
-import subprocess
+import argparse
+import asyncio
+import re
+from datetime import date
 
 
 TEST_CASES = [
     {
         "name": "Elizabeth Holmes",
-        "dob": "1984-02-03",
+        "dob": date(1984, 2, 3),
         "url": "https://www.bbc.co.uk/news/world-us-canada-63685131",
         "description": "High-risk adverse match; convicted of investor fraud in Theranos case with high severity risk.",
         "expected_decision": "MATCH"
     },
     {
         "name": "Satya Nadella",
-        "dob": "1967-08-19",
+        "dob": date(1967, 8, 19),
         "url": "https://www.ft.com/content/718d5bac-8bcb-4aaf-8554-08763b6144e4", 
         "description": "Match-negative no client mention; Article about apple, neutral or slighly negative content.",
         "expected_decision": "NO_MATCH"
     },
     {
         "name": "Chris Smith",
-        "dob": "1990-01-01",
+        "dob": date(1990, 1, 1),
         "url": "https://www.skysports.com/football/news/11095/13472276/sheffield-wednesday-vs-sheffield-united-why-the-first-steel-city-derby-of-the-season-carries-more-weight-than-usual",  # Article about arrest of a John Smith with minimal identifying info
         "description": "Ambiguous match; common name with adverse event but no unique identifiers to confirm individual.",
         "expected_decision": "UNCERTAIN"
     },
     {
         "name": "Paul Anderson",
-        "dob": "1978-01-01",
+        "dob": date(1978, 1, 1),
         "url": "https://www.bbc.co.uk/news/articles/cjr4z2g5557o",
         "description": "Match-negative no client mention; article about adverse event, client name not mentioned so no match.",
         "expected_decision": "NO_MATCH"
@@ -38,67 +41,114 @@ TEST_CASES = [
 
 # run_e2e.py
 
+# The 'FINAL_DECISION: <decision>' line printed by `src.main screen`
+_DECISION_RE = re.compile(r"FINAL_DECISION:\s*(MATCH|NO_MATCH|UNCERTAIN)\b")
+
+
 def parse_decision(output: str) -> str:
     """
-    Parses the final screening decision from the output summary table.
-    Looks for the line containing 'Screening Decision'
+    Parses the final screening decision from the CLI output.
+    Looks for the 'FINAL_DECISION: <decision>' line.
+    """
+    match = _DECISION_RE.search(output)
+    return match.group(1) if match else "UNKNOWN" # Returns UNKNOWN if the decision line wasn't found
+
+
+async def run_test_case(case: dict, llm_factory=None) -> dict:
+    """
+    Runs one test case in-process via src.main.arun_screening.
+
+    All cases share one interpreter, so langchain/pydantic are imported once
+    instead of once per case. Passing the same llm_factory to every case also
+    shares the LLM client (and its connection pool and chains) between them.
+    """
+    from src.main import arun_screening
+
+    output = [f"\n--- Running Case: {case['name']} ({case['description']}) ---"]
+
+    try:
+        result = await arun_screening(case["name"], case["dob"], case["url"], llm_factory=llm_factory)
+        actual_decision: str = result.decision
+        output.append(f"✅ Case {case['name']} COMPLETED successfully. Decision: {actual_decision}")
+        failed = False
+    except Exception as e:
+        actual_decision = "UNKNOWN"
+        output.append(f"❌ Case {case['name']} FAILED: {e.__class__.__name__}: {e}")
+        failed = True
+
+    print("\n".join(output), flush=True)
+
+    return {
+        "name": case["name"],
+        "expected": case["expected_decision"],
+        "actual": actual_decision,
+        "failed": failed,
+    }
+
+
+async def run_test_case_isolated(case: dict) -> dict:
     """
-    for line in output.splitlines():
-        # Look for the line in the table that contains the decision:
-        # e.g., '│ Screening Decision │ MATCH               │'
-        if 'Screening Decision' in line:
-            # Split the line by the column separator (│), take the third element, and clean it up.
-            parts = line.split('│')
-            if len(parts) >= 3:
-                # The decision is in the third column (index 2 or 3 depending on leading/trailing columns)
-                # Let's target the last non-empty part which contains the decision
-                decision = parts[-2].strip() 
-                # Decision will be 'MATCH', 'NO_MATCH', or 'UNCERTAIN'
-                if decision in ["MATCH", "NO_MATCH", "UNCERTAIN"]:
-                    return decision
-    return "UNKNOWN" # Returns UNKNOWN if the decision row wasn't found
-
-
-def run_test_case(case: dict):
+    Runs one test case in its own `src.main screen` subprocess.
 
+    The child is awaited without blocking, so all cases run concurrently on one
+    event loop. Output is buffered and printed in one go at the end, so cases
+    running in parallel do not interleave their logs.
+    """
     command_parts = [
         "python", "-m", "src.main", "screen",
         f"--name", case["name"],
-        f"--dob", case["dob"],
+        f"--dob", case["dob"].isoformat(),
         f"--url", case["url"]
     ]
     
-    print(f"\n--- Running Case: {case['name']} ({case['description']}) ---")
+    output = [f"\n--- Running Case: {case['name']} ({case['description']}) ---"]
     
     # Execute the command
-    result = subprocess.run(
-        command_parts,
-        capture_output=True,
-        text=True,
-        check=False
+    process = await asyncio.create_subprocess_exec(
+        *command_parts,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
     )
+    stdout_bytes, stderr_bytes = await process.communicate()
+    stdout = stdout_bytes.decode("utf-8", errors="replace")
 
-    actual_decision = parse_decision(result.stdout)
+    actual_decision = parse_decision(stdout)
     
-    if result.returncode == 0:
-        print(f"✅ Case {case['name']} COMPLETED successfully. Decision: {actual_decision}")
+    if process.returncode == 0:
+        output.append(f"✅ Case {case['name']} COMPLETED successfully. Decision: {actual_decision}")
         # Print the output that was captured, which includes the report path.
-        print(result.stdout) 
-
-        return {
-            "name": case["name"],
-            "expected": case["expected_decision"],
-            "actual": actual_decision
-        }
-
+        output.append(stdout)
+        failed = False
     else:
-        print(f"❌ Case {case['name']} FAILED with return code {result.returncode}.")
+        output.append(f"❌ Case {case['name']} FAILED with return code {process.returncode}.")
         # Print the error stream to see why the script crashed
-        print("\n--- ERROR OUTPUT (stderr) ---")
-        print(result.stderr) 
-        print("-----------------------------")
+        output.append("\n--- ERROR OUTPUT (stderr) ---")
+        output.append(stderr_bytes.decode("utf-8", errors="replace"))
+        output.append("-----------------------------")
+        failed = True
+
+    print("\n".join(output), flush=True)
+
+    return {
+        "name": case["name"],
+        "expected": case["expected_decision"],
+        "actual": actual_decision,
+        "failed": failed,
+    }
+
 
-        return None
+async def run_cases(cases: list) -> list:
+    """Runs every case in-process on one event loop, all at once, sharing one LLM factory."""
+    from config.settings import get_settings
+    from src.llm import LLMFactory
+
+    llm_factory = LLMFactory(get_settings())
+    return list(await asyncio.gather(*(run_test_case(case, llm_factory) for case in cases)))
+
+
+async def run_isolated_cases(cases: list) -> list:
+    """Runs every case in its own subprocess, all at once."""
+    return list(await asyncio.gather(*(run_test_case_isolated(case) for case in cases)))
 
 
 def calculate_metrics(results: list):
@@ -119,7 +169,7 @@ def calculate_metrics(results: list):
 
     for res in results:
 
-        if res is None: 
+        if res["failed"]:
             continue
 
         expected = res["expected"]
@@ -159,12 +209,24 @@ def calculate_metrics(results: list):
     }
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the end-to-end screening test suite.")
+    parser.add_argument(
+        "--isolated",
+        action="store_true",
+        help="Run each case through the CLI in its own subprocess instead of in-process.",
+    )
+    args = parser.parse_args()
+
     print("Starting End-to-End Test Suite...")
     
-    all_results = []
-    for i, case in enumerate(TEST_CASES):
-        result = run_test_case(case)
-        all_results.append(result)
+    # Cases are independent and I/O-bound on LLM calls, so run them all at once:
+    # wall time is the slowest case instead of the sum of all cases.
+    from src.utils.event_loop import run_async
+
+    if args.isolated:
+        all_results = run_async(run_isolated_cases(TEST_CASES))
+    else:
+        all_results = run_async(run_cases(TEST_CASES))
 
     print("\n" + "="*50)
     print("End-to-End Test Suite FINISHED.")
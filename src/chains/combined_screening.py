@@ -0,0 +1,54 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from src.chains.memo import memoize_per_llm
+
+# langchain is imported when a chain is first built, not when this module is imported
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseLanguageModel
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.runnables import Runnable
+
+
+@lru_cache(maxsize=2)
+def _get_prompt(prompt_caching: bool) -> "ChatPromptTemplate":
+    from langchain_core.prompts import ChatPromptTemplate
+
+    from config.prompts import (
+        COMBINED_SCREENING_SYSTEM_PROMPT,
+        COMBINED_SCREENING_STATIC,
+        COMBINED_SCREENING_DYNAMIC,
+    )
+    from src.chains.messages import build_system_message, build_user_message
+
+    return ChatPromptTemplate.from_messages(
+        [
+            build_system_message(COMBINED_SCREENING_SYSTEM_PROMPT, prompt_caching),
+            build_user_message(COMBINED_SCREENING_STATIC, COMBINED_SCREENING_DYNAMIC, prompt_caching),
+        ]
+    )
+
+
+@memoize_per_llm
+def create_combined_screening_chain(llm: "BaseLanguageModel", prompt_caching: bool = False) -> "Runnable":
+    """
+    Creates the LangChain Runnable that extracts, matches and analyzes sentiment
+    in a single call, for articles short enough to screen in one pass.
+
+    Built once per LLM instance; the prompt template is shared between LLM
+    instances.
+
+    Args:
+        llm: The configured LLM.
+        prompt_caching: Mark the system prompt and static block as Anthropic cache breakpoints.
+
+    Returns:
+        A LangChain Runnable that takes prompt variables and returns a CombinedScreeningOutput instance.
+    """
+    from src.chains.structured import with_structured_output
+    from src.models.schemas import CombinedScreeningOutput
+
+    return (
+        _get_prompt(prompt_caching)
+        | with_structured_output(llm, CombinedScreeningOutput)
+    ).with_config(tags=["combined_screening_chain"])
@@ -1,36 +1,55 @@
-from typing import Type
-from langchain_core.language_models import BaseLanguageModel
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import Runnable
-from langchain_core.output_parsers import JsonOutputParser
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
+from src.chains.memo import memoize_per_llm
 
-from config.prompts import ENTITY_EXTRACTION_SYSTEM_PROMPT, ENTITY_EXTRACTION_USER_PROMPT
-from src.nodes.base import BaseNode
-from src.models.schemas import ExtractionOutput
+# langchain is imported when a chain is first built, not when this module is imported
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseLanguageModel
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.runnables import Runnable
 
-def create_entity_extraction_chain(llm: BaseLanguageModel) -> Runnable:
+
+@lru_cache(maxsize=2)
+def _get_prompt(prompt_caching: bool) -> "ChatPromptTemplate":
+    from langchain_core.prompts import ChatPromptTemplate
+
+    from config.prompts import (
+        ENTITY_EXTRACTION_SYSTEM_PROMPT,
+        ENTITY_EXTRACTION_STATIC,
+        ENTITY_EXTRACTION_DYNAMIC,
+    )
+    from src.chains.messages import build_system_message, build_user_message
+
+    return ChatPromptTemplate.from_messages(
+        [
+            build_system_message(ENTITY_EXTRACTION_SYSTEM_PROMPT, prompt_caching),
+            build_user_message(ENTITY_EXTRACTION_STATIC, ENTITY_EXTRACTION_DYNAMIC, prompt_caching),
+        ]
+    )
+
+
+@memoize_per_llm
+def create_entity_extraction_chain(llm: "BaseLanguageModel", prompt_caching: bool = False) -> "Runnable":
     """
     Creates the LangChain Runnable for Entity Extraction (Section 5.1).
 
+    Built once per LLM instance; the prompt template is shared between LLM
+    instances.
+
     Args:
         llm: The configured LLM (e.g., ChatOpenAI, ChatAnthropic).
+        prompt_caching: Mark the system prompt and static block as Anthropic cache breakpoints.
 
     Returns:
-        A LangChain Runnable that takes prompt variables and returns an ExtractionOutput model.
+        A LangChain Runnable that takes prompt variables and returns an ExtractionOutput instance.
     """
-    output_parser = JsonOutputParser(pydantic_object=ExtractionOutput)
-
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", ENTITY_EXTRACTION_SYSTEM_PROMPT),
-            ("human", ENTITY_EXTRACTION_USER_PROMPT),
-        ]
-    ).partial(format_instructions=output_parser.get_format_instructions())
+    from src.chains.structured import with_structured_output
+    from src.models.schemas import ExtractionOutput
 
+    # The provider enforces the schema (tool calling / JSON schema mode) and the
+    # result is already a validated model, so no output parser is needed.
     return (
-        prompt
-        | llm
-        | output_parser
+        _get_prompt(prompt_caching)
+        | with_structured_output(llm, ExtractionOutput)
     ).with_config(tags=["extraction_chain"])
\ No newline at end of file
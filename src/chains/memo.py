@@ -0,0 +1,39 @@
+# src/chains/memo.py
+
+"""
+Per-LLM memoization for the chain factories.
+
+Building a chain (prompt template, output parser, config) is pure setup work, so
+each factory builds it once per (LLM client, prompt_caching) and reuses it for
+every later screening. The LLM object itself is kept alongside the chain so its
+id() cannot be reused by a different client while the entry is alive.
+"""
+
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def memoize_per_llm(factory: F) -> F:
+    """
+    Cache a create_*_chain(llm, prompt_caching=False) factory per LLM instance.
+    """
+    cache: Dict[Tuple[int, bool], Tuple[Any, Any]] = {}
+    lock = threading.Lock()
+
+    @wraps(factory)
+    def wrapper(llm: Any, prompt_caching: bool = False) -> Any:
+        key = (id(llm), prompt_caching)
+        entry = cache.get(key)
+        if entry is not None and entry[0] is llm:
+            return entry[1]
+
+        with lock:
+            entry = cache.get(key)
+            if entry is None or entry[0] is not llm:
+                entry = cache[key] = (llm, factory(llm, prompt_caching))
+        return entry[1]
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,60 @@
+# src/chains/messages.py
+
+"""
+Message builders shared by the chain factories.
+
+Every user prompt is split into a static instruction block and a small dynamic
+block (see config/prompts.py). Providers cache by prompt prefix, so the static
+block always comes first; with Anthropic both the system prompt and the static
+block are marked as explicit cache breakpoints.
+"""
+
+from typing import Tuple, Union
+
+EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def build_system_message(system: str, prompt_caching: bool = False) -> Tuple[str, Union[str, list]]:
+    """
+    Build the ("system", content) message template for a chain.
+
+    Args:
+        system: The system prompt (fully static).
+        prompt_caching: Mark the system prompt with Anthropic's cache_control.
+
+    Returns:
+        A message tuple suitable for ChatPromptTemplate.from_messages.
+    """
+    if not prompt_caching:
+        return ("system", system)
+
+    return (
+        "system",
+        [{"type": "text", "text": system, "cache_control": EPHEMERAL_CACHE_CONTROL}],
+    )
+
+
+def build_user_message(
+    static: str, dynamic: str, prompt_caching: bool = False
+) -> Tuple[str, Union[str, list]]:
+    """
+    Build the ("human", content) message template for a chain.
+
+    Args:
+        static: The static instruction block (no runtime placeholders).
+        dynamic: The per-call block containing the {placeholders}.
+        prompt_caching: Mark the static block with Anthropic's cache_control.
+
+    Returns:
+        A message tuple suitable for ChatPromptTemplate.from_messages.
+    """
+    if not prompt_caching:
+        return ("human", f"{static}\n\n{dynamic}")
+
+    return (
+        "human",
+        [
+            {"type": "text", "text": static, "cache_control": EPHEMERAL_CACHE_CONTROL},
+            {"type": "text", "text": dynamic},
+        ],
+    )
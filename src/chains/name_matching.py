@@ -1,34 +1,99 @@
-from typing import Type
-from langchain_core.language_models import BaseLanguageModel
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import Runnable
-from langchain_core.output_parsers import JsonOutputParser
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from config.prompts import NAME_MATCHING_SYSTEM_PROMPT, NAME_MATCHING_USER_PROMPT
-from src.models.schemas import NameMatchingOutput
+from src.chains.memo import memoize_per_llm
 
-def create_name_matching_chain(llm: BaseLanguageModel) -> Runnable:
+# langchain is imported when a chain is first built, not when this module is imported
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseLanguageModel
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.runnables import Runnable
+
+
+@lru_cache(maxsize=2)
+def _get_prompt(prompt_caching: bool) -> "ChatPromptTemplate":
+    from langchain_core.prompts import ChatPromptTemplate
+
+    from config.prompts import (
+        NAME_MATCHING_SYSTEM_PROMPT,
+        NAME_MATCHING_STATIC,
+        NAME_MATCHING_DYNAMIC,
+    )
+    from src.chains.messages import build_system_message, build_user_message
+
+    return ChatPromptTemplate.from_messages(
+        [
+            build_system_message(NAME_MATCHING_SYSTEM_PROMPT, prompt_caching),
+            build_user_message(NAME_MATCHING_STATIC, NAME_MATCHING_DYNAMIC, prompt_caching),
+        ]
+    )
+
+
+@memoize_per_llm
+def create_name_matching_chain(llm: "BaseLanguageModel", prompt_caching: bool = False) -> "Runnable":
     """
     Creates the LangChain Runnable for Name Matching (Section 5.2).
 
+    Built once per LLM instance; the prompt template is shared between LLM
+    instances.
+
     Args:
         llm: The configured LLM.
+        prompt_caching: Mark the system prompt and static block as Anthropic cache breakpoints.
 
     Returns:
-        A LangChain Runnable that takes prompt variables and returns a NameMatchingOutput model.
+        A LangChain Runnable that takes prompt variables and returns a NameMatchingOutput instance.
     """
-    output_parser = JsonOutputParser(pydantic_object=NameMatchingOutput)
+    from src.chains.structured import with_structured_output
+    from src.models.schemas import NameMatchingOutput
+
+    # The provider enforces the schema (tool calling / JSON schema mode) and the
+    # result is already a validated model, so no output parser is needed.
+    return (
+        _get_prompt(prompt_caching)
+        | with_structured_output(llm, NameMatchingOutput)
+    ).with_config(tags=["name_matching_chain"])
+
 
-    prompt = ChatPromptTemplate.from_messages(
+@lru_cache(maxsize=2)
+def _get_batch_prompt(prompt_caching: bool) -> "ChatPromptTemplate":
+    from langchain_core.prompts import ChatPromptTemplate
+
+    from config.prompts import (
+        NAME_MATCHING_BATCH_SYSTEM_PROMPT,
+        NAME_MATCHING_BATCH_STATIC,
+        NAME_MATCHING_BATCH_DYNAMIC,
+    )
+    from src.chains.messages import build_system_message, build_user_message
+
+    return ChatPromptTemplate.from_messages(
         [
-            ("system", NAME_MATCHING_SYSTEM_PROMPT),
-            ("human", NAME_MATCHING_USER_PROMPT),
+            build_system_message(NAME_MATCHING_BATCH_SYSTEM_PROMPT, prompt_caching),
+            build_user_message(NAME_MATCHING_BATCH_STATIC, NAME_MATCHING_BATCH_DYNAMIC, prompt_caching),
         ]
-    ).partial(format_instructions=output_parser.get_format_instructions())
+    )
+
+
+@memoize_per_llm
+def create_batched_name_matching_chain(llm: "BaseLanguageModel", prompt_caching: bool = False) -> "Runnable":
+    """
+    Creates the LangChain Runnable that matches the query person against all
+    candidate entities of an article in one call.
+
+    Built once per LLM instance; the prompt template is shared between LLM
+    instances.
+
+    Args:
+        llm: The configured LLM.
+        prompt_caching: Mark the system prompt and static block as Anthropic cache breakpoints.
+
+    Returns:
+        A LangChain Runnable that takes prompt variables and returns a BatchedNameMatchingOutput instance.
+    """
+    from src.chains.structured import with_structured_output
+    from src.models.schemas import BatchedNameMatchingOutput
 
     return (
-        prompt
-        | llm
-        | output_parser
-    ).with_config(tags=["name_matching_chain"])
\ No newline at end of file
+        _get_batch_prompt(prompt_caching)
+        | with_structured_output(llm, BatchedNameMatchingOutput)
+    ).with_config(tags=["name_matching_batch_chain"])
@@ -3,36 +3,47 @@
 """
 LangChain Runnable for final report generation. (Section 5.4)
 
-This chain takes the complete state (assessments, entities, metadata)
+The full chain takes the complete state (assessments, entities, metadata)
 and uses a specific prompt to generate the final human-readable report string.
+The summary chain only writes the decision paragraph for the templated report.
 """
-from typing import Dict
-from langchain_core.language_models import BaseLanguageModel
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import Runnable
-from langchain_core.output_parsers import StrOutputParser
+from typing import TYPE_CHECKING
 
-# Import prompt constants from config
+from src.chains.memo import memoize_per_llm
 
-from config.prompts import REPORT_GENERATION_SYSTEM_PROMPT, REPORT_GENERATION_USER_PROMPT
+# langchain is imported when a chain is first built, not when this module is imported
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseLanguageModel
+    from langchain_core.runnables import Runnable
 
 
-def create_report_generation_chain(llm: BaseLanguageModel) -> Runnable:
+@memoize_per_llm
+def create_report_generation_chain(llm: "BaseLanguageModel", prompt_caching: bool = False) -> "Runnable":
     """
     Creates the LangChain Runnable for Report Generation (Section 5.4).
 
     Args:
         llm: The configured LLM (e.g., ChatOpenAI, ChatAnthropic).
+        prompt_caching: Mark the system prompt and static block as Anthropic cache breakpoints.
 
     Returns:
         A LangChain Runnable that takes prompt variables and returns the final report string.
     """
+    from langchain_core.output_parsers import StrOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
+
+    from config.prompts import (
+        REPORT_GENERATION_SYSTEM_PROMPT,
+        REPORT_GENERATION_STATIC,
+        REPORT_GENERATION_DYNAMIC,
+    )
+    from src.chains.messages import build_system_message, build_user_message
     
     # 1. Define the Prompt Template 
     prompt = ChatPromptTemplate.from_messages(
         [
-            ("system", REPORT_GENERATION_SYSTEM_PROMPT),
-            ("human", REPORT_GENERATION_USER_PROMPT),
+            build_system_message(REPORT_GENERATION_SYSTEM_PROMPT, prompt_caching),
+            build_user_message(REPORT_GENERATION_STATIC, REPORT_GENERATION_DYNAMIC, prompt_caching),
         ]
     )
 
@@ -43,4 +54,43 @@ def create_report_generation_chain(llm: BaseLanguageModel) -> Runnable:
         | StrOutputParser()
     ).with_config(tags=["report_generation_chain"])
     
-    return chain
\ No newline at end of file
+    return chain
+
+
+@memoize_per_llm
+def create_report_summary_chain(llm: "BaseLanguageModel", prompt_caching: bool = False) -> "Runnable":
+    """
+    Creates the LangChain Runnable for the decision summary paragraph.
+
+    Used in template report mode, where every other report section is rendered
+    locally (see src/utils/report_renderer.py).
+
+    Args:
+        llm: The configured LLM (e.g., ChatOpenAI, ChatAnthropic).
+        prompt_caching: Mark the system prompt and static block as Anthropic cache breakpoints.
+
+    Returns:
+        A LangChain Runnable that takes prompt variables and returns the summary string.
+    """
+    from langchain_core.output_parsers import StrOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
+
+    from config.prompts import (
+        REPORT_SUMMARY_SYSTEM_PROMPT,
+        REPORT_SUMMARY_STATIC,
+        REPORT_SUMMARY_DYNAMIC,
+    )
+    from src.chains.messages import build_system_message, build_user_message
+
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            build_system_message(REPORT_SUMMARY_SYSTEM_PROMPT, prompt_caching),
+            build_user_message(REPORT_SUMMARY_STATIC, REPORT_SUMMARY_DYNAMIC, prompt_caching),
+        ]
+    )
+
+    return (
+        prompt
+        | llm
+        | StrOutputParser()
+    ).with_config(tags=["report_summary_chain"])
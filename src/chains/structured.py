@@ -0,0 +1,39 @@
+# src/chains/structured.py
+
+"""
+Structured-output binding shared by the JSON chain factories.
+
+Each provider enforces the output schema natively. OpenAI's json_schema
+response format constrains decoding to the schema itself, so it is preferred
+over tool calling there. Other providers keep LangChain's default method.
+"""
+
+from typing import TYPE_CHECKING, Dict, Type
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseLanguageModel
+    from langchain_core.runnables import Runnable
+
+# LLM _llm_type -> with_structured_output method
+STRUCTURED_OUTPUT_METHODS: Dict[str, str] = {
+    "openai-chat": "json_schema",
+}
+
+
+def with_structured_output(llm: "BaseLanguageModel", schema: Type[BaseModel]) -> "Runnable":
+    """
+    Bind an output schema to an LLM using the provider's best native method.
+
+    Args:
+        llm: The configured LLM.
+        schema: Pydantic model the response must conform to.
+
+    Returns:
+        A Runnable that returns a validated instance of schema.
+    """
+    method = STRUCTURED_OUTPUT_METHODS.get(getattr(llm, "_llm_type", ""))
+    if method is None:
+        return llm.with_structured_output(schema)
+    return llm.with_structured_output(schema, method=method)
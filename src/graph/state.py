@@ -1,4 +1,5 @@
-from typing import TypedDict, Optional, Literal, List, Any
+import operator
+from typing import Annotated, TypedDict, Optional, Literal, List, Any
 from datetime import datetime
 
 from src.models.outputs import (
@@ -30,6 +31,7 @@ class ScreeningState(TypedDict):
     article_metadata: Optional[ArticleMetadata]
     article_text: Optional[str]
     article_language: Optional[str]
+    article_token_count: Optional[int] # Counted once at fetch time
     
     # ------------------------------------
     # 3. Entity extraction
@@ -47,6 +49,8 @@ class ScreeningState(TypedDict):
     # 5. Sentiment (conditional)
     # ------------------------------------
     sentiment_assessment: Optional[SentimentAssessment]
+    # Sentiment for the query name, computed in parallel with extraction/matching
+    speculative_sentiment: Optional[SentimentAssessment]
     
     # ------------------------------------
     # 6. Enrichment (Part 2 - future)
@@ -63,13 +67,14 @@ class ScreeningState(TypedDict):
     # ------------------------------------
     # 8. Metadata / Observability
     # ------------------------------------
-    errors: List[str]
-    warnings: List[str]
+    # Append-only: nodes return just their new items and LangGraph concatenates them
+    errors: Annotated[List[str], operator.add]
+    warnings: Annotated[List[str], operator.add]
     start_time: datetime
     total_duration_ms: Optional[float]
-    steps_completed: List[str]
+    steps_completed: Annotated[List[str], operator.add]
 
-    llm_calls: List[dict] # Detailed log of all LLM usage (from CostTracker)
+    llm_calls: Annotated[List[dict], operator.add] # Detailed log of all LLM usage (from CostTracker)
     
     # Runtime context (used internally for nodes)
     llm_provider: Optional[str]
@@ -1,24 +1,34 @@
-from typing import Literal, Any, Dict, List
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Sequence, Tuple, cast
 from functools import partial
-from datetime import datetime
+from datetime import date, datetime, timezone
 
 from langgraph.graph import StateGraph, END
+from langgraph.types import Command
 from langchain_core.language_models import BaseLanguageModel
 from langchain_core.runnables import RunnableConfig
 
 from src.graph.state import ScreeningState
+from src.nodes.combined import CombinedScreeningNode
 from src.nodes.extraction import EntityExtractionNode
 from src.nodes.matching import NameMatchingNode
 from src.nodes.sentiment import SentimentAnalysisNode
 from src.nodes.report import ReportGenerationNode
 from src.utils.logger import get_logger
 from src.utils.article_fetcher import ArticleFetcher
+from src.utils.event_loop import run_async
+from src.utils.tokens import count_tokens
 from src.models.inputs import ScreeningQuery
 from src.llm.cost_tracker import CostTracker
 from src.llm.factory import LLMFactory
 
 logger = get_logger("Workflow")
 
+# Tags of the chains whose output is the (streamed) report text
+REPORT_CHAIN_TAGS = frozenset({"report_generation_chain", "report_summary_chain"})
+
 
 class AdverseMediaWorkflow:
     """
@@ -33,7 +43,9 @@ class AdverseMediaWorkflow:
         self.settings = settings
         self.llm_factory = llm_factory
         self.cost_tracker = cost_tracker
-        self.graph = self._build_graph()
+        self.article_fetcher = ArticleFetcher()
+        self.graph_builder = self._build_graph()
+        self.graph = self.graph_builder.compile()
 
     def _get_llm(self, provider: str) -> BaseLanguageModel:
         """Helper to get the configured LLM client."""
@@ -43,19 +55,33 @@ class AdverseMediaWorkflow:
     # Nodes (Section 7.2)
     # =========================================================================
 
-    def fetch_article_node(self, state: ScreeningState) -> Dict[str, Any]:
+    async def fetch_article_node(self, state: ScreeningState) -> Dict[str, Any]:
         """Node 1: Fetches article content and metadata."""
         logger.info("Executing node: fetch_article_node")
-        query: ScreeningQuery = state["query"]
-        article_fetcher = ArticleFetcher()
-        try:
+        if state["steps_completed"]:
+            # Already fetched before the run started (see arun_batch)
+            return {}
+        return await self._fetch_article(state["query"], state["llm_model"])
 
-            metadata = article_fetcher.fetch_and_parse(query.url)
+    async def _fetch_article(self, query: ScreeningQuery, llm_model: Optional[str]) -> Dict[str, Any]:
+        """
+        Fetches the query's article; returns the state update of the fetch step.
+        Tokens are counted for llm_model (the default provider's model if unset).
+        """
+        llm_model = llm_model or self.settings.get_model_name(self.settings.default_llm_provider)
+        try:
+            # The fetcher is blocking I/O; keep the event loop free for other screenings
+            metadata = await asyncio.to_thread(self.article_fetcher.fetch_and_parse, query.url)
+            token_count = await asyncio.to_thread(
+                count_tokens, metadata.text_content, llm_model
+            )
+            logger.info(f"Article has {token_count} tokens.")
             
             return {
                 "article_metadata": metadata,
                 "article_text": metadata.text_content,
                 "article_language": metadata.language,
+                "article_token_count": token_count,
                 "steps_completed": ["fetch_article"],
             }
         except Exception as e:
@@ -63,29 +89,44 @@ class AdverseMediaWorkflow:
             logger.error(error_msg, exc_info=True)
             # Critical error: cannot proceed without article text
             return {
-                "errors": state["errors"] + [error_msg],
+                "errors": [error_msg],
                 "match_decision": "NO_MATCH", # Force end on failure
                 "steps_completed": ["fetch_article_failed"],
             }
 
-    def _get_llm_chain_node(self, NodeClass: Any) -> partial:
+    def _get_llm_chain_node(self, NodeClass: Any, method: str = "run") -> partial:
         """Creates a partial function for LLM-based nodes."""
         
         # Determine the primary LLM provider/model from the current state/settings
         primary_provider = self.settings.default_llm_provider
         
-        llm = self.llm_factory.get_llm(primary_provider)
+        # Tasks can be routed to a smaller/faster model than the provider's default
+        model_name = self.settings.get_task_model_name(primary_provider, NodeClass.prompt_task)
+        if model_name == self.settings.get_model_name(primary_provider):
+            model_name = None
+        llm = self.llm_factory.get_llm(primary_provider, model_name)
+
+        # Slow calls are raced against the fallback providers; only deterministic
+        # calls are hedged, so either answer is equally valid
+        backup_llms = []
+        if self.settings.enable_hedging and self.settings.llm_temperature == 0:
+            backup_llms = [
+                (provider, self.llm_factory.get_llm(provider))
+                for provider in self.settings.get_fallback_providers(primary_provider)
+            ]
 
         # Initialize the node with LLM, settings, and cost tracker
         node_instance = NodeClass(
             llm=llm, 
             settings=self.settings, 
-            cost_tracker=self.cost_tracker
+            cost_tracker=self.cost_tracker,
+            model_name=model_name,
+            backup_llms=backup_llms,
         )
         
         # Return a partial function that accepts only the 'state' argument
         # This is the LangGraph standard signature for nodes
-        return partial(node_instance.run, llm_provider=primary_provider)
+        return partial(getattr(node_instance, method), llm_provider=primary_provider)
 
 
     def extract_entities_node(self) -> partial:
@@ -97,9 +138,15 @@ class AdverseMediaWorkflow:
     def analyze_sentiment_node(self) -> partial:
         return self._get_llm_chain_node(NodeClass=SentimentAnalysisNode)
 
+    def speculative_sentiment_node(self) -> partial:
+        return self._get_llm_chain_node(NodeClass=SentimentAnalysisNode, method="speculate")
+
     def generate_report_node(self) -> partial:
         return self._get_llm_chain_node(NodeClass=ReportGenerationNode)
 
+    def combined_screening_node(self) -> partial:
+        return self._get_llm_chain_node(NodeClass=CombinedScreeningNode)
+
 
     # =========================================================================
     # Conditional Edges (Section 7.3)
@@ -126,13 +173,46 @@ class AdverseMediaWorkflow:
 
 
 
+    def _staged_entry_nodes(self) -> List[str]:
+        """The nodes that start the staged (extract -> match -> sentiment) pipeline."""
+        if self.settings.enable_speculative_sentiment:
+            return ["extract_entities", "speculative_sentiment"]
+        return ["extract_entities"]
+
+    def route_article(self, state: ScreeningState) -> List[str]:
+        """
+        Sends short articles to the combined screening call and everything else
+        (including failed fetches) to the staged pipeline.
+        """
+        token_count = state.get("article_token_count")
+        if token_count is not None and token_count <= self.settings.combined_screening_max_tokens:
+            logger.info(f"Article has {token_count} tokens. Screening it in one combined call.")
+            return ["combined_screening"]
+        return self._staged_entry_nodes()
+
+    def route_combined_result(self, state: ScreeningState) -> List[str]:
+        """
+        Proceeds to the report after a combined screening, or falls back to the
+        staged pipeline if it produced no decision. A (potential) match that came
+        back without a sentiment assessment is analyzed separately first.
+        """
+        decision = state.get("match_decision")
+        if decision is None:
+            logger.info("Combined screening produced no decision. Falling back to the staged pipeline.")
+            return self._staged_entry_nodes()
+        if decision in ("MATCH", "UNCERTAIN") and state.get("sentiment_assessment") is None:
+            logger.info("Combined screening returned no sentiment for the match. Running sentiment analysis.")
+            return ["analyze_sentiment"]
+        return ["generate_report"]
+
     # =========================================================================
     # Graph Builder
     # =========================================================================
 
     def _build_graph(self) -> StateGraph:
         """
-        Builds the LangGraph StateGraph (Section 7.3).
+        Builds the LangGraph StateGraph (Section 7.3). It is compiled by the caller,
+        with or without a checkpointer.
         """
         workflow = StateGraph(ScreeningState)
 
@@ -142,11 +222,32 @@ class AdverseMediaWorkflow:
         workflow.add_node("match_person", self.match_person_node())
         workflow.add_node("analyze_sentiment", self.analyze_sentiment_node())
         workflow.add_node("generate_report", self.generate_report_node())
+        if self.settings.enable_speculative_sentiment:
+            workflow.add_node("speculative_sentiment", self.speculative_sentiment_node())
+        if self.settings.enable_combined_screening:
+            workflow.add_node("combined_screening", self.combined_screening_node())
 
         # 2. Set Edges (Flow: START -> Fetch -> Extract -> Match)
         workflow.set_entry_point("fetch_article")
-        workflow.add_edge("fetch_article", "extract_entities")
-        workflow.add_edge("extract_entities", "match_person")
+        staged_entry = self._staged_entry_nodes()
+        if self.settings.enable_combined_screening:
+            # Short articles: one call instead of extract -> match -> sentiment
+            workflow.add_conditional_edges(
+                "fetch_article", self.route_article, ["combined_screening", *staged_entry]
+            )
+            workflow.add_conditional_edges(
+                "combined_screening",
+                self.route_combined_result,
+                ["generate_report", "analyze_sentiment", *staged_entry],
+            )
+        else:
+            for node in staged_entry:
+                workflow.add_edge("fetch_article", node)
+        if self.settings.enable_speculative_sentiment:
+            # Sentiment for the query name runs alongside extraction; matching waits for both
+            workflow.add_edge(["extract_entities", "speculative_sentiment"], "match_person")
+        else:
+            workflow.add_edge("extract_entities", "match_person")
 
         # 3. Add Conditional Edge from Matching Node
         workflow.add_conditional_edges(
@@ -162,8 +263,7 @@ class AdverseMediaWorkflow:
         workflow.add_edge("analyze_sentiment", "generate_report")
         workflow.add_edge("generate_report", END)
 
-        # 5. Compile the graph
-        return workflow.compile()
+        return workflow
 
     # =========================================================================
     # Public Runner
@@ -171,43 +271,104 @@ class AdverseMediaWorkflow:
 
     def run_workflow(self, query: ScreeningQuery) -> ScreeningState:
         """
-        Runs the compiled workflow from start to finish.
-        
-        Args:
-            query: The validated input ScreeningQuery.
+        Synchronous wrapper around arun_workflow().
+        """
+        return run_async(self.arun_workflow(query))
+
+    @asynccontextmanager
+    async def _checkpointed_graph(self) -> AsyncIterator[Any]:
+        """
+        Yields the graph to run, compiled with a SQLite checkpointer when
+        checkpoint_path is set so interrupted runs can resume.
+        """
+        if not self.settings.checkpoint_path:
+            yield self.graph
+            return
+        try:
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        except ImportError:
+            logger.warning(
+                "langgraph-checkpoint-sqlite is not installed; checkpointing is disabled."
+            )
+            yield self.graph
+            return
+
+        async with AsyncSqliteSaver.from_conn_string(self.settings.checkpoint_path) as saver:
+            yield self.graph_builder.compile(checkpointer=saver)
+
+    @staticmethod
+    async def _graph_input(
+        graph: Any, initial_state: ScreeningState, config: RunnableConfig
+    ) -> Tuple[Any, Optional[ScreeningState]]:
+        """
+        Decides how to run the graph for one screening, resuming from its
+        checkpoint if it has one.
 
         Returns:
-            The final state dictionary.
+            (graph_input, None) to run the graph with, or (None, final_state)
+            when the checkpointed screening already completed.
         """
-        logger.info(f"Starting workflow for: {query.name}, URL: {query.url}")
-        
+        if graph.checkpointer is not None:
+            snapshot = await graph.aget_state(config)
+            if snapshot.values:
+                if not snapshot.next:
+                    logger.info("Screening already completed; using its checkpointed state.")
+                    return None, cast(ScreeningState, dict(snapshot.values))
+                logger.info(f"Resuming screening from checkpoint at {list(snapshot.next)}.")
+                # Time the resumed run from its own start, not the interrupted run's
+                return Command(update={"start_time": initial_state["start_time"]}), None
+        return initial_state, None
+
+    @classmethod
+    async def _ainvoke(cls, graph: Any, initial_state: ScreeningState, config: RunnableConfig) -> ScreeningState:
+        """
+        Runs the graph for one screening, resuming from its checkpoint if it has one.
+        """
+        graph_input, completed_state = await cls._graph_input(graph, initial_state, config)
+        if completed_state is not None:
+            return completed_state
+        return cast(ScreeningState, await graph.ainvoke(graph_input, config=config))
+
+    def _prepare_run(self, query: ScreeningQuery) -> Tuple[ScreeningState, RunnableConfig]:
+        """
+        Builds the initial state and the run config for a screening.
+        """
+        llm_model = query.model or self.settings.get_model_name(query.provider or self.settings.default_llm_provider)
+
         # Initialize the state (Section 7.1)
         initial_state: ScreeningState = {
             "query": query,
             "article_metadata": None,
             "article_text": None,
             "article_language": None,
+            "article_token_count": None,
             "entities": [],
             "extraction_complete": False,
             "match_assessment": None,
             "match_decision": None,
             "sentiment_assessment": None,
+            "speculative_sentiment": None,
             "enrichment_needed": False,
             "enrichment_data": None,
-            "final_report": None,
+            "final_screening_result": None,
+            "report_complete": False,
             "errors": [],
             "warnings": [],
-            "start_time": datetime.utcnow(),
+            "start_time": datetime.now(timezone.utc),
+            "total_duration_ms": None,
+            "steps_completed": [],
             "llm_calls": [],
             # These are set in main.py but are useful for nodes
             "llm_provider": query.provider.value if query.provider else self.settings.default_llm_provider.value,
-            "llm_model": query.model or self.settings.get_model_name(query.provider or self.settings.default_llm_provider),
+            "llm_model": llm_model,
         }
 
         # The config is used for tracing with LangSmith (Section 4.2)
         config: RunnableConfig = {
             "configurable": {
-                "session_id": f"screener-{initial_state['start_time'].isoformat().replace(':', '-')}"
+                "session_id": f"screener-{initial_state['start_time'].isoformat().replace(':', '-')}",
+                # Checkpoint thread: the same screening on the same day resumes
+                "thread_id": self._thread_id(query, llm_model, initial_state["start_time"].date()),
             },
             "tags": [
                 f"provider:{initial_state['llm_provider']}",
@@ -216,21 +377,132 @@ class AdverseMediaWorkflow:
             "metadata": {
                 "user_name": query.name,
                 "article_url": query.url,
-            }
+            },
+            "recursion_limit": 10,
         }
-        
-        # Run the graph
-        final_state: ScreeningState = self.graph.invoke(
-            initial_state, 
-            config=config,
-            recursion_limit=10 
-        )
-        
+        return initial_state, config
+
+    @staticmethod
+    def _thread_id(query: ScreeningQuery, llm_model: str, day: date) -> str:
+        """Stable checkpoint thread ID for a screening."""
+        key = "|".join((query.name, query.dob.isoformat(), str(query.url), llm_model, day.isoformat()))
+        return "screen-" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def _finish_run(final_state: ScreeningState, start_time: datetime) -> ScreeningState:
+        """
+        Adds the total duration to the final state.
+
+        The duration is measured from start_time, when this run started: a
+        screening that had already completed in its checkpoint keeps the
+        original run's start_time in its state.
+        """
         # Calculate duration
-        end_time = datetime.utcnow()
-        duration = end_time - final_state["start_time"]
+        end_time = datetime.now(timezone.utc)
+        duration = end_time - start_time
         
         # Update the state with the final duration (required for ProcessingMetadata)
         final_state["total_duration_ms"] = duration.total_seconds() * 1000.0
         
-        return final_state
\ No newline at end of file
+        return final_state
+
+    async def arun_workflow(self, query: ScreeningQuery) -> ScreeningState:
+        """
+        Runs the compiled workflow from start to finish.
+        
+        Args:
+            query: The validated input ScreeningQuery.
+
+        Returns:
+            The final state dictionary.
+        """
+        logger.info(f"Starting workflow for: {query.name}, URL: {query.url}")
+        initial_state, config = self._prepare_run(query)
+
+        # Run the graph
+        async with self._checkpointed_graph() as graph:
+            final_state: ScreeningState = await self._ainvoke(graph, initial_state, config)
+        return self._finish_run(final_state, initial_state["start_time"])
+
+    def run_batch(self, queries: Sequence[ScreeningQuery]) -> List[ScreeningState]:
+        """
+        Synchronous wrapper around arun_batch().
+        """
+        return run_async(self.arun_batch(queries))
+
+    async def arun_batch(self, queries: Sequence[ScreeningQuery]) -> List[ScreeningState]:
+        """
+        Screens many queries, grouping articles of similar length.
+
+        All articles are fetched first (concurrently). The screenings then run
+        in bins of max_concurrent_requests, shortest articles first, so a single
+        long article does not hold up a bin of short ones.
+
+        Args:
+            queries: The validated input ScreeningQuery objects.
+
+        Returns:
+            The final states, in the same order as queries.
+        """
+        logger.info(f"Starting batch workflow for {len(queries)} queries.")
+        runs = [self._prepare_run(query) for query in queries]
+        bin_size = self.settings.max_concurrent_requests
+        semaphore = asyncio.Semaphore(bin_size)
+
+        final_states: Dict[int, ScreeningState] = {}
+        async with self._checkpointed_graph() as graph:
+
+            async def prefetch(state: ScreeningState, config: RunnableConfig) -> ScreeningState:
+                if graph.checkpointer is not None:
+                    snapshot = await graph.aget_state(config)
+                    if snapshot.values:
+                        # Resumed (or already completed) from its checkpoint, which
+                        # holds the article if it was fetched: no fetch needed
+                        return {**state, "article_token_count": snapshot.values.get("article_token_count")}
+                async with semaphore:
+                    fetched = await self._fetch_article(state["query"], state["llm_model"])
+                return cast(ScreeningState, {**state, **fetched})
+
+            states = await asyncio.gather(*(prefetch(state, config) for state, config in runs))
+            runs = [(state, config) for state, (_, config) in zip(states, runs)]
+
+            order = sorted(range(len(runs)), key=lambda i: runs[i][0]["article_token_count"] or 0)
+            for start in range(0, len(order), bin_size):
+                indices = order[start:start + bin_size]
+                results = await asyncio.gather(
+                    *(self._ainvoke(graph, *runs[i]) for i in indices)
+                )
+                for i, final_state in zip(indices, results):
+                    final_states[i] = self._finish_run(final_state, runs[i][0]["start_time"])
+        return [final_states[i] for i in range(len(runs))]
+
+    async def astream_workflow(
+        self, query: ScreeningQuery
+    ) -> AsyncIterator[Tuple[Literal["report_chunk", "final_state"], Any]]:
+        """
+        Runs the workflow, streaming the report text as the LLM writes it.
+
+        Yields:
+            ("report_chunk", str) for every token chunk of the report (the
+            decision summary in template report mode), then one
+            ("final_state", ScreeningState) when the run is complete.
+        """
+        logger.info(f"Starting streamed workflow for: {query.name}, URL: {query.url}")
+        initial_state, config = self._prepare_run(query)
+
+        async with self._checkpointed_graph() as graph:
+            # A completed checkpoint streams nothing; its report is in the final state
+            graph_input, final_state = await self._graph_input(graph, initial_state, config)
+            if final_state is None:
+                async for event in graph.astream_events(graph_input, config=config, version="v2"):
+                    kind = event["event"]
+                    if kind == "on_chat_model_stream" and REPORT_CHAIN_TAGS.intersection(event.get("tags", ())):
+                        text = event["data"]["chunk"].text
+                        if text:
+                            yield "report_chunk", text
+                    elif kind == "on_chain_end" and not event.get("parent_ids"):
+                        final_state = event["data"]["output"]
+
+        if final_state is None:
+            raise RuntimeError("The streamed workflow ended without a final state.")
+        yield "final_state", self._finish_run(final_state, initial_state["start_time"])
\ No newline at end of file
@@ -3,12 +3,14 @@
 """
 LLM Management Package.
 
-Contains the logic for initializing LLM clients (factory) and
-tracking token usage and cost (cost_tracker).
+Contains the logic for initializing LLM clients (factory),
+tracking token usage and cost (cost_tracker) and running multi-article
+jobs through provider batch APIs (batch).
 """
 
 from .factory import LLMFactory  # Will be defined in factory.py
 from .cost_tracker import CostTracker  # Will be defined in cost_tracker.py
+from .batch import BatchProcessor
 
 # Public API for the LLM package
-__all__ = ["LLMFactory", "CostTracker"]
\ No newline at end of file
+__all__ = ["LLMFactory", "CostTracker", "BatchProcessor"]
\ No newline at end of file
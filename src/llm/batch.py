@@ -0,0 +1,340 @@
+# src/llm/batch.py
+
+"""
+Batch LLM Processing.
+
+Runs one prompt task (e.g., entity extraction or sentiment analysis) over many
+independent articles at once. Large jobs are submitted to the provider's batch
+API (Anthropic Message Batches / OpenAI Batch), which is billed at 50% of the
+online price; small jobs, or providers without a batch API, fall back to
+concurrent online calls.
+
+This is a library entry point for bulk jobs: the screening workflow (including
+its batch runner) makes online calls and does not go through it.
+"""
+
+import asyncio
+import io
+import time
+
+import orjson
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.output_parsers import JsonOutputParser
+from pydantic import BaseModel
+
+from config.prompts import render
+from config.settings import LLMProvider, Settings
+from src.llm.cost_tracker import CostTracker
+from src.models.schemas import ExtractionOutput, SentimentOutput
+from src.utils.event_loop import run_async
+from src.utils.logger import get_logger
+
+logger = get_logger("BatchProcessor")
+
+# Providers with a supported batch API
+BATCH_PROVIDERS = (LLMProvider.ANTHROPIC, LLMProvider.OPENAI)
+
+# Anthropic requires an explicit completion budget per request
+BATCH_MAX_TOKENS = 4096
+
+# (article_dict, prompt_kwargs) - article_dict only identifies the article in logs
+BatchItem = Tuple[Dict[str, Any], Dict[str, Any]]
+
+# The output schema of a batch job
+OutputT = TypeVar("OutputT", bound=BaseModel)
+
+
+class FastJsonOutputParser(JsonOutputParser):
+    """
+    JsonOutputParser that tries orjson on the raw text first and only falls back
+    to LangChain's lenient parsing (markdown fences, partial JSON) when that fails.
+    """
+
+    def parse(self, text: str) -> Any:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return super().parse(text)
+
+
+class BatchProcessor:
+    """
+    Renders a prompt task for many articles and collects the validated outputs.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        llm: BaseLanguageModel,
+        provider: LLMProvider,
+        model_name: str,
+        cost_tracker: CostTracker,
+    ):
+        """
+        Initialize the processor.
+
+        Args:
+            settings: Application settings (batch flags, API keys, concurrency).
+            llm: LLM client used for the online fallback.
+            provider: The provider the llm belongs to.
+            model_name: The model name to request.
+            cost_tracker: Tracker that receives the usage of every request.
+        """
+        self.settings = settings
+        self.llm = llm
+        self.provider = provider
+        self.model_name = model_name
+        self.cost_tracker = cost_tracker
+        self.output_parser = FastJsonOutputParser()
+
+    def extract_entities(self, items: Sequence[BatchItem]) -> List[Optional[ExtractionOutput]]:
+        """Run entity extraction over many articles."""
+        return self.run("entity_extraction", items, ExtractionOutput)
+
+    def analyze_sentiment(self, items: Sequence[BatchItem]) -> List[Optional[SentimentOutput]]:
+        """Run sentiment analysis over many articles."""
+        return self.run("sentiment_analysis", items, SentimentOutput)
+
+    def run(
+        self,
+        task: str,
+        items: Sequence[BatchItem],
+        output_schema: Type[OutputT],
+    ) -> List[Optional[OutputT]]:
+        """
+        Synchronous wrapper around arun().
+        """
+        return run_async(self.arun(task, items, output_schema))
+
+    async def arun(
+        self,
+        task: str,
+        items: Sequence[BatchItem],
+        output_schema: Type[OutputT],
+    ) -> List[Optional[OutputT]]:
+        """
+        Run a prompt task over many articles.
+
+        Args:
+            task: A config.prompts.PROMPTS key.
+            items: (article_dict, prompt_kwargs) tuples.
+            output_schema: Pydantic model each response is validated against.
+
+        Returns:
+            Validated outputs in the same order as items. Items that failed
+            are logged and returned as None.
+        """
+        requests = [
+            (f"{task}-{index}", *render(task, **prompt_kwargs))
+            for index, (_, prompt_kwargs) in enumerate(items)
+        ]
+
+        use_batch = (
+            self.settings.use_batch_api
+            and self.provider in BATCH_PROVIDERS
+            and len(requests) >= self.settings.batch_min_size
+        )
+        logger.info(
+            f"Running '{task}' over {len(requests)} articles "
+            f"({'batch API' if use_batch else 'online'})."
+        )
+
+        if use_batch:
+            if self.provider == LLMProvider.ANTHROPIC:
+                texts = await self._run_anthropic_batch(requests)
+            else:
+                texts = await self._run_openai_batch(requests)
+        else:
+            texts = await self._run_online(requests)
+
+        results: List[Optional[OutputT]] = []
+        for (custom_id, _, _), (article, _) in zip(requests, items):
+            text = texts.get(custom_id)
+            if text is None:
+                results.append(None)
+                continue
+            try:
+                results.append(output_schema.model_validate(self.output_parser.parse(text)))
+            except Exception as e:
+                logger.error(f"Invalid '{task}' output for {article.get('url', custom_id)}: {e}")
+                results.append(None)
+        return results
+
+    # -------------------------------------------------------------------------
+    # Online fallback
+    # -------------------------------------------------------------------------
+
+    async def _run_online(self, requests: List[Tuple[str, str, str]]) -> Dict[str, str]:
+        """Send each request as a normal call, bounded by max_concurrent_requests."""
+        semaphore = asyncio.Semaphore(self.settings.max_concurrent_requests)
+
+        async def call(custom_id: str, system_prompt: str, user_prompt: str) -> Tuple[str, Optional[str]]:
+            async with semaphore:
+                start_time = time.time()
+                try:
+                    message = await self.llm.ainvoke(
+                        [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+                    )
+                except Exception as e:
+                    logger.error(f"Online call {custom_id} failed: {e}")
+                    return custom_id, None
+
+                usage = getattr(message, "usage_metadata", None) or {}
+                self._record_usage(
+                    custom_id,
+                    usage.get("input_tokens", 0),
+                    usage.get("output_tokens", 0),
+                    latency_ms=(time.time() - start_time) * 1000,
+                    batch=False,
+                )
+                return custom_id, message.text
+
+        responses = await asyncio.gather(*(call(*request) for request in requests))
+        return {custom_id: text for custom_id, text in responses if text is not None}
+
+    # -------------------------------------------------------------------------
+    # Provider batch APIs
+    # -------------------------------------------------------------------------
+
+    async def _run_anthropic_batch(self, requests: List[Tuple[str, str, str]]) -> Dict[str, str]:
+        """Submit to Anthropic's Message Batches API and wait for the results."""
+        from anthropic import AsyncAnthropic
+        from anthropic.types import CacheControlEphemeralParam, TextBlockParam
+
+        client = AsyncAnthropic(api_key=self.settings.anthropic_api_key)
+        start_time = time.time()
+
+        def system_blocks(system_prompt: str) -> List[TextBlockParam]:
+            block = TextBlockParam(type="text", text=system_prompt)
+            if self.settings.enable_prompt_caching:
+                # Every request in the batch shares the system prompt
+                block["cache_control"] = CacheControlEphemeralParam(type="ephemeral")
+            return [block]
+
+        batch = await client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": custom_id,
+                    "params": {
+                        "model": self.model_name,
+                        "max_tokens": BATCH_MAX_TOKENS,
+                        "temperature": self.settings.llm_temperature,
+                        "system": system_blocks(system_prompt),
+                        "messages": [{"role": "user", "content": user_prompt}],
+                    },
+                }
+                for custom_id, system_prompt, user_prompt in requests
+            ]
+        )
+        logger.info(f"Submitted Anthropic batch {batch.id}.")
+
+        while batch.processing_status != "ended":
+            await asyncio.sleep(self.settings.batch_poll_interval)
+            batch = await client.messages.batches.retrieve(batch.id)
+
+        latency_ms = (time.time() - start_time) * 1000
+        texts: Dict[str, str] = {}
+        async for entry in await client.messages.batches.results(batch.id):
+            if entry.result.type != "succeeded":
+                logger.error(f"Batch request {entry.custom_id} {entry.result.type}.")
+                continue
+            message = entry.result.message
+            self._record_usage(
+                entry.custom_id,
+                message.usage.input_tokens,
+                message.usage.output_tokens,
+                latency_ms=latency_ms,
+                batch=True,
+            )
+            texts[entry.custom_id] = "".join(
+                block.text for block in message.content if block.type == "text"
+            )
+        return texts
+
+    async def _run_openai_batch(self, requests: List[Tuple[str, str, str]]) -> Dict[str, str]:
+        """Upload a JSONL file to OpenAI's Batch API and wait for the results."""
+        from openai import AsyncOpenAI
+
+        client = AsyncOpenAI(api_key=self.settings.openai_api_key)
+        start_time = time.time()
+
+        lines = [
+            orjson.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model_name,
+                        "temperature": self.settings.llm_temperature,
+                        "messages": [
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                    },
+                }
+            )
+            for custom_id, system_prompt, user_prompt in requests
+        ]
+        input_file = await client.files.create(
+            file=("batch_input.jsonl", io.BytesIO(b"\n".join(lines))),
+            purpose="batch",
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id}.")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(self.settings.batch_poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+
+        if not batch.output_file_id:
+            logger.error(f"OpenAI batch {batch.id} ended with status '{batch.status}'.")
+            return {}
+
+        latency_ms = (time.time() - start_time) * 1000
+        output = await client.files.content(batch.output_file_id)
+        texts: Dict[str, str] = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            entry = orjson.loads(line)
+            response = entry.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.error(f"Batch request {entry['custom_id']} failed: {entry.get('error')}")
+                continue
+            body = response["body"]
+            self._record_usage(
+                entry["custom_id"],
+                body["usage"]["prompt_tokens"],
+                body["usage"]["completion_tokens"],
+                latency_ms=latency_ms,
+                batch=True,
+            )
+            texts[entry["custom_id"]] = body["choices"][0]["message"]["content"]
+        return texts
+
+    def _record_usage(
+        self,
+        custom_id: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency_ms: float,
+        batch: bool,
+    ) -> None:
+        """Record one request's usage; the step name is the task part of the custom_id."""
+        self.cost_tracker.record_usage(
+            step_name=custom_id.rsplit("-", 1)[0],
+            provider=self.provider,
+            model_name=self.model_name,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=latency_ms,
+            batch=batch,
+        )
@@ -7,27 +7,48 @@ Responsible for aggregating token usage and calculating the estimated
 cost of LLM operations based on provider pricing.
 """
 
-from typing import Dict, Any, Optional
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Any, NamedTuple, Optional
 from config.settings import LLMProvider
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+
+
+class PricingRow(NamedTuple):
+    """Price of each token type for one provider."""
+
+    input: float
+    output: float
+    cache_read: float = 0.0
+    cache_write: float = 0.0
+
 
 # Prices are in USD per 1 Million (M) tokens.
-LLM_PRICING_USD_PER_M = {
-    # Groq
-    (LLMProvider.GROQ, "input"): 0.59,
-    (LLMProvider.GROQ, "output"): 0.59,
-    # OpenAI
-    (LLMProvider.OPENAI, "input"): 5.00,  # Example cost
-    (LLMProvider.OPENAI, "output"): 15.00,  # Example cost
-    # Anthropic
-    (LLMProvider.ANTHROPIC, "input"): 3.00,
-    (LLMProvider.ANTHROPIC, "output"): 15.00,  # Example cost
-    # Anthropic Caching
-    (LLMProvider.ANTHROPIC, "cache_read"): 0.30,
-    (LLMProvider.ANTHROPIC, "cache_write"): 3.75,
+LLM_PRICING_USD_PER_M: Dict[LLMProvider, PricingRow] = {
+    LLMProvider.GROQ: PricingRow(input=0.59, output=0.59),
+    LLMProvider.OPENAI: PricingRow(input=5.00, output=15.00),  # Example cost
+    # Only Anthropic bills cache reads/writes separately
+    LLMProvider.ANTHROPIC: PricingRow(
+        input=3.00, output=15.00, cache_read=0.30, cache_write=3.75  # Example cost
+    ),
 }
 
+# The same prices per single token, so a call's cost is four multiplications
+_PRICING_PER_TOKEN: Dict[LLMProvider, PricingRow] = {
+    provider: PricingRow(*(price / 1_000_000 for price in row))
+    for provider, row in LLM_PRICING_USD_PER_M.items()
+}
+_NO_PRICING = PricingRow(input=0.0, output=0.0)
+
+# Batch API requests are billed at half the online price
+BATCH_DISCOUNT = 0.5
+
+# Only the most recent calls are kept for the audit trail, so a tracker reused
+# across a long batch job does not grow without bound
+MAX_LOGGED_CALLS = 10_000
+
 
 class CostTracker:
     """
@@ -42,7 +63,11 @@ class CostTracker:
         self.cache_read_tokens = 0
         self.cache_write_tokens = 0
         self.total_cost_usd = 0.0
-        self.llm_calls: list[Dict[str, Any]] = []
+        self.llm_calls: Deque[Dict[str, Any]] = deque(maxlen=MAX_LOGGED_CALLS)
+        self._lock = threading.Lock()
+        # Calls are stamped with the monotonic clock; this anchor maps it back to UTC
+        self._wall_anchor = datetime.now(timezone.utc)
+        self._monotonic_anchor_ns = time.monotonic_ns()
 
     def _calculate_cost(
         self,
@@ -55,31 +80,13 @@ class CostTracker:
         """
         Calculate the estimated cost for a single LLM interaction.
         """
-        M_TOKENS = 1_000_000
-
-        # Standard token costs
-        input_cost = (prompt_tokens / M_TOKENS) * LLM_PRICING_USD_PER_M.get(
-            (provider, "input"), 0
-        )
-        output_cost = (completion_tokens / M_TOKENS) * LLM_PRICING_USD_PER_M.get(
-            (provider, "output"), 0
-        )
-
-        # Anthropic Caching costs
-        cache_read_cost = (
-            (cache_read_tokens / M_TOKENS)
-            * LLM_PRICING_USD_PER_M.get((provider, "cache_read"), 0)
-            if provider == LLMProvider.ANTHROPIC
-            else 0
+        row = _PRICING_PER_TOKEN.get(provider, _NO_PRICING)
+        return (
+            prompt_tokens * row.input
+            + completion_tokens * row.output
+            + cache_read_tokens * row.cache_read
+            + cache_write_tokens * row.cache_write
         )
-        cache_write_cost = (
-            (cache_write_tokens / M_TOKENS)
-            * LLM_PRICING_USD_PER_M.get((provider, "cache_write"), 0)
-            if provider == LLMProvider.ANTHROPIC
-            else 0
-        )
-
-        return input_cost + output_cost + cache_read_cost + cache_write_cost
 
     def record_usage(
         self,
@@ -92,6 +99,8 @@ class CostTracker:
         cache_read_tokens: int = 0,
         cache_write_tokens: int = 0,
         step_name: Optional[str] = None,
+        cache_hit: bool = False,
+        batch: bool = False,
     ):
         """
         Records the token usage, calculates cost, and updates totals.
@@ -103,42 +112,56 @@ class CostTracker:
             cache_read_tokens,
             cache_write_tokens,
         )
-
-        # Update totals
-        self.prompt_tokens += prompt_tokens
-        self.completion_tokens += completion_tokens
-        self.cache_read_tokens += cache_read_tokens
-        self.cache_write_tokens += cache_write_tokens
-        self.total_tokens = self.prompt_tokens + self.completion_tokens
-        self.total_cost_usd += cost
-
-        # Store detailed call log for the audit trail
-        self.llm_calls.append(
-            {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "step": step_name,
-                "provider": provider.value,
-                "model": model_name,
-                "prompt_tokens": prompt_tokens,
-                "completion_tokens": completion_tokens,
-                "cache_read_tokens": cache_read_tokens,
-                "cache_write_tokens": cache_write_tokens,
-                "cost_usd": cost,
-                "latency_ms": latency_ms,
-            }
-        )
+        if batch:
+            cost *= BATCH_DISCOUNT
+
+        # Detailed call log entry for the audit trail
+        call = {
+            "timestamp_ns": time.monotonic_ns(),
+            "step": step_name,
+            "provider": provider.value,
+            "model": model_name,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cache_read_tokens": cache_read_tokens,
+            "cache_write_tokens": cache_write_tokens,
+            "cost_usd": cost,
+            "latency_ms": latency_ms,
+            "cache_hit": cache_hit,
+            "batch": batch,
+        }
+
+        # Update totals (nodes and batch jobs record usage from several threads)
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cache_read_tokens += cache_read_tokens
+            self.cache_write_tokens += cache_write_tokens
+            self.total_tokens = self.prompt_tokens + self.completion_tokens
+            self.total_cost_usd += cost
+            self.llm_calls.append(call)
+
+    def _format_call(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a logged call with its monotonic stamp converted to an ISO timestamp."""
+        call = dict(call)
+        elapsed_ns = call.pop("timestamp_ns") - self._monotonic_anchor_ns
+        call["timestamp"] = (
+            self._wall_anchor + timedelta(microseconds=elapsed_ns // 1000)
+        ).isoformat()
+        return call
 
     def get_metadata(self) -> Dict[str, Any]:
         """
         Returns the aggregated token usage and cost as a dictionary
         suitable for the ProcessingMetadata model.
         """
-        return {
-            "total_tokens": int(self.total_tokens), 
-            "prompt_tokens": int(self.prompt_tokens),
-            "completion_tokens": int(self.completion_tokens),
-            "cache_read_tokens": int(self.cache_read_tokens), 
-            "cache_write_tokens": int(self.cache_write_tokens),
-            "estimated_cost_usd": self.total_cost_usd,
-
-        }
\ No newline at end of file
+        with self._lock:
+            return {
+                "total_tokens": int(self.total_tokens),
+                "prompt_tokens": int(self.prompt_tokens),
+                "completion_tokens": int(self.completion_tokens),
+                "cache_read_tokens": int(self.cache_read_tokens),
+                "cache_write_tokens": int(self.cache_write_tokens),
+                "estimated_cost_usd": self.total_cost_usd,
+                "llm_calls": [self._format_call(call) for call in self.llm_calls],
+            }
\ No newline at end of file
@@ -7,16 +7,126 @@ Responsible for creating and configuring LangChain LLM clients
 (OpenAI, Anthropic, Groq) based on application settings.
 """
 
-from typing import Union, Optional
+import asyncio
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence, Tuple
 from functools import lru_cache
 
+import httpx
 from langchain_core.language_models import BaseLanguageModel
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_groq import ChatGroq
 
 from config.settings import Settings, LLMProvider
 
+# Provider SDKs are imported when their first client is built, so a run only
+# pays for the provider it uses
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+    from langchain_groq import ChatGroq
+    from langchain_openai import ChatOpenAI
+
+# Connection pool shared by the OpenAI and Groq clients. The SDK default caps
+# keep-alive connections well below what concurrent screenings need.
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=20, keepalive_expiry=30.0)
+HTTP_CONNECT_TIMEOUT = 10.0
+
+# Cheap endpoints used to open a pooled connection before the first LLM call
+PREWARM_URLS = {
+    LLMProvider.OPENAI: "https://api.openai.com/v1/models",
+    LLMProvider.GROQ: "https://api.groq.com/openai/v1/models",
+}
+PREWARM_TIMEOUT = 2.0
+
+
+@lru_cache(maxsize=4)
+def _get_http_clients(timeout: float) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Process-wide sync and async HTTP clients for one request timeout."""
+    http_timeout = httpx.Timeout(timeout, connect=HTTP_CONNECT_TIMEOUT)
+    return (
+        httpx.Client(limits=HTTP_LIMITS, timeout=http_timeout),
+        httpx.AsyncClient(limits=HTTP_LIMITS, timeout=http_timeout),
+    )
+
+
+def _build_openai_client(
+    model_name: str, api_key: Optional[str], temperature: float, timeout: float, max_retries: int
+) -> "ChatOpenAI":
+    """Create and configure the ChatOpenAI client."""
+    from langchain_openai import ChatOpenAI
+
+    http_client, http_async_client = _get_http_clients(timeout)
+    return ChatOpenAI(
+        model=model_name,
+        temperature=temperature,
+        api_key=api_key,
+        timeout=timeout,
+        max_retries=max_retries,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+
+
+def _build_anthropic_client(
+    model_name: str, api_key: Optional[str], temperature: float, timeout: float, max_retries: int
+) -> "ChatAnthropic":
+    """
+    Create and configure the ChatAnthropic client. ChatAnthropic does not accept
+    an HTTP client; it already shares one cached httpx client per base URL and timeout.
+    """
+    from langchain_anthropic import ChatAnthropic
+
+    return ChatAnthropic(
+        model=model_name,
+        temperature=temperature,
+        api_key=api_key,
+        timeout=timeout,
+        max_retries=max_retries,
+    )
+
+
+def _build_groq_client(
+    model_name: str, api_key: Optional[str], temperature: float, timeout: float, max_retries: int
+) -> "ChatGroq":
+    """Create and configure the ChatGroq client."""
+    from langchain_groq import ChatGroq
+
+    http_client, http_async_client = _get_http_clients(timeout)
+    return ChatGroq(
+        model_name=model_name,
+        temperature=temperature,
+        api_key=api_key,
+        timeout=timeout,
+        max_retries=max_retries,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+
+
+# Client constructor per provider
+_CLIENT_BUILDERS: Dict[LLMProvider, Callable[[str, Optional[str], float, float, int], BaseLanguageModel]] = {
+    LLMProvider.OPENAI: _build_openai_client,
+    LLMProvider.ANTHROPIC: _build_anthropic_client,
+    LLMProvider.GROQ: _build_groq_client,
+}
+
+
+@lru_cache(maxsize=16)
+def _get_client(
+    provider: LLMProvider,
+    model_name: str,
+    api_key: Optional[str],
+    temperature: float,
+    timeout: float,
+    max_retries: int,
+) -> BaseLanguageModel:
+    """
+    Build a client once per configuration. The cache is process-wide, so every
+    LLMFactory (e.g. one per CLI screening) shares the clients and their
+    underlying HTTP connection pools.
+    """
+    builder = _CLIENT_BUILDERS.get(provider)
+    if builder is None:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+    return builder(model_name, api_key, temperature, timeout, max_retries)
+
 
 class LLMFactory:
     """
@@ -30,34 +140,6 @@ class LLMFactory:
         """
         self.settings = settings
 
-    def _get_openai_client(self, model_name: str) -> ChatOpenAI:
-        """Create and configure the ChatOpenAI client."""
-        return ChatOpenAI(
-            model=model_name,
-            temperature=self.settings.llm_temperature,
-            api_key=self.settings.openai_api_key,
-
-        )
-
-    def _get_anthropic_client(self, model_name: str) -> ChatAnthropic:
-        """Create and configure the ChatAnthropic client."""
-        client = ChatAnthropic(
-            model=model_name,
-            temperature=self.settings.llm_temperature,
-            api_key=self.settings.anthropic_api_key,
-        )
-
-        return client
-
-    def _get_groq_client(self, model_name: str) -> ChatGroq:
-        """Create and configure the ChatGroq client."""
-        return ChatGroq(
-            model_name=model_name,
-            temperature=self.settings.llm_temperature,
-            api_key=self.settings.groq_api_key,
-        )
-
-    @lru_cache(maxsize=3)
     def get_llm(
         self,
         provider: LLMProvider,
@@ -84,15 +166,38 @@ class LLMFactory:
         if not self.settings.validate_provider(provider):
             raise ValueError(f"Provider {provider.value} is not configured (API key missing).")
 
-        # 3. Initialize the correct client
-        if provider == LLMProvider.OPENAI:
-            return self._get_openai_client(model_name)
-        elif provider == LLMProvider.ANTHROPIC:
-            return self._get_anthropic_client(model_name)
-        elif provider == LLMProvider.GROQ:
-            return self._get_groq_client(model_name)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
+        # 3. Get (or build) the correct client
+        return _get_client(
+            provider,
+            model_name,
+            self.settings.get_api_key(provider),
+            self.settings.llm_temperature,
+            float(self.settings.request_timeout),
+            self.settings.max_retries,
+        )
+
+    async def aprewarm(self, providers: Sequence[LLMProvider]) -> None:
+        """
+        Open HTTPS connections to the providers' APIs ahead of the first LLM call,
+        so the TCP/TLS handshake overlaps other work (e.g. fetching the article).
+
+        Only providers on the shared connection pool are warmed; ChatAnthropic
+        keeps its pool private. Failures are ignored - the LLM call connects anyway.
+        """
+        _, http_async_client = _get_http_clients(float(self.settings.request_timeout))
+
+        async def warm(url: str) -> None:
+            try:
+                # Unauthenticated, so the response is an error; the connection stays open
+                await http_async_client.head(url, timeout=PREWARM_TIMEOUT)
+            except httpx.HTTPError:
+                pass
+
+        await asyncio.gather(*(
+            warm(PREWARM_URLS[provider])
+            for provider in providers
+            if provider in PREWARM_URLS and self.settings.validate_provider(provider)
+        ))
 
     def get_llm_with_fallback(
         self,
@@ -100,20 +205,24 @@ class LLMFactory:
     ) -> BaseLanguageModel:
         """
         Attempt to get the primary LLM, falling back to alternatives if configured.
-        The actual retry logic is handled by the LangGraph workflow, but this
-        method ensures the primary is tried first.
+
+        Only builds clients, so the only failures here are configuration errors
+        (ValueError: missing API key, invalid client settings); anything else is a
+        bug and propagates. Failures of the calls themselves are bounded by
+        request_timeout / max_retries and failed over by the hedged node chains
+        (see src/llm/hedging.py).
         """
         try:
             # 1. Try primary provider
             return self.get_llm(primary_provider)
-        except (ValueError, Exception) as primary_error:
+        except ValueError as primary_error:
             # 2. Try fallbacks if enabled
             if self.settings.enable_fallback:
                 fallback_providers = self.settings.get_fallback_providers(primary_provider)
                 for fallback_provider in fallback_providers:
                     try:
                         return self.get_llm(fallback_provider)
-                    except Exception:
+                    except ValueError:
                         # Continue to next fallback provider on failure
                         continue
                 # If all fallbacks failed
@@ -122,4 +231,4 @@ class LLMFactory:
                 ) from primary_error
             
             # 3. No fallback or fallback disabled, re-raise primary error
-            raise primary_error
\ No newline at end of file
+            raise
\ No newline at end of file
@@ -0,0 +1,133 @@
+# src/llm/hedging.py
+
+"""
+Hedged LLM Requests.
+
+Tail latency of a single provider call is dominated by the occasional slow
+request. A hedged chain starts the primary call and, if it has not answered
+after a short delay, starts the same call on a backup provider; whichever
+finishes first wins and the other call is cancelled. A failed call starts the
+next backup immediately, so hedging also covers provider fallback.
+
+Only idempotent, deterministic calls (temperature 0) should be hedged - every
+hedge that fires is billed on both providers. Callers that record usage can
+find out which chain answered (and which were cancelled) with
+track_hedge_outcome().
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+from src.utils.logger import get_logger
+
+logger = get_logger("Hedging")
+
+
+@dataclass
+class HedgeOutcome:
+    """
+    The chains of one hedged call, by index (0 is the primary, then the backups
+    in order): the one whose answer was used and those cancelled after starting.
+    """
+
+    winner: int = 0
+    cancelled: List[int] = field(default_factory=list)
+
+
+_current_outcome: ContextVar[Optional[HedgeOutcome]] = ContextVar("hedge_outcome", default=None)
+
+
+@contextmanager
+def track_hedge_outcome() -> Iterator[HedgeOutcome]:
+    """
+    Collect the outcome of the hedged call made inside the block. The outcome
+    keeps its defaults (primary answered, nothing cancelled) for unhedged chains.
+    """
+    outcome = HedgeOutcome()
+    token = _current_outcome.set(outcome)
+    try:
+        yield outcome
+    finally:
+        _current_outcome.reset(token)
+
+
+def create_hedged_chain(
+    primary: Runnable,
+    backups: Sequence[Runnable],
+    delay_s: float,
+) -> Runnable:
+    """
+    Wrap a chain so its calls are hedged across backup chains.
+
+    Args:
+        primary: The chain to call first.
+        backups: Equivalent chains on other providers, in the order they are tried.
+        delay_s: How long each call may run before the next backup is started.
+
+    Returns:
+        A runnable with the primary chain's input and output. Synchronous calls
+        fall back sequentially instead of racing.
+    """
+    if not backups:
+        return primary
+
+    chains = [primary, *backups]
+
+    def invoke(input: Any, config: RunnableConfig) -> Any:
+        outcome = _current_outcome.get() or HedgeOutcome()
+        errors: List[BaseException] = []
+        for index, chain in enumerate(chains):
+            try:
+                response = chain.invoke(input, config)
+            except Exception as e:
+                errors.append(e)
+                continue
+            outcome.winner = index
+            return response
+        raise errors[0]
+
+    async def ainvoke(input: Any, config: RunnableConfig) -> Any:
+        outcome = _current_outcome.get() or HedgeOutcome()
+        pending: set = set()
+        indices: Dict[asyncio.Task, int] = {}
+        errors: List[BaseException] = []
+        try:
+            for index, chain in enumerate(chains):
+                if index:
+                    logger.info(f"Hedging: starting backup call {index} of {len(backups)}.")
+                task = asyncio.create_task(chain.ainvoke(input, config))
+                indices[task] = index
+                pending.add(task)
+                is_last = index == len(chains) - 1
+                timeout: Optional[float] = None if is_last else delay_s
+
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        # Still running: start the next backup alongside
+                        break
+                    for task in done:
+                        error = task.exception()
+                        if error is None:
+                            outcome.winner = indices[task]
+                            return task.result()
+                        errors.append(error)
+                    if not is_last:
+                        # A call failed: start the next backup right away
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+                outcome.cancelled.append(indices[task])
+
+        # Every call failed; surface the first error
+        raise errors[0]
+
+    return RunnableLambda(invoke, afunc=ainvoke, name="hedged_chain")
@@ -0,0 +1,115 @@
+# src/llm/response_cache.py
+
+"""
+Exact-match LLM Response Cache.
+
+Stores validated LLM responses on disk, keyed by a SHA-256 hash of the
+(provider, model, prompt_version, formatted prompt) tuple. A cache hit skips
+the provider call entirely, so repeat screenings of the same article cost
+zero tokens.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+from pydantic import BaseModel
+
+from config.prompt_versions import PROMPT_VERSION
+from src.utils.logger import get_logger
+
+logger = get_logger("ResponseCache")
+
+
+class LLMResponseCache:
+    """
+    On-disk cache of LLM responses, one JSON file per prompt hash.
+    """
+
+    def __init__(self, cache_dir: str, ttl_days: int):
+        """
+        Initialize the cache directory and entry time-to-live.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = timedelta(days=ttl_days)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(provider: str, model: str, system_prompt: str, user_prompt: str) -> str:
+        """
+        Compute the cache key for a formatted prompt.
+
+        Every component is length-prefixed (8 bytes, big-endian) before hashing,
+        so two prompts whose concatenations happen to be identical
+        (e.g. "ab" + "c" vs "a" + "bc") can never collide.
+
+        Args:
+            provider: The LLM provider value (e.g., "groq").
+            model: The model name.
+            system_prompt: The fully formatted system message.
+            user_prompt: The fully formatted user message.
+
+        Returns:
+            Hex-encoded SHA-256 digest.
+        """
+        digest = hashlib.sha256()
+        for part in (provider, model, PROMPT_VERSION, system_prompt, user_prompt):
+            encoded = part.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached response for a key, or None on miss/expiry.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        expires_at = datetime.fromisoformat(entry["expires_at"])
+        if expires_at <= datetime.now(timezone.utc) or entry.get("prompt_version") != PROMPT_VERSION:
+            path.unlink(missing_ok=True)
+            return None
+
+        return entry["response"]
+
+    def set(self, key: str, response: Any, model: str) -> None:
+        """
+        Store a validated response. Writes are atomic (temp file + rename)
+        so a crashed run never leaves a half-written entry behind.
+        """
+        if isinstance(response, BaseModel):
+            response = response.model_dump(mode="json")
+
+        created_at = datetime.now(timezone.utc)
+        entry = {
+            "response": response,
+            "created_at": created_at.isoformat(),
+            "expires_at": (created_at + self.ttl).isoformat(),
+            "prompt_version": PROMPT_VERSION,
+            "model": model,
+        }
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(entry))
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not write cache entry {path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
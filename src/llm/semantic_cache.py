@@ -0,0 +1,252 @@
+# src/llm/semantic_cache.py
+
+"""
+Semantic LLM Response Cache.
+
+Sits behind the exact-match cache: news coverage of the same story is highly
+redundant, so a paraphrased or syndicated copy of an article already processed
+can reuse the stored extraction/sentiment result instead of calling the LLM.
+
+A hit requires BOTH a cosine similarity of the article embeddings above the
+threshold AND enough overlap between the capitalized tokens (names, places,
+organizations) of the two articles. Similar wording about different people
+therefore never shares a result. All other prompt inputs (person name, provider,
+model, prompt version) must match exactly.
+
+Embeddings come from a small local sentence-transformers model, which is an
+optional dependency: without it the semantic cache disables itself.
+"""
+
+import asyncio
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from config.prompt_versions import PROMPT_VERSION
+from config.settings import Settings
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+logger = get_logger("SemanticCache")
+
+# Capitalized words approximate the named entities (people, places, organizations)
+_CAPITALIZED_TOKEN = re.compile(r"\b[A-Z][a-zA-Z'\-]+\b")
+
+
+def capitalized_tokens(text: str) -> FrozenSet[str]:
+    """Quick, model-free approximation of the named entities in a text."""
+    return frozenset(_CAPITALIZED_TOKEN.findall(text))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity of two token sets (1.0 when both are empty)."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class _Index:
+    """
+    Normalized embeddings for one namespace with LRU eviction.
+
+    Rows of the embedding matrix are reused when an entry is evicted, so the
+    matrix never grows beyond max_entries.
+    """
+
+    def __init__(self, dim: int, max_entries: int):
+        self.max_entries = max_entries
+        self.vectors = np.zeros((min(max_entries, 1024), dim), dtype=np.float32)
+        self.active = np.zeros(len(self.vectors), dtype=bool)
+        # row -> (entity tokens, response), ordered least -> most recently used
+        self.entries: "OrderedDict[int, Tuple[FrozenSet[str], Any]]" = OrderedDict()
+
+    def search(self, vector: np.ndarray) -> Tuple[Optional[int], float]:
+        if not self.entries:
+            return None, 0.0
+        scores = self.vectors @ vector
+        scores[~self.active] = -np.inf
+        row = int(np.argmax(scores))
+        return row, float(scores[row])
+
+    def add(self, vector: np.ndarray, tokens: FrozenSet[str], response: Any) -> None:
+        if len(self.entries) >= self.max_entries:
+            row, _ = self.entries.popitem(last=False)
+        else:
+            free = np.flatnonzero(~self.active)
+            if len(free) == 0:
+                self._grow()
+                free = np.flatnonzero(~self.active)
+            row = int(free[0])
+
+        self.vectors[row] = vector
+        self.active[row] = True
+        self.entries[row] = (tokens, response)
+
+    def _grow(self) -> None:
+        size = min(len(self.vectors) * 2, self.max_entries)
+        vectors = np.zeros((size, self.vectors.shape[1]), dtype=np.float32)
+        vectors[: len(self.vectors)] = self.vectors
+        active = np.zeros(size, dtype=bool)
+        active[: len(self.active)] = self.active
+        self.vectors, self.active = vectors, active
+
+
+class SemanticCache:
+    """
+    In-memory semantic cache of validated LLM responses, shared per process.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        similarity_threshold: float,
+        min_entity_overlap: float,
+        max_entries: int,
+    ):
+        """
+        Initialize the cache. The embedding model is loaded on first use.
+        """
+        self.model_name = model_name
+        self.similarity_threshold = similarity_threshold
+        self.min_entity_overlap = min_entity_overlap
+        self.max_entries = max_entries
+        self.enabled = True
+        self._encoder: Optional["SentenceTransformer"] = None
+        self._indexes: Dict[str, _Index] = {}
+        self._lock = threading.Lock()
+        # Embeddings are computed in worker threads; the model is loaded once
+        self._encoder_lock = threading.Lock()
+
+    @staticmethod
+    def make_namespace(task: str, provider: str, model: str, context: Dict[str, Any]) -> str:
+        """
+        Compute the namespace for a prompt: everything except the article text.
+
+        Args:
+            task: The prompt task (e.g., "sentiment_analysis").
+            provider: The LLM provider value.
+            model: The model name.
+            context: The remaining prompt variables, which must match exactly.
+
+        Returns:
+            Hex-encoded SHA-256 digest.
+        """
+        digest = hashlib.sha256()
+        parts = (PROMPT_VERSION, task, provider, model) + tuple(
+            f"{key}={context[key]}" for key in sorted(context)
+        )
+        for part in parts:
+            encoded = part.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed a text as a unit vector, or None if no encoder is available."""
+        with self._encoder_lock:
+            if self._encoder is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError:
+                    logger.warning(
+                        "sentence-transformers is not installed; semantic caching is disabled."
+                    )
+                    self.enabled = False
+                    return None
+                self._encoder = SentenceTransformer(self.model_name, device="cpu")
+            encoder = self._encoder
+
+        vector = encoder.encode(text, normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float32)
+
+    def get(self, namespace: str, text: str) -> Optional[Any]:
+        """
+        Return the response cached for a near-duplicate text, or None.
+        """
+        if not self.enabled:
+            return None
+        vector = self._embed(text)
+        if vector is None:
+            return None
+
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                return None
+            row, similarity = index.search(vector)
+            if row is None or similarity < self.similarity_threshold:
+                return None
+
+            tokens, response = index.entries[row]
+            overlap = jaccard(tokens, capitalized_tokens(text))
+            if overlap < self.min_entity_overlap:
+                logger.debug(
+                    f"Semantic near-miss rejected (similarity={similarity:.3f}, overlap={overlap:.2f})."
+                )
+                return None
+
+            index.entries.move_to_end(row)
+
+        logger.debug(f"Semantic cache hit (similarity={similarity:.3f}, overlap={overlap:.2f}).")
+        return response
+
+    async def aget(self, namespace: str, text: str) -> Optional[Any]:
+        """
+        get() for async callers, embedding the text in a worker thread so the
+        event loop is not blocked.
+        """
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.get, namespace, text)
+
+    def set(self, namespace: str, text: str, response: Any) -> None:
+        """
+        Store a validated response for a text.
+        """
+        if not self.enabled:
+            return
+        vector = self._embed(text)
+        if vector is None:
+            return
+        if isinstance(response, BaseModel):
+            response = response.model_dump(mode="json")
+
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                index = self._indexes[namespace] = _Index(len(vector), self.max_entries)
+            index.add(vector, capitalized_tokens(text), response)
+
+    async def aset(self, namespace: str, text: str, response: Any) -> None:
+        """
+        set() for async callers, embedding the text in a worker thread.
+        """
+        if not self.enabled:
+            return
+        await asyncio.to_thread(self.set, namespace, text, response)
+
+
+# Process-wide instance (the index is in-memory, so it must outlive individual nodes)
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def get_semantic_cache(settings: Settings) -> SemanticCache:
+    """
+    Get the process-wide semantic cache, creating it from settings on first use.
+    """
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(
+            model_name=settings.semantic_cache_model,
+            similarity_threshold=settings.semantic_cache_threshold,
+            min_entity_overlap=settings.semantic_cache_min_overlap,
+            max_entries=settings.semantic_cache_max_entries,
+        )
+    return _semantic_cache
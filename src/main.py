@@ -4,17 +4,21 @@
 Command-line interface (CLI) entry point for the Adverse Media Screener.
 
 This module sets up the environment, initializes the LLM workflow, and handles
-input/output via the 'screen' command.
+input/output via the 'screen' command. run_screening() / arun_screening() are the
+same pipeline as plain functions for in-process callers (e.g. run_e2e.py).
 """
+import asyncio
 import click
-import json
-from datetime import datetime
+from datetime import date, datetime, timezone
+from typing import Callable, List, Optional, Tuple
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 
 # --- Local Imports ---
 import config.settings as settings
 
+from src.utils.event_loop import run_async
 from src.utils.logger import get_logger
 from src.llm import LLMFactory, CostTracker
 from src.models.inputs import ScreeningQuery
@@ -25,6 +29,9 @@ from src.graph.workflow import AdverseMediaWorkflow
 logger = get_logger("CLI")
 console = Console()
 
+# Values accepted by --provider
+PROVIDER_CHOICES = tuple(p.value for p in settings.LLMProvider)
+
 # --- Helper Functions for Output Formatting ---
 
 
@@ -41,34 +48,43 @@ def print_summary_table(result: ScreeningResult):
     table.add_column("Metric", style="dim")
     table.add_column("Value")
 
-    # Core Decision
+    # Cells are built as styled Text objects, so Rich has no markup to parse
+    match = result.match_assessment
     decision_color = 'red' if result.decision != 'NO_MATCH' else 'green'
-    # Use f"[{decision_color} bold]" to apply both style and color, and use [/] to close
-    table.add_row(
-        "Screening Decision", 
-        f"[{decision_color} bold]{result.decision}[/]", 
-        end_section=True
-    )
+    decision_row = ("Screening Decision", Text(result.decision, style=f"{decision_color} bold"))
+
+    rows: List[Tuple[str, Text]] = [
+        ("Match Confidence", Text(f"{match.confidence} ({match.match_probability:.2f})")),
+    ]
 
-    # Match Details
-    table.add_row("Match Confidence", f"{result.match_assessment.confidence} ({result.match_assessment.match_probability:.2f})")
-    
     # Sentiment Details (only if present)
-    if result.sentiment_assessment:
-        color = "red" if result.sentiment_assessment.is_adverse_media else "green"
-        table.add_row("Adverse Media Found", 
-                      f"[{color} bold]{result.sentiment_assessment.classification} "
-                      f"(Severity: {result.sentiment_assessment.severity})[/]")
+    sentiment = result.sentiment_assessment
+    if sentiment:
+        color = "red" if sentiment.is_adverse_media else "green"
+        rows.append((
+            "Adverse Media Found",
+            Text(f"{sentiment.classification} (Severity: {sentiment.severity})", style=f"{color} bold"),
+        ))
     else:
-        table.add_row("Adverse Media Found", "N/A (No match found)")
+        rows.append(("Adverse Media Found", Text("N/A (No match found)")))
 
     # Processing Details
     meta = result.processing_metadata
-    table.add_row("Total Duration", f"{meta.total_duration_ms / 1000:.2f} seconds")
-    table.add_row("Total Cost", f"USD [green]${meta.estimated_cost_usd:.4f}[/green]")
-    table.add_row("Total Tokens", f"{meta.total_tokens}")
-    table.add_row("Provider/Model", f"{meta.llm_provider}/{meta.llm_model}")
-    table.add_row("Errors/Warnings", f"[red]{len(meta.errors_encountered)}[/red] Errors, [yellow]{len(meta.warnings)}[/yellow] Warnings")
+    rows += [
+        ("Total Duration", Text(f"{meta.total_duration_ms / 1000:.2f} seconds")),
+        ("Total Cost", Text.assemble("USD ", (f"${meta.estimated_cost_usd:.4f}", "green"))),
+        ("Total Tokens", Text(f"{meta.total_tokens}")),
+        ("Provider/Model", Text(f"{meta.llm_provider}/{meta.llm_model}")),
+        ("Errors/Warnings", Text.assemble(
+            (str(len(meta.errors_encountered)), "red"), " Errors, ",
+            (str(len(meta.warnings)), "yellow"), " Warnings",
+        )),
+    ]
+
+    table.add_row(*decision_row)
+    table.add_section()
+    for label, value in rows:
+        table.add_row(label, value)
 
     console.print(table)
 
@@ -78,6 +94,113 @@ def print_full_report(report_text: str):
     console.print(report_text)
 
 
+# --- Programmatic Entry Point ---
+
+
+class ScreeningFailedError(RuntimeError):
+    """Raised when the workflow finished without producing a screening result."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors) or "Screening failed without a result.")
+        self.errors = errors
+
+
+def run_screening(
+    name: str,
+    dob: date,
+    url: str,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    llm_factory: Optional[LLMFactory] = None,
+    on_report_chunk: Optional[Callable[[str], None]] = None,
+) -> ScreeningResult:
+    """
+    Synchronous wrapper around arun_screening().
+    """
+    return run_async(arun_screening(name, dob, url, provider, model, llm_factory, on_report_chunk))
+
+
+async def arun_screening(
+    name: str,
+    dob: date,
+    url: str,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    llm_factory: Optional[LLMFactory] = None,
+    on_report_chunk: Optional[Callable[[str], None]] = None,
+) -> ScreeningResult:
+    """
+    Runs one screening in-process and returns its result.
+
+    Screenings awaited concurrently on the same event loop share one set of
+    LLM clients (see llm_factory).
+
+    Args:
+        name: Full name of the person being screened.
+        dob: Date of birth.
+        url: News article URL to be screened.
+        provider: Optional override for the default LLM provider.
+        model: Optional override for the default LLM model name.
+        llm_factory: Factory to reuse across screenings, so LLM clients (and the
+            chains built on them) are created once. A new one is made if omitted.
+        on_report_chunk: Optional callback receiving the report text as the LLM
+            writes it (the decision summary in template report mode), so callers
+            can show it before the run completes.
+
+    Returns:
+        The final ScreeningResult.
+
+    Raises:
+        ValueError: If the input does not validate.
+        ConnectionError: On critical failures (all LLMs or the article fetcher).
+        ScreeningFailedError: If the workflow ended without a result.
+    """
+    settings_instance = settings.get_settings()
+
+    # 1. Prepare the input query model
+    query = ScreeningQuery(
+        name=name,
+        dob=dob,
+        url=url,
+        provider=settings.LLMProvider(provider) if provider else None,
+        model=model,
+    )
+
+    logger.info(f"Starting screening for {query.name} (DOB: {query.dob}) against {query.url}")
+    
+    # 2. Initialize Core Components
+    llm_factory = llm_factory or LLMFactory(settings_instance)
+    cost_tracker = CostTracker()
+    
+    # Connect to the LLM provider while the article is being fetched
+    prewarm = asyncio.create_task(llm_factory.aprewarm([settings_instance.default_llm_provider]))
+
+    # 3. Initialize and Run Workflow
+    try:
+        workflow = AdverseMediaWorkflow(settings_instance, llm_factory, cost_tracker)
+        if on_report_chunk is None:
+            final_state = await workflow.arun_workflow(query)
+        else:
+            async for kind, payload in workflow.astream_workflow(query):
+                if kind == "report_chunk":
+                    on_report_chunk(payload)
+                else:
+                    final_state = payload
+    except ConnectionError:
+        raise
+    except Exception as e:
+        logger.error(f"Workflow ended with an unhandled exception: {e}", exc_info=True)
+        raise ScreeningFailedError([f"Workflow interrupted by unhandled exception: {e}"]) from e
+    finally:
+        await prewarm
+
+    result = final_state["final_screening_result"]
+    if result is None:
+        raise ScreeningFailedError(final_state["errors"])
+
+    return result
+
+
 # --- CLI Command Group ---
 
 
@@ -90,11 +213,11 @@ def cli():
 
 @cli.command()
 @click.option("--name", required=True, type=str, help="Full name of the person being screened.")
-@click.option("--dob", required=True, type=str, help="Date of birth in YYYY-MM-DD format.")
+@click.option("--dob", required=True, type=click.DateTime(formats=["%Y-%m-%d"]), help="Date of birth in YYYY-MM-DD format.")
 @click.option("--url", required=True, type=str, help="News article URL to be screened.")
 @click.option(
     "--provider",
-    type=click.Choice([p.value for p in settings.LLMProvider]),
+    type=click.Choice(PROVIDER_CHOICES),
     default=None,
     help="Optional override for the default LLM provider.",
 )
@@ -104,83 +227,79 @@ def cli():
     default=None,
     help="Optional override for the default LLM model name.",
 )
-def screen(name: str, dob: str, url: str, provider: str, model: str):
+@click.option(
+    "--stream/--no-stream",
+    default=False,
+    help="Print the report as the LLM writes it instead of after the run.",
+)
+def screen(name: str, dob: datetime, url: str, provider: str, model: str, stream: bool):
     """
     Executes an adverse media screening against a single news article URL.
     """
-    settings_instance = settings.get_settings()
+    streamed: List[str] = []
+
+    def print_report_chunk(chunk: str):
+        if not streamed:
+            console.rule("[bold]Report (streaming)[/bold]", style="bold cyan")
+        streamed.append(chunk)
+        console.print(chunk, end="", markup=False, highlight=False)
 
-    # 1. Prepare the input query model
     try:
-        query = ScreeningQuery(
-            name=name,
-            dob=dob,
-            url=url,
-            provider=settings.LLMProvider(provider) if provider else None,
-            model=model,
+        result = run_screening(
+            name, dob.date(), url, provider=provider, model=model,
+            on_report_chunk=print_report_chunk if stream else None,
         )
-    except Exception as e:
+    except ValueError as e:
         console.print(f"[bold red]Input Error:[/bold red] Could not validate input: {e}")
         return
-
-    logger.info(f"Starting screening for {query.name} (DOB: {query.dob}) against {query.url}")
-    
-    # 2. Initialize Core Components
-    llm_factory = LLMFactory(settings_instance)
-    cost_tracker = CostTracker()
-    
-    # 3. Initialize and Run Workflow
-    try:
-        workflow = AdverseMediaWorkflow(settings_instance, llm_factory, cost_tracker)
-        final_state = workflow.run_workflow(query)
-        
     except ConnectionError as e:
         # Catch critical errors like all LLMs or the article fetcher failing
         logger.error(f"Critical Workflow Failure: {e}")
         console.print(f"\n[bold red]CRITICAL FAILURE:[/bold red] The workflow could not complete due to a major error.")
         return
-    except Exception as e:
-        logger.error(f"Workflow ended with an unhandled exception: {e}", exc_info=True)
-        final_state = {"errors": [f"Workflow interrupted by unhandled exception: {e}"]}
-
+    except ScreeningFailedError as e:
+        # Handle case where report generation failed completely
+        console.print("\n" + "="*80)
+        console.print("[bold red]Screening Failed.[/bold red]")
+        if e.errors:
+            console.print("\n[bold]Errors Encountered:[/bold]")
+            for error in e.errors:
+                console.print(f"  [red]- {error}[/red]")
+        return
 
-    # 4. Final Output Processing
+    # Final Output Processing
     console.print("\n" + "="*80)
     
-    if "final_screening_result" in final_state:
-        result: ScreeningResult = final_state["final_screening_result"]
-        
-        # Print structured summary
-        print_summary_table(result)
-        
-        # Print final report text
+    # Print structured summary
+    print_summary_table(result)
+    
+    # Print final report text (unless it was already streamed as is)
+    if "".join(streamed) != result.report:
         print_full_report(result.report)
+
+    # Plain, machine-readable decision line (parsed by run_e2e.py --isolated)
+    click.echo(f"FINAL_DECISION: {result.decision}")
+    
+    try:
+        name_safe = result.query.name.replace(" ", "_").lower()
+        saved_at = datetime.now(timezone.utc)
+        timestamp = saved_at.strftime('%Y%m%d_%H%M%S')
+        filename = f"src/outputs/report_{name_safe}_{timestamp}.md"
+
+        # 2. Write the report text to the file
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(result.report)
         
-        try:
-            name_safe = result.query['name'].replace(" ", "_").lower()
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"src/outputs/report_{name_safe}_{timestamp}.md"
-
-            # 2. Write the report text to the file
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(result.report)
-            
-            console.print(f"\n[bold green]Report Saved:[/bold green] Full report text written to [yellow]{filename}[/yellow]")
-
-            # Save raw structured output for audit
-            with open(f"src/outputs/report_{datetime.now().strftime('%Y%m%d%H%M%S')}.json", "w") as f:
-                json.dump(result.model_dump(), f, indent=2, default=str)
-            
-        except Exception as e:
-            console.print(f"[bold red]File Save Error:[/bold red] Could not save report file: {e}")
+        console.print(f"\n[bold green]Report Saved:[/bold green] Full report text written to [yellow]{filename}[/yellow]")
 
-    else:
-        # Handle case where report generation failed completely
-        console.print("[bold red]Screening Failed.[/bold red]")
-        if final_state.get("errors"):
-            console.print("\n[bold]Errors Encountered:[/bold]")
-            for error in final_state["errors"]:
-                console.print(f"  [red]- {error}[/red]")
+        # Save raw structured output for audit
+        # (serialized by pydantic-core directly, without building an intermediate dict)
+        json_filename = f"src/outputs/report_{saved_at.strftime('%Y%m%d%H%M%S')}.json"
+        with open(json_filename, "w", encoding="utf-8") as f:
+            f.write(result.model_dump_json(indent=2))
+        
+    except Exception as e:
+        console.print(f"[bold red]File Save Error:[/bold red] Could not save report file: {e}")
 
 
 # --- Main Execution ---
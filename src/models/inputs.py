@@ -7,6 +7,7 @@ Defines the structure of the data submitted by the user/analyst
 for adverse media screening.
 """
 
+from datetime import date
 from typing import Optional
 from pydantic import BaseModel, Field
 
@@ -25,7 +26,7 @@ class ScreeningQuery(BaseModel):
 
     # Core required inputs
     name: str = Field(description="Full name of the person being screened.")
-    dob: str = Field(description="Date of birth in YYYY-MM-DD format.")
+    dob: date = Field(description="Date of birth (YYYY-MM-DD strings are parsed on validation).")
     url: str = Field(description="News article URL to be screened.")
 
     # Optional overrides
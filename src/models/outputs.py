@@ -9,7 +9,9 @@ regulatory compliance and system integration.
 
 from typing import Optional, Literal
 from datetime import date, datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from .inputs import ScreeningQuery
 
 # =============================================================================
 # Intermediate Models (Section 3.2)
@@ -19,6 +21,8 @@ from pydantic import BaseModel, Field
 class ArticleMetadata(BaseModel):
     """Extracted article information."""
 
+    model_config = ConfigDict(frozen=True)
+
     url: str = Field(description="Original news article URL.")
     title: str = Field(description="Title of the article.")
     source: str = Field(description='Source publication, e.g., "New York Times".')
@@ -56,6 +60,8 @@ class PersonEntity(BaseModel):
 class MatchAssessment(BaseModel):
     """Result of matching query person to an article entity (Section 3.2)."""
 
+    model_config = ConfigDict(frozen=True)
+
     is_match: bool = Field(
         description="True if confident match OR uncertain potential match."
     )
@@ -65,16 +71,16 @@ class MatchAssessment(BaseModel):
     match_probability: float = Field(
         description="0.0 to 1.0 probability score (for quantitative comparison)."
     )
-    reasoning_steps: list[str] = Field(
+    reasoning_steps: tuple[str, ...] = Field(
         description="Chain of thought: step-by-step reasoning for the decision."
     )
-    supporting_evidence: list[str] = Field(
+    supporting_evidence: tuple[str, ...] = Field(
         description="List of facts supporting the match (e.g., matching DOB)."
     )
-    contradicting_evidence: list[str] = Field(
+    contradicting_evidence: tuple[str, ...] = Field(
         description="List of facts contradicting the match (e.g., different age)."
     )
-    missing_information: list[str] = Field(
+    missing_information: tuple[str, ...] = Field(
         description="What information is missing that prevents a HIGH confidence match."
     )
     matched_entity: Optional[PersonEntity] = Field(
@@ -85,6 +91,8 @@ class MatchAssessment(BaseModel):
 class SentimentAssessment(BaseModel):
     """Sentiment and adverse media analysis result (Section 3.2)."""
 
+    model_config = ConfigDict(frozen=True)
+
     classification: Literal["POSITIVE", "NEGATIVE", "NEUTRAL"]
     is_adverse_media: bool = Field(
         description="True if the article contains adverse media indicators."
@@ -92,10 +100,10 @@ class SentimentAssessment(BaseModel):
     severity: Optional[Literal["HIGH", "MEDIUM", "LOW"]] = Field(
         default=None, description="Severity of the adverse media (if present)."
     )
-    adverse_indicators: list[str] = Field(
+    adverse_indicators: tuple[str, ...] = Field(
         description='Specific issues found, e.g., ["fraud", "lawsuit"].'
     )
-    evidence_snippets: list[str] = Field(
+    evidence_snippets: tuple[str, ...] = Field(
         description="Quotes from the article supporting the adverse finding."
     )
     reasoning: str = Field(
@@ -110,6 +118,8 @@ class SentimentAssessment(BaseModel):
 class ProcessingMetadata(BaseModel):
     """Execution and cost metadata (Section 3.3)."""
 
+    model_config = ConfigDict(frozen=True)
+
     timestamp: datetime = Field(description="UTC timestamp of when processing finished.")
     total_duration_ms: float = Field(
         description="Total duration of the screening process in milliseconds."
@@ -128,18 +138,19 @@ class ProcessingMetadata(BaseModel):
     )
 
     # Processing steps
-    steps_completed: list[str] = Field(description="List of all nodes/steps executed.")
-    errors_encountered: list[str] = Field(
+    steps_completed: tuple[str, ...] = Field(description="List of all nodes/steps executed.")
+    errors_encountered: tuple[str, ...] = Field(
         description="List of errors/exceptions encountered."
     )
-    warnings: list[str] = Field(description="List of non-critical warnings.")
+    warnings: tuple[str, ...] = Field(description="List of non-critical warnings.")
 
 
 class ScreeningResult(BaseModel):
     """Complete, final screening result (Section 3.3)."""
 
-    # ScreeningQuery (the input model) will be imported and used here
-    query: dict = Field(description="The original ScreeningQuery used for the run.")
+    model_config = ConfigDict(frozen=True)
+
+    query: ScreeningQuery = Field(description="The original ScreeningQuery used for the run.")
     
     decision: Literal["MATCH", "NO_MATCH", "UNCERTAIN"] = Field(
         description="Final decision based on match assessment."
@@ -151,7 +162,7 @@ class ScreeningResult(BaseModel):
     )
     
     article_metadata: ArticleMetadata
-    entities_found: list[PersonEntity] = Field(
+    entities_found: tuple[PersonEntity, ...] = Field(
         description="All people entities extracted from the article."
     )
     
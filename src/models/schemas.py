@@ -6,7 +6,7 @@ This file is used to break circular dependencies between nodes and chains.
 """
 
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Literal, Optional
 
 
 from src.models.outputs import PersonEntity, MatchAssessment, SentimentAssessment
@@ -33,6 +33,33 @@ class NameMatchingOutput(BaseModel):
     )
 
 
+class EntityMatchOutput(BaseModel):
+    """
+    One entity's score in the Batched Name Matching output. Only the fields
+    needed to rank the entities; the best one is then assessed in full.
+    """
+    id: int = Field(description="The id attribute of the assessed article entity.")
+    is_match: bool = Field(
+        description="True if confident match OR uncertain potential match."
+    )
+    confidence: Literal["HIGH", "MEDIUM", "LOW"] = Field(
+        description="Confidence level of the match decision."
+    )
+    match_probability: float = Field(
+        description="0.0 to 1.0 probability score (for quantitative comparison)."
+    )
+
+
+class BatchedNameMatchingOutput(BaseModel):
+    """
+    Structured output schema for the Batched Name Matching chain: the scores
+    of all candidate entities of an article, from one call.
+    """
+    assessments: List[EntityMatchOutput] = Field(
+        description="One score per article entity, in the given order."
+    )
+
+
 class SentimentOutput(BaseModel):
     """
     Structured output schema for the Sentiment Analysis chain. (Section 5.3)
@@ -41,4 +68,21 @@ class SentimentOutput(BaseModel):
     """
     assessment: SentimentAssessment = Field(
         description="The detailed sentiment assessment."
-    )
\ No newline at end of file
+    )
+
+
+class CombinedScreeningOutput(BaseModel):
+    """
+    Structured output schema for the Combined Screening chain: extraction,
+    matching and sentiment analysis of a short article in one call.
+    """
+    extracted_entities: List[PersonEntity] = Field(
+        description="A list of all unique person entities extracted from the article."
+    )
+    match_assessment: MatchAssessment = Field(
+        description="The assessment of the most likely match for the query person."
+    )
+    sentiment_assessment: Optional[SentimentAssessment] = Field(
+        default=None,
+        description="The sentiment assessment of the matched person; null when there is no match.",
+    )
@@ -1,14 +1,22 @@
-from typing import Dict, Any, Type, Union, List
+from typing import Dict, Any, Type, Union, List, Optional, Sequence, Tuple, Callable
 from abc import ABC, abstractmethod
 import time
 
+from langchain_core.callbacks import get_usage_metadata_callback
 from langchain_core.language_models import BaseLanguageModel
+from langchain_core.messages.ai import UsageMetadata
+from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 from pydantic import BaseModel
 
 from src.llm.cost_tracker import CostTracker
+from src.llm.hedging import HedgeOutcome, create_hedged_chain, track_hedge_outcome
+from src.llm.response_cache import LLMResponseCache
+from src.llm.semantic_cache import SemanticCache, get_semantic_cache
 from src.graph.state import ScreeningState
 from src.utils.logger import get_logger
+from src.utils.tokens import count_tokens
+from config.prompts import render
 from config.settings import Settings, LLMProvider
 
 logger = get_logger("BaseNode")
@@ -19,18 +27,311 @@ class BaseNode(ABC):
     It handles common logic like cost tracking and error handling.
     """
 
-    def __init__(self, llm: BaseLanguageModel, settings: Settings, cost_tracker: CostTracker):
+    # Subclasses set this to their config.prompts.PROMPTS key so prompts can be
+    # rendered without going through LangChain's template formatting (used for cache keys).
+    prompt_task: Optional[str] = None
+    # Prompt variable holding the article text, for nodes whose results can be
+    # reused across near-duplicate articles (semantic cache), and the other
+    # prompt variables that must match exactly for such a reuse.
+    semantic_cache_field: Optional[str] = None
+    semantic_cache_context: Tuple[str, ...] = ()
+    # Prompt variable holding the full article, whose token count is known from
+    # the fetch step and need not be estimated again.
+    article_field: Optional[str] = None
+
+    def __init__(
+        self,
+        llm: BaseLanguageModel,
+        settings: Settings,
+        cost_tracker: CostTracker,
+        model_name: Optional[str] = None,
+        backup_llms: Sequence[Tuple[LLMProvider, BaseLanguageModel]] = (),
+    ):
         self.llm = llm
+        # The model llm was built with, when it differs from the run's model (state["llm_model"])
+        self.model_name = model_name
+        # (provider, client) pairs on other providers that calls are hedged
+        # across (empty when hedging is off); each runs its provider's default model
+        self.backup_llms = backup_llms
         self.settings = settings
         self.cost_tracker = cost_tracker
+        # Explicit cache breakpoints are an Anthropic feature; other providers
+        # cache the (static-first) prompt prefix automatically.
+        self.prompt_caching = (
+            settings.enable_prompt_caching
+            and settings.default_llm_provider == LLMProvider.ANTHROPIC
+        )
+        self.response_cache: Optional[LLMResponseCache] = (
+            LLMResponseCache(settings.cache_dir, settings.cache_ttl_days)
+            if settings.enable_caching
+            else None
+        )
+        self.semantic_cache: Optional[SemanticCache] = (
+            get_semantic_cache(settings)
+            if settings.enable_semantic_cache and self.semantic_cache_field
+            else None
+        )
+
+    def _build_chain(self, create_chain: Callable[..., Runnable]) -> Runnable:
+        """
+        Build the node's chain with a chain factory, hedged across the backup LLMs.
+
+        Backup chains are built without cache breakpoints, which only the
+        Anthropic API accepts.
+        """
+        chain = create_chain(self.llm, prompt_caching=self.prompt_caching)
+        if not self.backup_llms:
+            return chain
+        backups = [create_chain(llm, prompt_caching=False) for _, llm in self.backup_llms]
+        return create_hedged_chain(chain, backups, self.settings.hedge_delay_ms / 1000)
 
     @abstractmethod
-    def run(self, state: ScreeningState, llm_provider: LLMProvider) -> Dict[str, Any]:
+    async def run(self, state: ScreeningState, llm_provider: LLMProvider) -> Dict[str, Any]:
         """
-        The main execution method for the node. Must be implemented by subclasses.
+        The main execution method for the node (a coroutine, run by
+        graph.ainvoke). Must be implemented by subclasses.
         """
         pass
     
+    def _llm_model(self, state: ScreeningState) -> str:
+        """The model this node's calls run on: its own, else the run's."""
+        llm_model = self.model_name or state["llm_model"]
+        if not llm_model:
+            raise ValueError("No LLM model configured for this screening run.")
+        return llm_model
+
+    def _render_prompt(
+        self, chain: Runnable, input_vars: Dict[str, Any], prompt_task: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Format the prompt exactly as the LLM will see it.
+
+        Uses the precompiled renderer for the call's prompt_task (default: the
+        node's) when set, falling back to the chain's own prompt template.
+
+        Returns:
+            A (system, user) tuple of the formatted message contents.
+        """
+        prompt_task = prompt_task or self.prompt_task
+        if prompt_task is not None:
+            return render(prompt_task, **input_vars)
+
+        prompt = chain.get_prompts()[0]
+        if not isinstance(prompt, ChatPromptTemplate):
+            raise TypeError(f"Expected a chat prompt template, got {type(prompt).__name__}.")
+        system_parts: List[str] = []
+        user_parts: List[str] = []
+        for message in prompt.format_messages(**input_vars):
+            target = system_parts if message.type == "system" else user_parts
+            target.append(message.text)
+        return "\n".join(system_parts), "\n".join(user_parts)
+
+    def _semantic_context(self, input_vars: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        The prompt variables that must match exactly for a semantic cache hit.
+        Subclasses can override this to derive them from structured inputs.
+        """
+        return {k: input_vars[k] for k in self.semantic_cache_context}
+
+    def _cache_hit(
+        self,
+        cached: Any,
+        step_name: str,
+        llm_provider: LLMProvider,
+        llm_model: str,
+        start_time: float,
+        output_schema: Optional[Type[BaseModel]],
+    ) -> Any:
+        """
+        Record a zero-token call for a cached response and return it validated.
+        """
+        self.cost_tracker.record_usage(
+            step_name=step_name,
+            provider=llm_provider,
+            model_name=llm_model,
+            prompt_tokens=0,
+            completion_tokens=0,
+            latency_ms=(time.time() - start_time) * 1000,
+            cache_hit=True,
+        )
+        return output_schema.model_validate(cached) if output_schema else cached
+
+    def _lookup_cached(
+        self,
+        chain: Runnable,
+        input_vars: Dict[str, Any],
+        step_name: str,
+        llm_provider: LLMProvider,
+        llm_model: str,
+        start_time: float,
+        output_schema: Optional[Type[BaseModel]],
+        prompt_task: Optional[str] = None,
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Look the prompt up in the exact-match cache.
+
+        Returns:
+            A (cached response or None, cache key) tuple; the key is needed to
+            store the response after a miss.
+        """
+        cache_key = None
+        if self.response_cache is not None:
+            system_prompt, user_prompt = self._render_prompt(chain, input_vars, prompt_task)
+            cache_key = LLMResponseCache.make_key(
+                llm_provider.value, llm_model, system_prompt, user_prompt
+            )
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"LLM cache hit for step '{step_name}'.")
+                hit = self._cache_hit(cached, step_name, llm_provider, llm_model, start_time, output_schema)
+                return hit, cache_key
+
+        return None, cache_key
+
+    def _semantic_key(
+        self,
+        input_vars: Dict[str, Any],
+        step_name: str,
+        llm_provider: LLMProvider,
+        llm_model: str,
+    ) -> Optional[Tuple[SemanticCache, str, str]]:
+        """
+        The (cache, namespace, article text) a call is looked up and stored
+        under in the semantic cache, or None if it does not use it.
+        """
+        # Only calls that carry the node's semantic_cache_field (not e.g. batched calls)
+        if (
+            self.semantic_cache is None
+            or self.semantic_cache_field is None
+            or self.semantic_cache_field not in input_vars
+        ):
+            return None
+        namespace = SemanticCache.make_namespace(
+            self.prompt_task or step_name, llm_provider.value, llm_model, self._semantic_context(input_vars)
+        )
+        return self.semantic_cache, namespace, input_vars[self.semantic_cache_field]
+
+    @staticmethod
+    def _reported_usage(usage_metadata: Optional[Dict[str, UsageMetadata]]) -> Optional[Dict[str, int]]:
+        """
+        Sum the usage the provider reported for a call (per model, from
+        get_usage_metadata_callback), or None if it reported none.
+        """
+        if not usage_metadata:
+            return None
+        usage = dict(prompt_tokens=0, completion_tokens=0, cache_read_tokens=0, cache_write_tokens=0)
+        for model_usage in usage_metadata.values():
+            details = model_usage.get("input_token_details") or {}
+            cache_read = details.get("cache_read") or 0
+            cache_write = details.get("cache_creation") or 0
+            # input_tokens includes the cached tokens, which are priced separately
+            usage["prompt_tokens"] += model_usage.get("input_tokens", 0) - cache_read - cache_write
+            usage["completion_tokens"] += model_usage.get("output_tokens", 0)
+            usage["cache_read_tokens"] += cache_read
+            usage["cache_write_tokens"] += cache_write
+        return usage
+
+    def _estimate_usage(
+        self,
+        input_vars: Dict[str, Any],
+        response: Any,
+        llm_model: str,
+        article_tokens: Optional[int],
+        prompt_task: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Fallback when the provider reported no usage: count the tokens of the
+        rendered prompt and of the output with the model's tokenizer.
+        """
+        prompt_vars = input_vars
+        if article_tokens is not None and self.article_field in input_vars:
+            # Counted once at fetch time
+            prompt_vars = {**input_vars, self.article_field: ""}
+        else:
+            article_tokens = 0
+        prompt_task = prompt_task or self.prompt_task
+        if prompt_task is not None:
+            prompt_text = "\n".join(render(prompt_task, **prompt_vars))
+        else:
+            prompt_text = str(prompt_vars)
+        output_text = response.model_dump_json() if isinstance(response, BaseModel) else str(response)
+        return dict(
+            prompt_tokens=article_tokens + count_tokens(prompt_text, llm_model),
+            completion_tokens=count_tokens(output_text, llm_model),
+            cache_read_tokens=0,
+            cache_write_tokens=0,
+        )
+
+    def _hedge_target(self, index: int, llm_provider: LLMProvider, llm_model: str) -> Tuple[LLMProvider, str]:
+        """The provider and model of a hedged call's chain (0 is the primary)."""
+        if index == 0:
+            return llm_provider, llm_model
+        provider, _ = self.backup_llms[index - 1]
+        return provider, self.settings.get_model_name(provider)
+
+    def _finish_call(
+        self,
+        response: Any,
+        input_vars: Dict[str, Any],
+        step_name: str,
+        llm_provider: LLMProvider,
+        llm_model: str,
+        start_time: float,
+        output_schema: Optional[Type[BaseModel]],
+        cache_key: Optional[str],
+        article_tokens: Optional[int] = None,
+        usage_metadata: Optional[Dict[str, UsageMetadata]] = None,
+        prompt_task: Optional[str] = None,
+        hedge: Optional[HedgeOutcome] = None,
+    ) -> Any:
+        """
+        Record the usage of a completed call, validate the output and cache it.
+        """
+        duration_ms = (time.time() - start_time) * 1000
+        hedge = hedge or HedgeOutcome()
+
+        # A hedged call is billed by the provider whose chain answered
+        provider, model = self._hedge_target(hedge.winner, llm_provider, llm_model)
+
+        # Token counts reported by the provider; estimated if it reported none
+        usage = self._reported_usage(usage_metadata) or self._estimate_usage(
+            input_vars, response, model, article_tokens, prompt_task
+        )
+        
+        # Track the usage
+        self.cost_tracker.record_usage(
+            step_name=step_name,
+            provider=provider,
+            model_name=model,
+            prompt_tokens=usage["prompt_tokens"],
+            completion_tokens=usage["completion_tokens"],
+            cache_read_tokens=usage["cache_read_tokens"],
+            cache_write_tokens=usage["cache_write_tokens"],
+            latency_ms=duration_ms,
+        )
+
+        # Cancelled hedges report no usage, but their prompts were already billed
+        for index in hedge.cancelled:
+            provider, model = self._hedge_target(index, llm_provider, llm_model)
+            prompt_usage = self._estimate_usage(input_vars, "", model, article_tokens, prompt_task)
+            self.cost_tracker.record_usage(
+                step_name=f"{step_name}_hedge_cancelled",
+                provider=provider,
+                model_name=model,
+                prompt_tokens=prompt_usage["prompt_tokens"],
+                completion_tokens=0,
+                latency_ms=duration_ms,
+            )
+
+        # Validate before caching so malformed outputs are never replayed
+        if output_schema is not None:
+            response = output_schema.model_validate(response)
+
+        if self.response_cache is not None and cache_key is not None:
+            self.response_cache.set(cache_key, response, llm_model)
+
+        return response
+
     def _invoke_chain_with_tracking(
         self,
         chain: Runnable,
@@ -38,9 +339,16 @@ class BaseNode(ABC):
         step_name: str,
         llm_provider: LLMProvider,
         llm_model: str,
-    ) -> BaseModel:
+        output_schema: Optional[Type[BaseModel]] = None,
+        article_tokens: Optional[int] = None,
+        prompt_task: Optional[str] = None,
+    ) -> Any:
         """
         Invokes a LangChain Runnable and tracks LLM usage/cost.
+
+        When response caching is enabled, the formatted prompt is hashed first and
+        a cache hit returns the stored response without calling the provider. On a
+        miss, nodes with a semantic_cache_field also try the semantic cache.
         
         Args:
             chain: The configured LangChain Runnable (Prompt | LLM | Parser).
@@ -48,32 +356,80 @@ class BaseNode(ABC):
             step_name: The name of the node/step for logging.
             llm_provider: The provider enum.
             llm_model: The model string.
+            output_schema: Optional Pydantic model used to validate the output.
+                Only validated responses are written to the cache.
+            article_tokens: Token count of the article_field prompt variable,
+                used instead of estimating it for the usage record.
+            prompt_task: The config.prompts task of the chain, when it is not
+                the node's prompt_task.
             
         Returns:
-            The parsed Pydantic output model.
+            The validated Pydantic model if output_schema is given, otherwise
+            the raw chain output.
         """
-        
         start_time = time.time()
-        
-        # 1. Invoke the chain
-        response = chain.invoke(input_vars)
-        
-        duration_ms = (time.time() - start_time) * 1000
-        
-        # Fallback/Simplification: Estimate token counts based on length
-        input_length = len(str(input_vars).split())
-        output_length = len(str(response).split())
-        
-        # Track the usage
-        self.cost_tracker.record_usage(
-            step_name=step_name,
-            provider=llm_provider,
-            model_name=llm_model,
-            prompt_tokens=input_length * 1.5,
-            completion_tokens=output_length * 1.5,
-            cache_read_tokens=0,
-            cache_write_tokens=0,
-            latency_ms=duration_ms,
+        cached, cache_key = self._lookup_cached(
+            chain, input_vars, step_name, llm_provider, llm_model, start_time, output_schema, prompt_task
         )
-        
-        return response
\ No newline at end of file
+        if cached is not None:
+            return cached
+
+        semantic_key = self._semantic_key(input_vars, step_name, llm_provider, llm_model)
+        if semantic_key is not None:
+            semantic_cache, namespace, text = semantic_key
+            cached = semantic_cache.get(namespace, text)
+            if cached is not None:
+                logger.info(f"Semantic cache hit for step '{step_name}'.")
+                return self._cache_hit(cached, step_name, llm_provider, llm_model, start_time, output_schema)
+
+        with get_usage_metadata_callback() as usage_callback, track_hedge_outcome() as hedge:
+            response = chain.invoke(input_vars)
+        response = self._finish_call(
+            response, input_vars, step_name, llm_provider, llm_model, start_time,
+            output_schema, cache_key, article_tokens,
+            usage_callback.usage_metadata, prompt_task, hedge,
+        )
+        if semantic_key is not None:
+            semantic_cache.set(namespace, text, response)
+        return response
+
+    async def _ainvoke_chain_with_tracking(
+        self,
+        chain: Runnable,
+        input_vars: Dict[str, Any],
+        step_name: str,
+        llm_provider: LLMProvider,
+        llm_model: str,
+        output_schema: Optional[Type[BaseModel]] = None,
+        article_tokens: Optional[int] = None,
+        prompt_task: Optional[str] = None,
+    ) -> Any:
+        """
+        Async version of _invoke_chain_with_tracking (awaits chain.ainvoke).
+        """
+        start_time = time.time()
+        cached, cache_key = self._lookup_cached(
+            chain, input_vars, step_name, llm_provider, llm_model, start_time, output_schema, prompt_task
+        )
+        if cached is not None:
+            return cached
+
+        # Embedding the article is CPU-bound; it runs off the event loop
+        semantic_key = self._semantic_key(input_vars, step_name, llm_provider, llm_model)
+        if semantic_key is not None:
+            semantic_cache, namespace, text = semantic_key
+            cached = await semantic_cache.aget(namespace, text)
+            if cached is not None:
+                logger.info(f"Semantic cache hit for step '{step_name}'.")
+                return self._cache_hit(cached, step_name, llm_provider, llm_model, start_time, output_schema)
+
+        with get_usage_metadata_callback() as usage_callback, track_hedge_outcome() as hedge:
+            response = await chain.ainvoke(input_vars)
+        response = self._finish_call(
+            response, input_vars, step_name, llm_provider, llm_model, start_time,
+            output_schema, cache_key, article_tokens,
+            usage_callback.usage_metadata, prompt_task, hedge,
+        )
+        if semantic_key is not None:
+            await semantic_cache.aset(namespace, text, response)
+        return response
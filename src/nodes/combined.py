@@ -0,0 +1,101 @@
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+from langchain_core.language_models import BaseLanguageModel
+from src.chains.combined_screening import create_combined_screening_chain
+from src.models.schemas import CombinedScreeningOutput
+
+from src.graph.state import ScreeningState
+from src.nodes.base import BaseNode
+from src.nodes.matching import match_decision
+from src.utils.logger import get_logger
+from config.settings import LLMProvider
+
+
+logger = get_logger("CombinedScreeningNode")
+
+
+class CombinedScreeningNode(BaseNode):
+    """
+    Node that screens a short article in one LLM call: entity extraction, name
+    matching and sentiment analysis share a single structured output, saving
+    the round-trips of the staged pipeline. Articles above
+    combined_screening_max_tokens, and any failure here, go through the staged
+    nodes instead.
+    """
+
+    prompt_task = "combined_screening"
+    article_field = "article_content"
+
+    def __init__(
+        self,
+        llm: BaseLanguageModel,
+        settings: Any,
+        cost_tracker: Any,
+        model_name: Optional[str] = None,
+        backup_llms: Sequence[Tuple[LLMProvider, BaseLanguageModel]] = (),
+    ):
+        super().__init__(llm, settings, cost_tracker, model_name, backup_llms)
+
+        self.chain = self._build_chain(create_combined_screening_chain)
+
+    async def run(self, state: ScreeningState, llm_provider: LLMProvider) -> Dict[str, Any]:
+        """
+        Executes the combined screening and updates the state. On failure only a
+        warning is returned, leaving match_decision unset so the workflow falls
+        back to the staged nodes.
+        """
+        logger.info("Running Combined Screening Node...")
+
+        query = state["query"]
+        article_metadata = state["article_metadata"]
+        if article_metadata is None:
+            logger.warning("Combined screening skipped: article metadata is missing.")
+            return {"warnings": ["Combined screening skipped (no article metadata); screened in stages instead."]}
+
+        prompt_vars = {
+            "query_name": query.name,
+            "query_dob": query.dob.isoformat(),
+            "article_url": article_metadata.url,
+            "article_title": article_metadata.title,
+            "article_source": article_metadata.source,
+            "publish_date": article_metadata.publish_date.isoformat() if article_metadata.publish_date else "Unknown",
+            "language": article_metadata.language,
+            "article_content": state["article_text"],
+        }
+
+        try:
+            parsed_output = await self._ainvoke_chain_with_tracking(
+                self.chain,
+                prompt_vars,
+                step_name="combined_screening",
+                llm_provider=llm_provider,
+                llm_model=self._llm_model(state),
+                output_schema=CombinedScreeningOutput,
+                article_tokens=state.get("article_token_count"),
+            )
+        except Exception as e:
+            logger.warning(f"Combined screening failed, using the staged pipeline: {e.__class__.__name__}: {e}")
+            return {
+                "warnings": [f"Combined screening failed ({e.__class__.__name__}); screened in stages instead."],
+            }
+
+        entities = parsed_output.extracted_entities
+        assessment = parsed_output.match_assessment
+        decision = match_decision(assessment)
+        # Sentiment is only meaningful for a (potential) match
+        sentiment = parsed_output.sentiment_assessment if assessment.is_match else None
+
+        logger.info(
+            f"Combined screening: {len(entities)} entities, decision {decision} "
+            f"(Confidence: {assessment.confidence}, Prob: {assessment.match_probability:.2f})"
+        )
+
+        return {
+            "entities": entities,
+            "extraction_complete": True,
+            "match_assessment": assessment,
+            "match_decision": decision,
+            "sentiment_assessment": sentiment,
+            "warnings": [] if entities else ["No people entities were extracted from the article."],
+            "steps_completed": ["combined_screening"],
+        }
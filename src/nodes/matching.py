@@ -1,16 +1,19 @@
-from typing import Dict, Any, List, Optional
+import asyncio
 from datetime import date
+from typing import Dict, Any, List, Literal, Optional, Sequence, Tuple, TypeGuard
 
+import orjson
 from langchain_core.language_models import BaseLanguageModel
-from src.chains.name_matching import create_name_matching_chain
-from src.models.schemas import NameMatchingOutput
-from langchain_core.output_parsers import JsonOutputParser 
+from langchain_core.runnables import Runnable
+from src.chains.name_matching import create_batched_name_matching_chain, create_name_matching_chain
+from src.models.schemas import BatchedNameMatchingOutput, EntityMatchOutput, NameMatchingOutput
 
 from src.graph.state import ScreeningState
 from src.nodes.base import BaseNode
 from src.utils.logger import get_logger
-from src.utils.validators import verify_age_alignment, parse_date
-from config.prompts import format_entity_for_prompt
+from src.utils.validators import verify_age_alignment
+from src.utils.prefilter import EntityTable, name_similarity, prefilter_pairs
+from config.prompts import format_entities_for_prompt, format_entity_for_prompt
 from src.models.outputs import MatchAssessment, PersonEntity
 from config.settings import LLMProvider
 
@@ -18,88 +21,266 @@ from config.settings import LLMProvider
 logger = get_logger("MatchingNode")
 
 
+def match_decision(assessment: MatchAssessment) -> Literal["MATCH", "NO_MATCH", "UNCERTAIN"]:
+    """Determine the final decision based on the match assessment's boolean flag."""
+    if assessment.is_match:
+        return "MATCH" if assessment.confidence == "HIGH" else "UNCERTAIN"
+    return "NO_MATCH"
+
+
 class NameMatchingNode(BaseNode):
     """
     Node responsible for comparing the query person to each extracted entity
     using a multi-tier LLM and rule-based strategy. (Section 2.2.3 and 6)
     """
 
-    def __init__(self, llm: BaseLanguageModel, settings: Any, cost_tracker: Any):
-        super().__init__(llm, settings, cost_tracker)
-        self.output_parser = JsonOutputParser(pydantic_object=NameMatchingOutput)
+    prompt_task = "name_matching"
+    # Syndicated copies of an article describe the same entity with a reworded
+    # snippet; everything else about the entity and the query must be identical.
+    semantic_cache_field = "context_snippet"
+    semantic_cache_context = ("query_name", "query_dob", "article_date")
+
+    def __init__(
+        self,
+        llm: BaseLanguageModel,
+        settings: Any,
+        cost_tracker: Any,
+        model_name: Optional[str] = None,
+        backup_llms: Sequence[Tuple[LLMProvider, BaseLanguageModel]] = (),
+    ):
+        super().__init__(llm, settings, cost_tracker, model_name, backup_llms)
         
         # Chain is now initialized from the external src/chains package
-        self.chain = create_name_matching_chain(llm)
+        self.chain = self._build_chain(create_name_matching_chain)
+        self.batch_chain = (
+            self._build_chain(create_batched_name_matching_chain)
+            if settings.enable_batched_matching
+            else None
+        )
     
-    def _get_best_match(
-        self, state: ScreeningState, llm_provider: LLMProvider
+    def _semantic_context(self, input_vars: Dict[str, Any]) -> Dict[str, Any]:
+        """Exact-match context: the query plus the entity's fields other than its snippet."""
+        context = super()._semantic_context(input_vars)
+        entity = orjson.loads(input_vars["entity_json"])
+        entity.pop("context_snippet", None)
+        context["entity"] = orjson.dumps(entity, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+        return context
+
+    async def _get_best_match(
+        self, state: ScreeningState, llm_provider: LLMProvider, warnings: List[str]
     ) -> Optional[MatchAssessment]:
         """
         Iterates through all extracted entities and finds the highest confidence match.
+        Entities that could not be assessed are reported in warnings.
         """
         query = state["query"]
         entities = state.get("entities", [])
         article_metadata = state["article_metadata"]
         
-        # Parse required dates
-        query_dob = parse_date(query.dob)
+        query_dob = query.dob
         article_date = article_metadata.publish_date or date.today()
 
         if not entities:
             return None
 
-        best_assessment: Optional[MatchAssessment] = None
-        
-        for entity in entities:
-            # 1. Run deterministic rule-based pre-check: Age Verification
-            age_check = verify_age_alignment(
-                query_dob, article_date, entity.age
-            )
+        name_scores = name_similarity([query.name], [e.full_name for e in entities])
+
+        # 0. Drop obvious non-matches (unrelated name or incompatible age) without an LLM call
+        candidates = list(range(len(entities)))
+        if self.settings.enable_match_prefilter:
+            mask = prefilter_pairs(
+                [query.name],
+                [query_dob.year],
+                EntityTable.from_entities(entities, article_date),
+                age_tolerance=self.settings.age_tolerance,
+                min_name_score=self.settings.prefilter_min_name_score,
+                name_scores=name_scores,
+            )[0]
+            skipped = [e.full_name for e, keep in zip(entities, mask) if not keep]
+            if skipped:
+                logger.info(f"Pre-filter skipped {len(skipped)} of {len(entities)} entities: {skipped}")
+            candidates = [index for index in candidates if mask[index]]
+            if not candidates:
+                return self._no_match_assessment(
+                    "No entity in the article has a name or age compatible with the query person "
+                    f"(pre-filter rejected: {', '.join(skipped)})."
+                )
+
+        # Most similar names first (article order on ties): they are sent first
+        # and make an early exit on a decisive match more likely
+        candidates.sort(key=lambda index: -int(name_scores[0, index]))
+        entities = [entities[index] for index in candidates]
+
+        # Entities are assessed concurrently, at most max_concurrent_requests at a time
+        semaphore = asyncio.Semaphore(self.settings.max_concurrent_requests)
+
+        # 1. Run deterministic rule-based pre-check: Age Verification
+        age_checks = [
+            verify_age_alignment(query_dob, article_date, entity.age) for entity in entities
+        ]
+
+        # Prompt variables shared by every entity
+        shared_vars = {
+            "query_name": query.name,
+            "query_dob": query_dob.isoformat(),
+            "article_date": article_date.isoformat(),
+            "article_source": article_metadata.source,
+        }
+
+        async def assess(index: int) -> Optional[MatchAssessment]:
+            entity = entities[index]
 
             # 2. Prepare input variables for the LLM prompt
             prompt_vars = {
-                "query_name": query.name,
-                "query_dob": query.dob,
-                "article_date": article_date.isoformat(),
-                "article_source": article_metadata.source,
-                "age_check_result": age_check,
-                "entity_xml": format_entity_for_prompt(entity),
+                **shared_vars,
+                "age_check_result": age_checks[index],
+                "entity_json": format_entity_for_prompt(entity),
                 "context_snippet": entity.context_snippet,
-                "format_instructions": self.output_parser.get_format_instructions(),
             }
 
             # 3. Execute the chain for this entity
             try:
-                output = self._invoke_chain_with_tracking(
-                    self.chain,
-                    prompt_vars,
-                    step_name=f"match_entity_{entity.full_name[:15]}",
-                    llm_provider=llm_provider,
-                    llm_model=state["llm_model"],
-                )
-
-                parsed_output = NameMatchingOutput.model_validate(output)
+                async with semaphore:
+                    parsed_output = await self._ainvoke_chain_with_tracking(
+                        self.chain,
+                        prompt_vars,
+                        step_name=f"match_entity_{entity.full_name[:15]}",
+                        llm_provider=llm_provider,
+                        llm_model=self._llm_model(state),
+                        output_schema=NameMatchingOutput,
+                    )
 
-                assessment = parsed_output.final_assessment
-                assessment.matched_entity = entity # Attach the entity to the assessment
-
-                # 4. Update Best Match
-                if (
-                    best_assessment is None
-                    or assessment.match_probability > best_assessment.match_probability
-                ):
-                    best_assessment = assessment
+                # Attach the entity to the (immutable) assessment
+                assessment: MatchAssessment = parsed_output.final_assessment.model_copy(
+                    update={"matched_entity": entity}
+                )
+                return assessment
             
             except Exception as e:
                 logger.error(
                     f"LLM matching failed for entity {entity.full_name}: {e}", 
                     exc_info=True
                 )
-                state["warnings"].append(f"Matching failed for entity {entity.full_name}. Skipping.")
+                warnings.append(f"Matching failed for entity {entity.full_name}. Skipping.")
+                return None
+
+        # With batching, all candidates are scored in one compact call and only the
+        # top-scored one gets the full (report) assessment; entities the batch
+        # did not score, or all of them without it, are assessed one by one.
+        to_assess = list(range(len(entities)))
+        if self.batch_chain is not None and len(entities) > 1:
+            scores = await self._score_batch(
+                self.batch_chain, state, entities, age_checks, shared_vars, llm_provider
+            )
+            if scores:
+                # The most similar name on ties
+                top = max(sorted(scores), key=lambda index: scores[index].match_probability)
+                to_assess = [index for index in to_assess if index not in scores or index == top]
+
+        tasks = [asyncio.create_task(assess(index)) for index in to_assess]
+        try:
+            if self.settings.enable_match_early_exit:
+                # Stop at the first decisive match; entities not yet assessed are cancelled
+                for next_done in asyncio.as_completed(tasks):
+                    assessment = await next_done
+                    if self._is_decisive_match(assessment):
+                        matched = assessment.matched_entity
+                        logger.info(
+                            f"Decisive match on {matched.full_name if matched else 'an entity'}; "
+                            "skipping the remaining entities."
+                        )
+                        break
+            else:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        assessments = [task.result() for task in tasks if task.done() and not task.cancelled()]
+
+        # 4. Pick the best match (the most similar name on ties)
+        best_assessment: Optional[MatchAssessment] = None
+        for assessment in assessments:
+            if assessment is not None and (
+                best_assessment is None
+                or assessment.match_probability > best_assessment.match_probability
+            ):
+                best_assessment = assessment
 
         return best_assessment
 
-    def run(self, state: ScreeningState, llm_provider: LLMProvider) -> Dict[str, Any]:
+    async def _score_batch(
+        self,
+        batch_chain: Runnable,
+        state: ScreeningState,
+        entities: List[PersonEntity],
+        age_checks: Sequence[str],
+        shared_vars: Dict[str, Any],
+        llm_provider: LLMProvider,
+    ) -> Dict[int, EntityMatchOutput]:
+        """
+        Score all candidate entities in one LLM call with a compact output
+        (no reasoning or evidence), to pick the one worth a full assessment.
+
+        Returns:
+            The scores by entity index. Entities missing from the response (all
+            of them, if the call fails) are left to per-entity calls.
+        """
+        prompt_vars = {
+            **shared_vars,
+            "entities_xml": format_entities_for_prompt(entities, age_checks),
+        }
+
+        try:
+            parsed_output = await self._ainvoke_chain_with_tracking(
+                batch_chain,
+                prompt_vars,
+                step_name="match_entities_batch",
+                llm_provider=llm_provider,
+                llm_model=self._llm_model(state),
+                output_schema=BatchedNameMatchingOutput,
+                prompt_task="name_matching_batch",
+            )
+        except Exception as e:
+            logger.warning(
+                f"Batched matching failed, assessing entities one by one: {e.__class__.__name__}: {e}"
+            )
+            return {}
+
+        scores: Dict[int, EntityMatchOutput] = {}
+        for item in parsed_output.assessments:
+            if 0 <= item.id < len(entities):
+                scores.setdefault(item.id, item)
+        if len(scores) < len(entities):
+            logger.warning(
+                f"Batched matching scored {len(scores)} of {len(entities)} entities; "
+                "assessing the rest one by one."
+            )
+        return scores
+
+    def _is_decisive_match(self, assessment: Optional[MatchAssessment]) -> TypeGuard[MatchAssessment]:
+        """A HIGH-confidence match that no other entity could reasonably outscore."""
+        return (
+            assessment is not None
+            and assessment.is_match
+            and assessment.confidence == "HIGH"
+            and assessment.match_probability >= self.settings.match_early_exit_probability
+        )
+
+    @staticmethod
+    def _no_match_assessment(reason: str) -> MatchAssessment:
+        """Build a NO_MATCH assessment that was decided without the LLM."""
+        return MatchAssessment(
+            is_match=False,
+            confidence="LOW",
+            match_probability=0.0,
+            reasoning_steps=(reason,),
+            supporting_evidence=(),
+            contradicting_evidence=(),
+            missing_information=(),
+            matched_entity=None,
+        )
+
+    async def run(self, state: ScreeningState, llm_provider: LLMProvider) -> Dict[str, Any]:
         """
         Executes the name matching process and updates the state.
         """
@@ -112,28 +293,18 @@ class NameMatchingNode(BaseNode):
             
             return {
                 "match_decision": decision,
-                "match_assessment": MatchAssessment(
-                    is_match=False,
-                    confidence="LOW",
-                    match_probability=0.0,
-                    reasoning_steps=["No person entities were found in the article to compare against the query person."],
-                    supporting_evidence=[],
-                    contradicting_evidence=[],
-                    missing_information=[],
-                    matched_entity=None,
+                "match_assessment": self._no_match_assessment(
+                    "No person entities were found in the article to compare against the query person."
                 ),
-                "steps_completed": state.get("steps_completed", []) + ["match_person"],
+                "steps_completed": ["match_person"],
             }
 
         # Find the best match across all entities
-        best_assessment = self._get_best_match(state, llm_provider)
+        warnings: List[str] = []
+        best_assessment = await self._get_best_match(state, llm_provider, warnings)
         
         if best_assessment:
-            # Determine the final decision based on the match assessment's boolean flag
-            if best_assessment.is_match:
-                decision = "MATCH" if best_assessment.confidence == "HIGH" else "UNCERTAIN"
-            else:
-                decision = "NO_MATCH"
+            decision = match_decision(best_assessment)
             
             logger.info(
                 f"Match decision: {decision} (Confidence: {best_assessment.confidence}, Prob: {best_assessment.match_probability:.2f})"
@@ -142,14 +313,15 @@ class NameMatchingNode(BaseNode):
             return {
                 "match_assessment": best_assessment,
                 "match_decision": decision,
-                "steps_completed": state.get("steps_completed", []) + ["match_person"],
-                "llm_calls": state.get("llm_calls", []) + self.cost_tracker.llm_calls,
+                "warnings": warnings,
+                "steps_completed": ["match_person"],
             }
         
         # Default case if loop finishes but no best assessment was set
         logger.error("All matching attempts failed due to errors.")
         return {
             "match_decision": "NO_MATCH",
-            "errors": state["errors"] + ["Critical: All LLM matching attempts failed."],
-            "steps_completed": state.get("steps_completed", []) + ["match_person_failed"],
+            "errors": ["Critical: All LLM matching attempts failed."],
+            "warnings": warnings,
+            "steps_completed": ["match_person_failed"],
         }
\ No newline at end of file
@@ -4,11 +4,10 @@
 Node responsible for generating the final, human-readable compliance report.
 (Section 2.2.5 and 5.4)
 """
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import orjson
 
 from langchain_core.language_models import BaseLanguageModel
-from langchain_core.output_parsers import JsonOutputParser
 from pydantic import ValidationError
 from datetime import datetime, timezone
 
@@ -16,26 +15,71 @@ from src.graph.state import ScreeningState
 from src.nodes.base import BaseNode
 from src.utils.logger import get_logger
 from config.settings import LLMProvider
-from src.models.outputs import ScreeningResult
-from src.chains.report_generation import create_report_generation_chain
+from src.models.outputs import PersonEntity, ScreeningResult
+from src.chains.report_generation import (
+    create_report_generation_chain,
+    create_report_summary_chain,
+)
+from src.utils.report_renderer import get_no_match_summary, get_top_evidence, render_report
 
 
 logger = get_logger("ReportNode")
 
+# Context snippets of the listed entities are cut to this many characters
+REPORT_SNIPPET_CHARS = 200
+
+
+def summarize_entities(entities: Sequence[PersonEntity]) -> List[Dict[str, Any]]:
+    """
+    Compact view of the article's entities for the report prompt: the report
+    only lists them with brief context (the matched entity is sent in full in
+    the match assessment), so details are dropped and snippets shortened.
+    """
+    summaries = []
+    for entity in entities:
+        snippet = entity.context_snippet
+        if len(snippet) > REPORT_SNIPPET_CHARS:
+            snippet = snippet[:REPORT_SNIPPET_CHARS].rstrip() + "..."
+        summaries.append({
+            **entity.model_dump(include={"full_name", "age", "occupation"}, exclude_none=True),
+            "context_snippet": snippet,
+        })
+    return summaries
+
 
 class ReportGenerationNode(BaseNode):
     """
     Node that takes the complete state (assessments, entities, metadata)
-    and uses an LLM to generate the final human-readable report.
+    and generates the final human-readable report.
+
+    In "template" report mode the structured sections are rendered locally and
+    the LLM only writes the decision summary; "llm_full" has the LLM write the
+    whole report.
     """
+
+    prompt_task = "report_generation"
     
-    def __init__(self, llm: BaseLanguageModel, settings: Any, cost_tracker: Any):
-        super().__init__(llm, settings, cost_tracker)
+    def __init__(
+        self,
+        llm: BaseLanguageModel,
+        settings: Any,
+        cost_tracker: Any,
+        model_name: Optional[str] = None,
+        backup_llms: Sequence[Tuple[LLMProvider, BaseLanguageModel]] = (),
+    ):
+        super().__init__(llm, settings, cost_tracker, model_name, backup_llms)
         
-        # The chain generates a string (the report text)
-        self.chain = create_report_generation_chain(llm)
-
-    def run(self, state: ScreeningState, llm_provider: LLMProvider) -> Dict[str, Any]:
+        # Not hedged: the report streams token by token, and a racing backup
+        # call would interleave its chunks with the primary's.
+        self.template_mode = settings.report_mode == "template"
+        if self.template_mode:
+            self.prompt_task = "report_summary"
+            self.chain = create_report_summary_chain(llm, prompt_caching=self.prompt_caching)
+        else:
+            # The chain generates a string (the report text)
+            self.chain = create_report_generation_chain(llm, prompt_caching=self.prompt_caching)
+
+    async def run(self, state: ScreeningState, llm_provider: LLMProvider) -> Dict[str, Any]:
         """
         Executes the report generation process and updates the state with the final result.
         """
@@ -51,37 +95,63 @@ class ReportGenerationNode(BaseNode):
             error_msg = "Cannot generate report: Final decision is missing from state."
             logger.error(error_msg)
             return {
-                "errors": state["errors"] + [error_msg],
+                "errors": [error_msg],
                 "report_complete": False,
             }
 
+        # NO_MATCH reports are boilerplate: rendered from the template, no LLM call
+        no_match_template = (
+            final_decision == "NO_MATCH"
+            and self.settings.template_no_match_reports
+            and state["match_assessment"] is not None
+        )
+
         # 2. Prepare the input variables for the report prompt
-        report_data = {
-            "query_info": state["query"].model_dump(),
-            "article_metadata": state["article_metadata"].model_dump(),
-            "entities": [e.model_dump() for e in state["entities"]],
-            "match_assessment": state["match_assessment"].model_dump(),
-            "sentiment_assessment": state["sentiment_assessment"].model_dump() 
-                                    if state["sentiment_assessment"] else "None (No match detected)",
-            "final_decision": final_decision,
-            "all_errors": state["errors"],
-            "all_warnings": state["warnings"],
-        }
-        
-        # The prompt only expects the 'results_json' variable.
-        prompt_vars = {
-            "results_json": json.dumps(report_data, indent=2),
-        }
+        report_text: Optional[str] = None
+        if no_match_template:
+            logger.info("NO_MATCH decision: rendering the report without an LLM call.")
+            report_text = get_no_match_summary(
+                state["query"].name, state["match_assessment"], len(state["entities"])
+            )
+        elif self.template_mode:
+            match_assessment = state["match_assessment"]
+            top_evidence = get_top_evidence(match_assessment, state["sentiment_assessment"])
+            prompt_vars = {
+                "query_name": state["query"].name,
+                "decision": final_decision,
+                "confidence": match_assessment.confidence,
+                "top_evidence": "\n".join(f"- {ev}" for ev in top_evidence) or "- None",
+            }
+        else:
+            report_data = {
+                "query_info": state["query"].model_dump(mode="json"),
+                "article_metadata": state["article_metadata"].model_dump(),
+                "entities": summarize_entities(state["entities"]),
+                "match_assessment": state["match_assessment"].model_dump(),
+                "sentiment_assessment": state["sentiment_assessment"].model_dump() 
+                                        if state["sentiment_assessment"] else "None (No match detected)",
+                "final_decision": final_decision,
+                "all_errors": state["errors"],
+                "all_warnings": state["warnings"],
+            }
+            
+            # The prompt only expects the 'results_json' variable.
+            # orjson also serializes the date fields of the model dumps; no
+            # indentation, which would only add whitespace tokens.
+            prompt_vars = {
+                "results_json": orjson.dumps(report_data).decode("utf-8"),
+            }
 
         # 3. Execute the chain
         try:
-            report_text = self._invoke_chain_with_tracking(
-                self.chain, 
-                prompt_vars, 
-                step_name="report_generation",
-                llm_provider=llm_provider,
-                llm_model=state["llm_model"],
-            )
+            if report_text is None:
+                report_text = await self._ainvoke_chain_with_tracking(
+                    self.chain,
+                    prompt_vars,
+                    step_name="report_generation",
+                    llm_provider=llm_provider,
+                    llm_model=self._llm_model(state),
+                )
 
             # 4. Construct the final ScreeningResult model
             # 4a. Compile the complete processing_metadata dictionary
@@ -90,11 +160,11 @@ class ReportGenerationNode(BaseNode):
             processing_metadata = {
                 # Workflow Status & Audit
                 "timestamp": datetime.now(timezone.utc).isoformat(),
-                "total_duration_ms": state.get("total_duration_ms", 0),
+                # The run is still in progress; its duration so far is the report's total
+                "total_duration_ms": (datetime.now(timezone.utc) - state["start_time"]).total_seconds() * 1000.0,
                 "steps_completed": state.get("steps_completed", []) + ["report_generation"],
                 "errors_encountered": state.get("errors", []),
                 "warnings": state.get("warnings", []),
-                "llm_calls": state.get("llm_calls", []),
                 
                 # Global/Config Info
                 "llm_provider": llm_provider.value,
@@ -105,15 +175,19 @@ class ReportGenerationNode(BaseNode):
             }
 
             final_result = ScreeningResult(
-                query=state["query"].model_dump(),
+                query=state["query"],
                 decision=final_decision,
                 match_assessment=state["match_assessment"],
                 sentiment_assessment=state["sentiment_assessment"],
                 article_metadata=state["article_metadata"],
-                entities_found=state["entities"],
+                entities_found=tuple(state["entities"]),
                 processing_metadata=processing_metadata,
                 report=report_text,
             )
+            if self.template_mode or no_match_template:
+                final_result = final_result.model_copy(
+                    update={"report": render_report(final_result, summary=report_text)}
+                )
             
             
             logger.info("Final Compliance Report generated successfully.")
@@ -121,13 +195,13 @@ class ReportGenerationNode(BaseNode):
             return {
                 "final_screening_result": final_result,
                 "report_complete": True,
-                "steps_completed": state.get("steps_completed", []) + ["report_generation"],
+                "steps_completed": ["report_generation"],
             }
             
         except Exception as e:
             error_msg = f"Report generation failed: {e.__class__.__name__}: {e}"
             logger.error(error_msg, exc_info=True)
             return {
-                "errors": state["errors"] + [error_msg],
+                "errors": [error_msg],
                 "report_complete": False,
             }
\ No newline at end of file
@@ -1,12 +1,12 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 
 from langchain_core.language_models import BaseLanguageModel
 from src.chains.sentiment_analysis import create_sentiment_analysis_chain
 from src.models.schemas import SentimentOutput
-from langchain_core.output_parsers import JsonOutputParser # Still needed for instructions
 
 from src.graph.state import ScreeningState
 from src.nodes.base import BaseNode
+from src.utils.excerpt import extract_mention_excerpt
 from src.utils.logger import get_logger
 from src.models.outputs import SentimentAssessment, PersonEntity
 from config.settings import LLMProvider
@@ -21,55 +21,141 @@ class SentimentAnalysisNode(BaseNode):
     individual and identifying adverse media indicators. (Section 2.2.4 and 5.3)
     """
 
-    def __init__(self, llm: BaseLanguageModel, settings: Any, cost_tracker: Any):
-        super().__init__(llm, settings, cost_tracker)
-        self.output_parser = JsonOutputParser(pydantic_object=SentimentOutput)
+    prompt_task = "sentiment_analysis"
+    semantic_cache_field = "article_text"
+    article_field = "article_text"
+    semantic_cache_context = ("person_name",)
+
+    def __init__(
+        self,
+        llm: BaseLanguageModel,
+        settings: Any,
+        cost_tracker: Any,
+        model_name: Optional[str] = None,
+        backup_llms: Sequence[Tuple[LLMProvider, BaseLanguageModel]] = (),
+    ):
+        super().__init__(llm, settings, cost_tracker, model_name, backup_llms)
         
         # 💡 Chain is now initialized from the external src/chains package
-        self.chain = create_sentiment_analysis_chain(llm)
+        self.chain = self._build_chain(create_sentiment_analysis_chain)
 
+    @staticmethod
+    def _same_person_name(a: str, b: str) -> bool:
+        """Names that render the same sentiment prompt (case/whitespace-insensitive)."""
+        return a.casefold().split() == b.casefold().split()
 
-    def run(self, state: ScreeningState, llm_provider: LLMProvider) -> Dict[str, Any]:
+    def _article_input(self, state: ScreeningState, person_name: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        The article text to analyze for a person, and its token count if known:
+        an excerpt around the person's mentions for long articles, else the full
+        text (None if the article has no text).
+        """
+        article_text = state["article_text"]
+        article_tokens = state.get("article_token_count")
+        if (
+            article_text is None
+            or not self.settings.enable_sentiment_excerpts
+            or article_tokens is None
+            or article_tokens < self.settings.sentiment_excerpt_min_tokens
+        ):
+            return article_text, article_tokens
+
+        excerpt = extract_mention_excerpt(
+            article_text, person_name, self.settings.sentiment_context_sentences
+        )
+        if excerpt is None:
+            return article_text, article_tokens
+        logger.info(
+            f"Analyzing a {len(excerpt)}-character excerpt around {person_name} "
+            f"instead of the {len(article_text)}-character article."
+        )
+        return excerpt, None
+
+    async def speculate(self, state: ScreeningState, llm_provider: LLMProvider) -> Dict[str, Any]:
+        """
+        Analyzes sentiment for the query name while entities are still being
+        extracted and matched. run() reuses the result when the matched entity
+        has the same name; any failure here just leaves it to run().
+        """
+        article_text = state["article_text"]
+        if not article_text:
+            return {"speculative_sentiment": None}
+
+        logger.info("Running speculative Sentiment Analysis...")
+        person_name = state["query"].name
+        article_text, article_tokens = self._article_input(state, person_name)
+        prompt_vars = {
+            "article_text": article_text,
+            "person_name": person_name,
+        }
+        try:
+            parsed_output = await self._ainvoke_chain_with_tracking(
+                self.chain,
+                prompt_vars,
+                step_name="speculative_sentiment",
+                llm_provider=llm_provider,
+                llm_model=self._llm_model(state),
+                output_schema=SentimentOutput,
+                article_tokens=article_tokens,
+            )
+        except Exception as e:
+            logger.warning(f"Speculative sentiment analysis failed: {e.__class__.__name__}: {e}")
+            return {"speculative_sentiment": None}
+
+        return {"speculative_sentiment": parsed_output.assessment}
+
+    async def run(self, state: ScreeningState, llm_provider: LLMProvider) -> Dict[str, Any]:
         """
         Executes the sentiment analysis process and updates the state.
         """
         logger.info("Running Sentiment Analysis Node...")
 
         match_assessment = state["match_assessment"]
-        article_text = state["article_text"]
         
         if not match_assessment or not match_assessment.is_match:
             logger.info("Skipping sentiment analysis: No confident match found.")
             return {
                 "sentiment_assessment": None,
-                "steps_completed": state.get("steps_completed", []) + ["analyze_sentiment_skipped"],
+                "steps_completed": ["analyze_sentiment_skipped"],
             }
 
-        # The entity that was determined to be the best match
-        # We assume the entity is attached in the matching node
-        matched_entity: PersonEntity = match_assessment.matched_entity
-        person_name = matched_entity.full_name
+        if not state["article_text"]:
+            logger.error("Skipping sentiment analysis: Article content is missing.")
+            return {
+                "errors": ["Sentiment analysis skipped: article content not found."],
+                "sentiment_assessment": None,
+                "steps_completed": ["analyze_sentiment_skipped"],
+            }
+
+        # The entity that was determined to be the best match. The matching node
+        # attaches it; a combined screening does not, so use the query name then
+        matched_entity: Optional[PersonEntity] = match_assessment.matched_entity
+        person_name = matched_entity.full_name if matched_entity is not None else state["query"].name
+        article_text, article_tokens = self._article_input(state, person_name)
 
         # Prepare input variables for the prompt
         prompt_vars = {
             "article_text": article_text,
             "person_name": person_name,
-            "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        # Execute the chain
+        # Execute the chain, unless the speculative run already used this exact prompt
         try:
-            output = self._invoke_chain_with_tracking(
-                self.chain,
-                prompt_vars,
-                step_name="sentiment_analysis",
-                llm_provider=llm_provider,
-                llm_model=state["llm_model"],
-            )
-
-            parsed_output = SentimentOutput.model_validate(output)
-
-            assessment = parsed_output.assessment
+            speculative = state.get("speculative_sentiment")
+            if speculative is not None and self._same_person_name(person_name, state["query"].name):
+                logger.info("Reusing the speculative sentiment analysis for the matched person.")
+                assessment = speculative
+            else:
+                parsed_output = await self._ainvoke_chain_with_tracking(
+                    self.chain,
+                    prompt_vars,
+                    step_name="sentiment_analysis",
+                    llm_provider=llm_provider,
+                    llm_model=self._llm_model(state),
+                    output_schema=SentimentOutput,
+                    article_tokens=article_tokens,
+                )
+                assessment = parsed_output.assessment
             
             logger.info(
                 f"Sentiment Result: {assessment.classification}, Adverse: {assessment.is_adverse_media}, Severity: {assessment.severity}"
@@ -77,8 +163,7 @@ class SentimentAnalysisNode(BaseNode):
             
             return {
                 "sentiment_assessment": assessment,
-                "steps_completed": state.get("steps_completed", []) + ["analyze_sentiment"],
-                "llm_calls": state.get("llm_calls", []) + self.cost_tracker.llm_calls,
+                "steps_completed": ["analyze_sentiment"],
             }
 
         except Exception as e:
@@ -86,14 +171,14 @@ class SentimentAnalysisNode(BaseNode):
             error_msg = f"Sentiment analysis failed: {e.__class__.__name__}: {e}"
             logger.error(error_msg, exc_info=True)
             return {
-                "errors": state["errors"] + [error_msg],
+                "errors": [error_msg],
                 "sentiment_assessment": SentimentAssessment(
                     classification="NEUTRAL",
                     is_adverse_media=False,
                     severity=None,
-                    adverse_indicators=[],
-                    evidence_snippets=[],
+                    adverse_indicators=(),
+                    evidence_snippets=(),
                     reasoning=f"Sentiment analysis failed due to technical error: {e.__class__.__name__}.",
                 ),
-                "steps_completed": state.get("steps_completed", []) + ["analyze_sentiment_failed"],
+                "steps_completed": ["analyze_sentiment_failed"],
             }
\ No newline at end of file
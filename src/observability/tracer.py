@@ -17,7 +17,7 @@ def setup_tracing_environment():
     settings = get_settings()
     
     # In a fully production system, we would ensure these are exported
-    # to the OS environment if not already there, but Pydantic Settings
+    # to the OS environment if not already there, but Settings
     # gives us the values.
     
     if settings.langsmith_api_key and settings.langsmith_project:
@@ -0,0 +1,38 @@
+# src/utils/event_loop.py
+
+"""
+Event Loop Runner.
+
+The synchronous entry points run their coroutine on uvloop when it is
+installed: a libuv-based event loop with lower per-task and per-socket
+overhead than asyncio's default loop, which adds up over the many concurrent
+provider requests of a screening. uvloop is optional (and not available on
+Windows); without it the standard asyncio loop is used.
+"""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+try:
+    import uvloop
+except ImportError:
+    # Without uvloop's stubs installed the module is Any and the ignore is unused
+    uvloop = None  # type: ignore[assignment, unused-ignore]
+
+
+def run_async(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion on a new event loop, like asyncio.run().
+
+    Args:
+        coroutine: The coroutine to run.
+
+    Returns:
+        The coroutine's result.
+    """
+    if uvloop is not None:
+        result: T = uvloop.run(coroutine)
+        return result
+    return asyncio.run(coroutine)
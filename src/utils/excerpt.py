@@ -0,0 +1,80 @@
+# src/utils/excerpt.py
+
+"""
+Mention Excerpts.
+
+Cuts a long article down to the sentences around the mentions of one person,
+so prompts that only concern that person (sentiment analysis) do not pay
+prefill for the rest of the article. A mention is the full name or the
+surname on its own, which is how news articles usually refer back to someone.
+"""
+
+import re
+from typing import List, Optional
+
+# Sentence ends and paragraph breaks
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# Separator between non-adjacent excerpt windows
+EXCERPT_GAP = "\n...\n"
+
+
+def _mention_pattern(person_name: str) -> Optional[re.Pattern]:
+    """Whole-word, case-insensitive pattern for the full name or the surname."""
+    parts = person_name.split()
+    if not parts:
+        return None
+    variants = {" ".join(parts)}
+    if len(parts) > 1 and len(parts[-1]) > 2:
+        variants.add(parts[-1])
+    alternatives = "|".join(re.escape(v) for v in sorted(variants, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternatives})\b", re.IGNORECASE)
+
+
+def extract_mention_excerpt(text: str, person_name: str, context_sentences: int) -> Optional[str]:
+    """
+    Keep only the sentences that mention a person, plus their neighbours.
+
+    Args:
+        text: The article text.
+        person_name: The person whose mentions are kept.
+        context_sentences: Sentences kept on each side of a mention.
+
+    Returns:
+        The windows in article order (overlapping ones merged, gaps marked
+        with EXCERPT_GAP), or None when the person is not mentioned.
+    """
+    pattern = _mention_pattern(person_name)
+    if pattern is None:
+        return None
+
+    sentences = [s for s in _SENTENCE_BREAK.split(text) if s.strip()]
+    keep = [False] * len(sentences)
+    for index, sentence in enumerate(sentences):
+        if pattern.search(sentence):
+            for neighbour in range(
+                max(0, index - context_sentences),
+                min(len(sentences), index + context_sentences + 1),
+            ):
+                keep[neighbour] = True
+    if not any(keep):
+        return None
+
+    windows: List[str] = []
+    current: List[str] = []
+    for sentence, kept in zip(sentences, keep):
+        if kept:
+            current.append(sentence.strip())
+        elif current:
+            windows.append(" ".join(current))
+            current = []
+    if current:
+        windows.append(" ".join(current))
+    excerpt = EXCERPT_GAP.join(windows)
+
+    # Mark text cut at the start or end too, so the model knows it is partial
+    if not keep[0]:
+        excerpt = EXCERPT_GAP.lstrip("\n") + excerpt
+    if not keep[-1]:
+        excerpt += EXCERPT_GAP.rstrip("\n")
+    return excerpt
@@ -9,15 +9,15 @@ Essential for the audit trail (Section 8.2).
 """
 
 import sys
+import json
 import logging
-from typing import Any
+from typing import Any, Callable, Optional
 
+import orjson
 import structlog
 
 from structlog.processors import EventRenamer, dict_tracebacks
 from structlog.processors import StackInfoRenderer
-from structlog.processors import CallsiteParameterAdder
-from structlog.processors import CallsiteParameter
 from structlog.stdlib import add_logger_name, add_log_level
 
 
@@ -31,6 +31,18 @@ def key_stripper(keys):
         return event_dict
     return processor
 
+
+def orjson_dumps(obj: Any, sort_keys: bool = False, default: Optional[Callable] = None, **kwargs: Any) -> str:
+    """
+    JSONRenderer serializer backed by orjson, falling back to the stdlib for
+    values orjson rejects (e.g. non-string keys).
+    """
+    try:
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+    except TypeError:
+        return json.dumps(obj, sort_keys=sort_keys, default=default, **kwargs)
+
 # -----------------------------------------------------------------------------
 # Configuration
 # -----------------------------------------------------------------------------
@@ -41,8 +53,10 @@ def configure_logging():
     """
     settings = get_settings()
 
-    # Determine logging style based on environment
-    is_development = settings.log_level.upper() in ("DEBUG", "INFO") and sys.stderr.isatty()
+    # Determine logging style based on settings and environment
+    is_development = settings.log_format == "text" or (
+        settings.log_level.upper() in ("DEBUG", "INFO") and sys.stderr.isatty()
+    )
     
     # 1. Shared Processors
     shared_processors = [
@@ -72,7 +86,7 @@ def configure_logging():
     # 3. Production/Audit Processors (JSON)
     else:
         processors = shared_processors + [
-            structlog.processors.JSONRenderer(sort_keys=True)
+            structlog.processors.JSONRenderer(serializer=orjson_dumps, sort_keys=True)
         ]
 
     # Configure Python's standard logging
@@ -90,6 +104,9 @@ def configure_logging():
         cache_logger_on_first_use=True,
     )
 
+    global _logging_configured
+    _logging_configured = True
+
 
 def get_logger(name: str) -> structlog.stdlib.BoundLogger:
     """
@@ -98,16 +115,11 @@ def get_logger(name: str) -> structlog.stdlib.BoundLogger:
     Args:
         name: The name of the logger (e.g., the module name).
     """
-    # Ensure configuration runs only once
-    global _logging_configured
+    # Configured on first use, once per process
     if not _logging_configured:
         configure_logging()
-        _logging_configured = True
-        
+
     return structlog.get_logger(name)
 
-# Initial configuration state
+# Initial configuration state (set by configure_logging)
 _logging_configured = False
-
-# Run configuration on module import
-configure_logging()
\ No newline at end of file
@@ -0,0 +1,177 @@
+# src/utils/prefilter.py
+
+"""
+Vectorized Match Pre-filter.
+
+Rules out obvious non-matches before any LLM name-matching call. Entities are
+stored column-wise (Struct-of-Arrays): names plus the earliest/latest birth year
+implied by their age, so every (query, entity) pair is checked in a couple of
+NumPy / RapidFuzz matrix operations instead of one LLM call per pair.
+
+The filter is deliberately loose - it only drops pairs whose names share
+nothing or whose ages are clearly incompatible. Everything else still goes
+through the LLM.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process, utils
+
+from src.models.outputs import PersonEntity
+
+# Sentinels for "no age information" - never filtered on age
+_NO_MIN_YEAR = np.iinfo(np.int32).min // 2
+_NO_MAX_YEAR = np.iinfo(np.int32).max // 2
+
+_DECADE = re.compile(r"\b(early|mid|late)?[\s-]*(\d{1,2})0'?s\b", re.IGNORECASE)
+_NUMBER = re.compile(r"\b(\d{1,3})\b")
+# Bounds that are only on one side cannot be turned into a range
+_OPEN_ENDED = re.compile(
+    r"\+|[<>]|\b(over|under|above|below|older|younger|more than|less than|at least|at most)\b",
+    re.IGNORECASE,
+)
+
+
+def _decade_bounds(qualifier: Optional[str], tens: int) -> Tuple[int, int]:
+    """Age bounds of a decade such as "40s", "mid-50s" or "late 60s"."""
+    if qualifier is None:
+        return tens, tens + 9
+    qualifier = qualifier.lower()
+    if qualifier == "early":
+        return tens, tens + 3
+    if qualifier == "mid":
+        return tens + 3, tens + 6
+    return tens + 6, tens + 9
+
+
+def parse_age_bounds(entity: PersonEntity) -> Optional[Tuple[int, int]]:
+    """
+    Parse an entity's age information into (min_age, max_age).
+
+    Handles an exact age, decades and ranges, spanning every age mentioned:
+
+        "about 45"              -> (45, 45)
+        "mid-50s"               -> (53, 56)
+        "45-50"                 -> (45, 50)
+        "between 30 and 40"     -> (30, 40)
+        "late 40s to early 50s" -> (46, 53)
+
+    Returns None when no age can be derived, or when the text is open-ended
+    ("over 40", "60+"), so that no age filter is applied.
+    """
+    if entity.age is not None:
+        return entity.age, entity.age
+
+    text = entity.approximate_age_range
+    if not text or _OPEN_ENDED.search(text):
+        return None
+
+    bounds = [
+        _decade_bounds(decade.group(1), int(decade.group(2)) * 10)
+        for decade in _DECADE.finditer(text)
+    ]
+    # Numbers outside the decades ("40's" would otherwise also read as 40)
+    bounds.extend(
+        (int(number.group(1)), int(number.group(1)))
+        for number in _NUMBER.finditer(_DECADE.sub(" ", text))
+    )
+    if not bounds:
+        return None
+
+    return min(low for low, _ in bounds), max(high for _, high in bounds)
+
+
+@dataclass
+class EntityTable:
+    """Column-wise view of the extracted entities."""
+
+    names: List[str]
+    birth_year_min: np.ndarray  # int32
+    birth_year_max: np.ndarray  # int32
+
+    @classmethod
+    def from_entities(cls, entities: Sequence[PersonEntity], article_date: date) -> "EntityTable":
+        """
+        Build the table, converting each age to a birth-year range as of the article date.
+        """
+        birth_year_min = np.full(len(entities), _NO_MIN_YEAR, dtype=np.int32)
+        birth_year_max = np.full(len(entities), _NO_MAX_YEAR, dtype=np.int32)
+
+        for i, entity in enumerate(entities):
+            bounds = parse_age_bounds(entity)
+            if bounds is not None:
+                min_age, max_age = bounds
+                # Someone aged N on the article date was born in year Y-N or Y-N-1
+                birth_year_min[i] = article_date.year - max_age - 1
+                birth_year_max[i] = article_date.year - min_age
+
+        return cls(
+            names=[entity.full_name for entity in entities],
+            birth_year_min=birth_year_min,
+            birth_year_max=birth_year_max,
+        )
+
+
+def name_similarity(query_names: Sequence[str], names: Sequence[str]) -> np.ndarray:
+    """
+    RapidFuzz token_set_ratio (0-100) of every (query, entity) name pair.
+
+    Returns:
+        uint8 (M, N) score matrix.
+    """
+    if not names or not query_names:
+        return np.zeros((len(query_names), len(names)), dtype=np.uint8)
+
+    return process.cdist(
+        query_names,
+        names,
+        scorer=fuzz.token_set_ratio,
+        processor=utils.default_process,
+        dtype=np.uint8,
+    )
+
+
+def prefilter_pairs(
+    query_names: Sequence[str],
+    query_birth_years: Sequence[Optional[int]],
+    table: EntityTable,
+    age_tolerance: int,
+    min_name_score: float,
+    name_scores: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Compute which (query, entity) pairs are worth an LLM matching call.
+
+    Args:
+        query_names: Names of the people being screened (M).
+        query_birth_years: Their birth years, None when unknown (M).
+        table: The extracted entities (N).
+        age_tolerance: Allowed slack in years on each side of an entity's range.
+        min_name_score: Minimum RapidFuzz token_set_ratio (0-100) between names.
+        name_scores: The name_similarity() matrix, if already computed.
+
+    Returns:
+        Boolean (M, N) mask; True means the pair must still be checked by the LLM.
+    """
+    if not table.names or not query_names:
+        return np.zeros((len(query_names), len(table.names)), dtype=bool)
+
+    if name_scores is None:
+        name_scores = name_similarity(query_names, table.names)
+    name_mask = name_scores >= min_name_score
+
+    years = np.array(
+        [_NO_MIN_YEAR if year is None else year for year in query_birth_years],
+        dtype=np.int64,
+    )[:, None]
+    known = years != _NO_MIN_YEAR
+    age_mask = ~known | (
+        (years >= table.birth_year_min[None, :].astype(np.int64) - age_tolerance)
+        & (years <= table.birth_year_max[None, :].astype(np.int64) + age_tolerance)
+    )
+
+    return name_mask & age_mask
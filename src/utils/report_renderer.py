@@ -0,0 +1,127 @@
+# src/utils/report_renderer.py
+
+"""
+Report Renderer.
+
+Renders the deterministic sections of the screening report (query info,
+assessments, entities, recommendation, processing details) from the structured
+ScreeningResult with a Jinja2 template. Only the short decision summary is
+written by the LLM, and not even that for NO_MATCH results.
+"""
+
+from functools import lru_cache
+from importlib import resources
+from typing import List, Optional, Tuple
+
+from jinja2 import Environment, StrictUndefined, Template
+
+from src.models.outputs import MatchAssessment, ScreeningResult, SentimentAssessment
+
+REPORT_TEMPLATE = "report_template.md.j2"
+
+
+@lru_cache(maxsize=1)
+def _get_template() -> Template:
+    """Load and compile the report template once."""
+    source = resources.files("config").joinpath(REPORT_TEMPLATE).read_text(encoding="utf-8")
+    env = Environment(
+        autoescape=False,  # Markdown output
+        undefined=StrictUndefined,
+        keep_trailing_newline=True,
+    )
+    return env.from_string(source)
+
+
+def get_recommendation(result: ScreeningResult) -> Tuple[str, List[str]]:
+    """
+    Derive the recommended next step from the decision and sentiment.
+
+    Args:
+        result: The screening result.
+
+    Returns:
+        A (recommendation, additional steps) tuple.
+    """
+    match = result.match_assessment
+    sentiment = result.sentiment_assessment
+
+    if result.decision == "NO_MATCH":
+        recommendation = "Proceed with onboarding"
+    elif result.decision == "UNCERTAIN":
+        recommendation = "Requires manual review"
+    elif sentiment and sentiment.is_adverse_media:
+        recommendation = (
+            "Escalate to compliance team"
+            if sentiment.severity == "HIGH"
+            else "Requires manual review"
+        )
+    else:
+        recommendation = "Proceed with onboarding"
+
+    additional_steps: List[str] = []
+    if result.decision == "UNCERTAIN" or match.confidence != "HIGH":
+        additional_steps = [f"Verify: {item}" for item in match.missing_information]
+        additional_steps.append("Search for additional articles about this individual")
+
+    return recommendation, additional_steps
+
+
+def get_no_match_summary(query_name: str, match_assessment: MatchAssessment, entity_count: int) -> str:
+    """
+    Decision summary for a NO_MATCH result, written without the LLM.
+
+    Args:
+        query_name: Name of the person being screened.
+        match_assessment: The NO_MATCH assessment; its last reasoning step is
+            the conclusion quoted in the summary.
+        entity_count: Number of people identified in the article.
+
+    Returns:
+        One-paragraph decision summary.
+    """
+    if entity_count:
+        people = "person" if entity_count == 1 else f"{entity_count} people"
+        summary = f"{query_name} was not matched to the {people} identified in the article."
+    else:
+        summary = f"No people were identified in the article, so {query_name} could not be matched to it."
+    if match_assessment.reasoning_steps:
+        summary += f" {match_assessment.reasoning_steps[-1]}"
+    return summary
+
+
+def get_top_evidence(
+    match_assessment: MatchAssessment,
+    sentiment_assessment: Optional[SentimentAssessment],
+    limit: int = 3,
+) -> List[str]:
+    """The few facts the LLM summary is based on."""
+    evidence = list(match_assessment.supporting_evidence[:limit])
+    if sentiment_assessment:
+        evidence.extend(sentiment_assessment.adverse_indicators[:limit])
+    return evidence
+
+
+def render_report(result: ScreeningResult, summary: str) -> str:
+    """
+    Render the full markdown report.
+
+    Args:
+        result: The screening result (its report field is ignored).
+        summary: One-paragraph decision summary.
+
+    Returns:
+        The formatted report.
+    """
+    recommendation, additional_steps = get_recommendation(result)
+    return _get_template().render(
+        query=result.query,
+        decision=result.decision,
+        summary=summary.strip(),
+        match=result.match_assessment,
+        sentiment=result.sentiment_assessment,
+        article=result.article_metadata,
+        entities=result.entities_found,
+        meta=result.processing_metadata,
+        recommendation=recommendation,
+        additional_steps=additional_steps,
+    )
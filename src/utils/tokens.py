@@ -0,0 +1,65 @@
+# src/utils/tokens.py
+
+"""
+Token Counting.
+
+Counts the tokens of the article once, at fetch time, so downstream nodes can
+reuse the number (usage estimates, size checks) instead of re-estimating it
+from the text on every LLM call.
+
+Counts use tiktoken, which is exact for OpenAI models and a close
+approximation for the other providers. tiktoken is optional: without it (or
+when its encoding files cannot be loaded) a characters-per-token heuristic
+is used.
+"""
+
+from functools import lru_cache
+from typing import Any, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger("Tokens")
+
+# Encoding used for models tiktoken does not know (Groq, Anthropic)
+DEFAULT_ENCODING = "o200k_base"
+
+# Average characters per token of English prose, used without tiktoken
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str) -> Optional[Any]:
+    """Load the tiktoken encoding for a model once, or None if unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken is not installed; token counts are estimated.")
+        return None
+
+    try:
+        encoding_name = tiktoken.encoding_name_for_model(model)
+    except KeyError:
+        encoding_name = DEFAULT_ENCODING
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        # The encoding files are downloaded on first use
+        logger.warning(f"Could not load tiktoken encoding ({e.__class__.__name__}); token counts are estimated.")
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count the tokens of a text for a model.
+
+    Args:
+        text: The text to count.
+        model: The model name, used to pick the tokenizer.
+
+    Returns:
+        The token count (estimated when no tokenizer is available).
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
@@ -7,26 +7,26 @@ Contains reusable functions for input validation and core logic
 like age verification for the Name Matching strategy.
 """
 
+import re
 from typing import Optional, Literal, Union
-from urllib.parse import urlparse
 from datetime import date
-from dateutil.relativedelta import relativedelta
 
 from src.utils.logger import get_logger
 
 logger = get_logger("Validators")
 
+# An http(s) scheme followed by a non-empty host
+_URL_PATTERN = re.compile(r"^https?://[^/?#\s]+", re.IGNORECASE)
+
 
 def validate_url(url: str) -> bool:
     """
     Checks if a string is a valid, well-formed HTTP/HTTPS URL.
     """
-    try:
-        result = urlparse(url)
-        return all([result.scheme in ['http', 'https'], result.netloc])
-    except Exception as e:
-        logger.warning(f"URL validation failed for {url}: {e}")
+    if not isinstance(url, str):
+        logger.warning(f"URL validation failed for {url!r}: not a string")
         return False
+    return _URL_PATTERN.match(url) is not None
 
 
 def parse_date(date_str: Optional[Union[str, date]]) -> Optional[date]:
@@ -61,7 +61,7 @@ def calculate_age(dob: date, date_of_event: date) -> int:
 
 
 def verify_age_alignment(
-    query_dob_str: str,
+    query_dob_str: Union[str, date],
     article_date: date,
     mentioned_age: Optional[int],
     tolerance_years: int = 2,
@@ -71,7 +71,7 @@ def verify_age_alignment(
     based on the article's publication date. (Section 6.2)
 
     Args:
-        query_dob_str: The DOB of the person being screened (YYYY-MM-DD).
+        query_dob_str: The DOB of the person being screened (date or YYYY-MM-DD).
         article_date: The date the article was published.
         mentioned_age: The specific age (int) mentioned in the article, if any.
         tolerance_years: The maximum allowed difference in years.
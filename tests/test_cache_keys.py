@@ -0,0 +1,40 @@
+"""Tests for the LLM response and semantic cache keys."""
+
+from src.llm.response_cache import LLMResponseCache
+from src.llm.semantic_cache import SemanticCache
+
+
+def test_response_cache_key_is_stable():
+    key = LLMResponseCache.make_key("groq", "model", "system", "user")
+    assert key == LLMResponseCache.make_key("groq", "model", "system", "user")
+    assert len(key) == 64
+
+
+def test_response_cache_key_is_length_prefixed():
+    assert LLMResponseCache.make_key("groq", "model", "ab", "c") != LLMResponseCache.make_key(
+        "groq", "model", "a", "bc"
+    )
+    assert LLMResponseCache.make_key("groq", "modelx", "", "user") != LLMResponseCache.make_key(
+        "groq", "model", "x", "user"
+    )
+
+
+def test_response_cache_key_covers_provider_and_model():
+    key = LLMResponseCache.make_key("groq", "model", "system", "user")
+    assert key != LLMResponseCache.make_key("openai", "model", "system", "user")
+    assert key != LLMResponseCache.make_key("groq", "other", "system", "user")
+
+
+def test_semantic_namespace_is_length_prefixed():
+    assert SemanticCache.make_namespace("task", "groq", "ab", {}) != SemanticCache.make_namespace(
+        "task", "groqa", "b", {}
+    )
+    assert SemanticCache.make_namespace(
+        "task", "groq", "model", {"a": "1", "b": "2"}
+    ) != SemanticCache.make_namespace("task", "groq", "model", {"a": "1b=2"})
+
+
+def test_semantic_namespace_ignores_context_order():
+    assert SemanticCache.make_namespace(
+        "task", "groq", "model", {"a": "1", "b": "2"}
+    ) == SemanticCache.make_namespace("task", "groq", "model", {"b": "2", "a": "1"})
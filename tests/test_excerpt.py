@@ -0,0 +1,57 @@
+"""Tests for mention excerpts."""
+
+from src.utils.excerpt import EXCERPT_GAP, extract_mention_excerpt
+
+ARTICLE = (
+    "The council met on Monday. "
+    "John Smith was charged with fraud. "
+    "Prosecutors said the scheme ran for years. "
+    "The weather was mild. "
+    "Traffic was light. "
+    "Smith denies the charges. "
+    "The hearing is set for May."
+)
+
+
+def test_keeps_mentions_and_neighbours():
+    excerpt = extract_mention_excerpt(ARTICLE, "John Smith", context_sentences=1)
+
+    assert excerpt == (
+        "The council met on Monday. John Smith was charged with fraud. "
+        "Prosecutors said the scheme ran for years."
+        + EXCERPT_GAP
+        + "Traffic was light. Smith denies the charges. The hearing is set for May."
+    )
+
+
+def test_merges_overlapping_windows():
+    excerpt = extract_mention_excerpt(ARTICLE, "John Smith", context_sentences=2)
+    assert excerpt is not None
+    assert EXCERPT_GAP not in excerpt
+    assert excerpt.startswith("The council met on Monday.")
+
+
+def test_marks_cut_start_and_end():
+    excerpt = extract_mention_excerpt(ARTICLE, "John Smith", context_sentences=0)
+
+    assert excerpt == (
+        "...\nJohn Smith was charged with fraud."
+        + EXCERPT_GAP
+        + "Smith denies the charges.\n..."
+    )
+
+
+def test_surname_matches_whole_words_only():
+    text = "Mr Smithson spoke. Nobody else did."
+    assert extract_mention_excerpt(text, "John Smith", context_sentences=1) is None
+
+
+def test_short_surname_is_not_a_mention():
+    text = "Li Na won the final. Na was delighted. The crowd cheered."
+    excerpt = extract_mention_excerpt(text, "Li Na", context_sentences=0)
+    assert excerpt == "Li Na won the final.\n..."
+
+
+def test_not_mentioned_or_empty_name():
+    assert extract_mention_excerpt(ARTICLE, "Maria Garcia", context_sentences=1) is None
+    assert extract_mention_excerpt(ARTICLE, "  ", context_sentences=1) is None
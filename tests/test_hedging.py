@@ -0,0 +1,82 @@
+"""Tests for hedged LLM requests."""
+
+import asyncio
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from src.llm.hedging import create_hedged_chain, track_hedge_outcome
+
+
+def _chain(name, delay_s=0.0, fail=False):
+    async def call(input):
+        await asyncio.sleep(delay_s)
+        if fail:
+            raise RuntimeError(f"{name} failed")
+        return f"{name}: {input}"
+
+    def call_sync(input):
+        if fail:
+            raise RuntimeError(f"{name} failed")
+        return f"{name}: {input}"
+
+    return RunnableLambda(call_sync, afunc=call)
+
+
+async def _ainvoke(chain):
+    with track_hedge_outcome() as outcome:
+        result = await chain.ainvoke("query")
+    return result, outcome
+
+
+def test_no_backups_returns_primary():
+    primary = _chain("primary")
+    assert create_hedged_chain(primary, [], delay_s=0.05) is primary
+
+
+def test_fast_primary_wins_without_hedging():
+    chain = create_hedged_chain(_chain("primary"), [_chain("backup")], delay_s=0.5)
+
+    result, outcome = asyncio.run(_ainvoke(chain))
+
+    assert result == "primary: query"
+    assert (outcome.winner, outcome.cancelled) == (0, [])
+
+
+def test_slow_primary_loses_race_and_is_cancelled():
+    chain = create_hedged_chain(_chain("primary", delay_s=5), [_chain("backup")], delay_s=0.05)
+
+    result, outcome = asyncio.run(_ainvoke(chain))
+
+    assert result == "backup: query"
+    assert (outcome.winner, outcome.cancelled) == (1, [0])
+
+
+def test_failed_primary_starts_backup_immediately():
+    chain = create_hedged_chain(
+        _chain("primary", fail=True), [_chain("backup")], delay_s=5
+    )
+
+    result, outcome = asyncio.run(asyncio.wait_for(_ainvoke(chain), timeout=1))
+
+    assert result == "backup: query"
+    assert (outcome.winner, outcome.cancelled) == (1, [])
+
+
+def test_all_failed_raises_first_error():
+    chain = create_hedged_chain(
+        _chain("primary", fail=True), [_chain("backup", fail=True)], delay_s=0.05
+    )
+
+    with pytest.raises(RuntimeError, match="primary failed"):
+        asyncio.run(_ainvoke(chain))
+
+
+def test_sync_invoke_falls_back_in_order():
+    chain = create_hedged_chain(
+        _chain("primary", fail=True), [_chain("first", fail=True), _chain("second")], delay_s=0.05
+    )
+
+    with track_hedge_outcome() as outcome:
+        assert chain.invoke("query") == "second: query"
+    assert (outcome.winner, outcome.cancelled) == (2, [])
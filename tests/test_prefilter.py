@@ -0,0 +1,100 @@
+"""Tests for the vectorized match pre-filter."""
+
+from datetime import date
+from typing import Optional
+
+import numpy as np
+import pytest
+
+from src.models.outputs import PersonEntity
+from src.utils.prefilter import EntityTable, parse_age_bounds, prefilter_pairs
+
+
+def _entity(
+    name: str = "John Smith",
+    age: Optional[int] = None,
+    age_range: Optional[str] = None,
+) -> PersonEntity:
+    return PersonEntity(
+        full_name=name,
+        context_snippet=f"{name} was mentioned.",
+        age=age,
+        approximate_age_range=age_range,
+    )
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("about 45", (45, 45)),
+        ("45-50", (45, 50)),
+        ("between 30 and 40", (30, 40)),
+        ("40s", (40, 49)),
+        ("40's", (40, 49)),
+        ("early 30s", (30, 33)),
+        ("mid-50s", (53, 56)),
+        ("late 40s to early 50s", (46, 53)),
+    ],
+)
+def test_parse_age_bounds_ranges(text, expected):
+    assert parse_age_bounds(_entity(age_range=text)) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "over 40", "60+", "under 30", "in his forties"])
+def test_parse_age_bounds_unusable(text):
+    assert parse_age_bounds(_entity(age_range=text)) is None
+
+
+def test_parse_age_bounds_exact_age_wins():
+    assert parse_age_bounds(_entity(age=52, age_range="40s")) == (52, 52)
+
+
+def test_entity_table_birth_years():
+    table = EntityTable.from_entities(
+        [_entity(age=40), _entity(age_range="30s"), _entity()],
+        article_date=date(2020, 6, 1),
+    )
+
+    assert table.names == ["John Smith"] * 3
+    assert (table.birth_year_min[0], table.birth_year_max[0]) == (1979, 1980)
+    assert (table.birth_year_min[1], table.birth_year_max[1]) == (1980, 1990)
+    # No age: the sentinels keep every birth year compatible
+    assert table.birth_year_min[2] < 0 < table.birth_year_max[2]
+
+
+def _mask(entities, birth_year, age_tolerance=0, min_name_score=60.0):
+    table = EntityTable.from_entities(entities, article_date=date(2020, 6, 1))
+    return prefilter_pairs(["John Smith"], [birth_year], table, age_tolerance, min_name_score)
+
+
+def test_prefilter_pairs_drops_unrelated_names():
+    mask = _mask([_entity("John Smith"), _entity("Maria Garcia")], birth_year=None)
+    assert mask.tolist() == [[True, False]]
+
+
+def test_prefilter_pairs_drops_incompatible_ages():
+    entities = [_entity(age=40), _entity(age=70), _entity()]
+    assert _mask(entities, birth_year=1980).tolist() == [[True, False, True]]
+
+
+def test_prefilter_pairs_age_tolerance():
+    entities = [_entity(age=43)]  # born 1976 or 1977
+    assert _mask(entities, birth_year=1980).tolist() == [[False]]
+    assert _mask(entities, birth_year=1980, age_tolerance=3).tolist() == [[True]]
+
+
+def test_prefilter_pairs_unknown_birth_year_keeps_all_ages():
+    entities = [_entity(age=20), _entity(age=90)]
+    assert _mask(entities, birth_year=None).tolist() == [[True, True]]
+
+
+def test_prefilter_pairs_uses_given_name_scores():
+    table = EntityTable.from_entities([_entity("Maria Garcia")], article_date=date(2020, 6, 1))
+    scores = np.array([[100]], dtype=np.uint8)
+    mask = prefilter_pairs(["John Smith"], [None], table, 0, 60.0, name_scores=scores)
+    assert mask.tolist() == [[True]]
+
+
+def test_prefilter_pairs_empty():
+    table = EntityTable.from_entities([], article_date=date(2020, 6, 1))
+    assert prefilter_pairs(["John Smith"], [None], table, 0, 60.0).shape == (1, 0)
@@ -0,0 +1,36 @@
+"""Tests for prompt rendering."""
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+
+from config import prompts
+
+
+def _values(task):
+    return {name: f"<{name} value {{with braces}}>" for name in sorted(prompts.REQUIRED[task])}
+
+
+@pytest.mark.parametrize("task", sorted(prompts.PROMPTS))
+def test_render_matches_chat_prompt_template(task):
+    system_prompt, user_template = prompts.PROMPTS[task]
+    values = _values(task)
+
+    template = ChatPromptTemplate.from_messages([("system", system_prompt), ("human", user_template)])
+    expected = [message.content for message in template.format_messages(**values)]
+
+    assert list(prompts.render(task, **values)) == expected
+
+
+def test_render_ignores_extra_variables():
+    values = _values("entity_extraction")
+    assert prompts.render("entity_extraction", extra="unused", **values) == prompts.render(
+        "entity_extraction", **values
+    )
+
+
+def test_render_reports_missing_variables():
+    values = _values("entity_extraction")
+    values.pop("article_content")
+
+    with pytest.raises(ValueError, match=r"entity_extraction.*article_content"):
+        prompts.render("entity_extraction", **values)
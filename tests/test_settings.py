@@ -0,0 +1,50 @@
+"""Tests for settings loading and validation."""
+
+import pytest
+
+from config.settings import LLMProvider, Settings
+
+
+def test_from_env_converts_field_types():
+    settings = Settings.from_env(
+        {
+            "DEFAULT_LLM_PROVIDER": "openai",
+            "ENABLE_HEDGING": "true",
+            "ENABLE_FALLBACK": "no",
+            "HEDGE_DELAY_MS": " 750 ",
+            "LLM_TEMPERATURE": "0.0",
+            "OPENAI_API_KEY": "sk-test",
+        }
+    )
+
+    assert settings.default_llm_provider is LLMProvider.OPENAI
+    assert settings.enable_hedging is True
+    assert settings.enable_fallback is False
+    assert settings.hedge_delay_ms == 750
+    assert settings.llm_temperature == 0.0
+    assert settings.get_available_providers() == [LLMProvider.OPENAI]
+
+
+def test_from_env_matches_names_case_insensitively():
+    assert Settings.from_env({"hedge_delay_ms": "500"}).hedge_delay_ms == 500
+
+
+def test_from_env_defaults():
+    settings = Settings.from_env({})
+    assert settings.hedge_delay_ms == 2000
+    assert settings.get_available_providers() == []
+
+
+@pytest.mark.parametrize(
+    ("environ", "message"),
+    [
+        ({"HEDGE_DELAY_MS": "50"}, "hedge_delay_ms must be >= 100"),
+        ({"HEDGE_DELAY_MS": "60001"}, "hedge_delay_ms must be <= 60000"),
+        ({"HEDGE_DELAY_MS": "soon"}, "Invalid value for hedge_delay_ms"),
+        ({"ENABLE_HEDGING": "maybe"}, "Invalid boolean for enable_hedging"),
+        ({"LOG_LEVEL": "LOUD"}, "Invalid log level"),
+    ],
+)
+def test_from_env_rejects_invalid_values(environ, message):
+    with pytest.raises(ValueError, match=message):
+        Settings.from_env(environ)